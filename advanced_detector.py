@@ -3,10 +3,13 @@ Advanced Language Detection System
 Comprehensive NLP tool with analysis, visualization, and translation
 """
 
+import argparse
 import os
 import sys
 from colorama import init, Fore, Style
+from detection_engine import parse_engine, parse_languages, parse_priors
 from language_analyzer import LanguageAnalyzer
+from language_metadata import LANGUAGE_NAMES
 from visualizer import LanguageVisualizer
 
 # Set UTF-8 encoding for Windows
@@ -18,6 +21,9 @@ if os.name == 'nt':
 
 init(autoreset=True)
 
+# Allowlist/priors/engine applied to every analysis (set from --languages/--priors/--engine)
+DETECTION_OPTIONS = {}
+
 
 def print_header():
     """Print application header"""
@@ -42,7 +48,7 @@ def print_menu():
 
 def quick_analysis(text):
     """Quick language detection"""
-    analyzer = LanguageAnalyzer(text)
+    analyzer = LanguageAnalyzer(text, **DETECTION_OPTIONS)
     
     if not analyzer.detected_lang:
         print(f"{Fore.RED}✗ Could not detect language")
@@ -68,7 +74,7 @@ def quick_analysis(text):
 
 def detailed_analysis(text):
     """Detailed analysis with full report"""
-    analyzer = LanguageAnalyzer(text)
+    analyzer = LanguageAnalyzer(text, **DETECTION_OPTIONS)
     report = analyzer.generate_report()
     print(report)
 
@@ -77,7 +83,7 @@ def analysis_with_visualization(text):
     """Analysis with visual charts"""
     print(f"{Fore.YELLOW}Analyzing text and generating visualizations...\n")
     
-    analyzer = LanguageAnalyzer(text)
+    analyzer = LanguageAnalyzer(text, **DETECTION_OPTIONS)
     
     # Show text report
     report = analyzer.generate_report()
@@ -85,7 +91,8 @@ def analysis_with_visualization(text):
     
     # Generate visualizations
     visualizer = LanguageVisualizer()
-    visualizer.create_comprehensive_dashboard(analyzer)
+    path = visualizer.save_html(visualizer.create_comprehensive_dashboard(analyzer), 'analysis_dashboard.html')
+    print(f"{Fore.GREEN}✓ Dashboard saved to: {Fore.WHITE}{path}\n")
 
 
 def analyze_file(file_path):
@@ -154,7 +161,7 @@ def multi_language_demo():
     results = []
     
     for text, expected in samples:
-        analyzer = LanguageAnalyzer(text)
+        analyzer = LanguageAnalyzer(text, **DETECTION_OPTIONS)
         detected = analyzer.get_language_name()
         confidence = analyzer.probabilities[0].prob * 100 if analyzer.probabilities else 0
         
@@ -181,8 +188,15 @@ def multi_language_demo():
     visualizer = LanguageVisualizer()
     languages = [r[1] for r in results]
     confidences = [r[2] for r in results]
-    visualizer.plot_language_distribution(languages, "25-Language Detection Test")
-    visualizer.plot_confidence_scores(languages[:10], confidences[:10])
+    paths = [
+        visualizer.save_html(visualizer.plot_language_distribution(languages, "25-Language Detection Test"),
+                             'demo_language_distribution.html'),
+        visualizer.save_html(visualizer.plot_confidence_scores(languages[:10], confidences[:10]),
+                             'demo_confidence_scores.html'),
+    ]
+    for path in paths:
+        print(f"{Fore.GREEN}✓ Chart saved to: {Fore.WHITE}{path}")
+    print()
 
 
 def compare_texts():
@@ -208,7 +222,7 @@ def compare_texts():
     print(f"{Fore.CYAN}{'='*80}\n")
     
     for i, text in enumerate(texts, 1):
-        analyzer = LanguageAnalyzer(text)
+        analyzer = LanguageAnalyzer(text, **DETECTION_OPTIONS)
         lang_name = analyzer.get_language_name()
         stats = analyzer.get_text_statistics()
         
@@ -223,7 +237,7 @@ def compare_texts():
 def show_language_stats():
     """Show supported languages and statistics"""
     print(f"{Fore.MAGENTA}{'='*80}")
-    print(f"{Fore.YELLOW}   SUPPORTED LANGUAGES ({len(LanguageAnalyzer.LANGUAGE_MAP)} Total)")
+    print(f"{Fore.YELLOW}   SUPPORTED LANGUAGES ({len(LANGUAGE_NAMES)} Total)")
     print(f"{Fore.MAGENTA}{'='*80}\n")
     
     # Group by script/region
@@ -239,8 +253,7 @@ def show_language_stats():
     
     for group, codes in groups.items():
         print(f"{Fore.CYAN}{group} Languages:")
-        langs = [LanguageAnalyzer.LANGUAGE_MAP.get(code, code) for code in codes 
-                 if code in LanguageAnalyzer.LANGUAGE_MAP]
+        langs = [LANGUAGE_NAMES[code] for code in codes if code in LANGUAGE_NAMES]
         for i in range(0, len(langs), 4):
             row = langs[i:i+4]
             print(f"{Fore.WHITE}  " + " | ".join(f"{lang:18}" for lang in row))
@@ -292,15 +305,34 @@ def interactive_mode():
             print(f"{Fore.RED}Invalid option! Please try again.\n")
 
 
-if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--demo":
-            multi_language_demo()
-        elif sys.argv[1] == "--stats":
-            show_language_stats()
-        else:
-            # Analyze text from command line
-            text = " ".join(sys.argv[1:])
-            quick_analysis(text)
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Advanced language detection & analysis")
+    parser.add_argument('text', nargs='*', help="Text to analyze (interactive mode if omitted)")
+    parser.add_argument('--demo', action='store_true', help="Run the multi-language demo")
+    parser.add_argument('--stats', action='store_true', help="Show supported languages")
+    parser.add_argument('--languages', help="Comma-separated allowlist of language codes, e.g. en,fr,de")
+    parser.add_argument('--priors', help="Comma-separated prior weights, e.g. en=0.7,fr=0.3")
+    parser.add_argument('--engine', default='langdetect', help="Detection engine name, .npz model file or profile directory")
+    args = parser.parse_args()
+    
+    try:
+        DETECTION_OPTIONS['languages'] = parse_languages(args.languages)
+        DETECTION_OPTIONS['priors'] = parse_priors(args.priors)
+        DETECTION_OPTIONS['engine'] = parse_engine(args.engine)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    if args.demo:
+        multi_language_demo()
+    elif args.stats:
+        show_language_stats()
+    elif args.text:
+        # Analyze text from command line
+        quick_analysis(" ".join(args.text))
     else:
         interactive_mode()
+
+
+if __name__ == "__main__":
+    main()
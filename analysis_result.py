@@ -0,0 +1,96 @@
+"""
+Structured Analysis Results
+Compact result type with plain JSON and MessagePack serialization
+"""
+
+import json
+
+
+class AnalysisResult:
+    """Structured language analysis result, free of any presentation formatting"""
+
+    __slots__ = ('language', 'language_name', 'probabilities', 'stats', 'scripts',
+                 'country', 'top_chars', 'top_words')
+
+    def __init__(self, language=None, language_name='Unknown', probabilities=(), stats=None,
+                 scripts=None, country=None, top_chars=None, top_words=None):
+        self.language = language
+        self.language_name = language_name
+        self.probabilities = tuple(tuple(p) for p in probabilities)
+        self.stats = stats or {}
+        self.scripts = scripts or {}
+        self.country = country
+        self.top_chars = top_chars
+        self.top_words = top_words
+
+    @property
+    def confidence(self):
+        """Probability of the top language (0-1)"""
+        return self.probabilities[0][1] if self.probabilities else 0.0
+
+    @property
+    def script(self):
+        """Dominant writing script"""
+        if not self.scripts:
+            return 'Unknown'
+        return max(self.scripts.items(), key=lambda x: x[1])[0]
+
+    def is_multilingual(self, threshold=0.15):
+        """Check if the second-ranked language passes the threshold"""
+        return len(self.probabilities) > 1 and self.probabilities[1][1] > threshold
+
+    def to_dict(self):
+        """Convert to a dict of plain JSON/MessagePack types"""
+        data = {
+            'language': self.language,
+            'language_name': self.language_name,
+            'probabilities': [list(p) for p in self.probabilities],
+            'stats': self.stats,
+            'scripts': self.scripts,
+            'country': self.country,
+        }
+        if self.top_chars is not None:
+            data['top_chars'] = [list(c) for c in self.top_chars]
+        if self.top_words is not None:
+            data['top_words'] = [list(w) for w in self.top_words]
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a result from to_dict() output"""
+        return cls(**{key: data.get(key) for key in cls.__slots__ if key in data})
+
+    def to_json(self):
+        """Serialize to compact JSON"""
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, data):
+        """Parse a result serialized with to_json()"""
+        return cls.from_dict(json.loads(data))
+
+    def to_msgpack(self):
+        """Serialize to MessagePack bytes (requires the optional msgpack package)"""
+        return _msgpack().packb(self.to_dict(), use_bin_type=True)
+
+    @classmethod
+    def from_msgpack(cls, data):
+        """Parse a result serialized with to_msgpack()"""
+        return cls.from_dict(_msgpack().unpackb(data, raw=False))
+
+    def __repr__(self):
+        return f"AnalysisResult(language={self.language!r}, confidence={self.confidence:.4f})"
+
+    def __eq__(self, other):
+        if not isinstance(other, AnalysisResult):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+
+def _msgpack():
+    """Import msgpack lazily; it is only needed for MessagePack output"""
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError("MessagePack output requires the 'msgpack' package: pip install msgpack")
+    return msgpack
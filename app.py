@@ -1,26 +1,186 @@
 # app.py
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
 import streamlit as st
+from detection_engine import engine_names, warm_up
 from language_analyzer import LanguageAnalyzer
+from language_metadata import language_name
+from record_processor import RecordProcessor, RECORD_EXTENSIONS, dominant_language
 from visualizer import visualize_language_distribution
 
+UPLOAD_TYPES = ['txt', 'md', 'log', 'csv', 'json', 'jsonl']
+
+
+@st.cache_resource
+def load_detector(engine):
+    """Load an engine's models once per process and keep them warm"""
+    warm_up(engine)
+    return True
+
+
+@st.cache_resource
+def get_executor():
+    """Shared background pool for upload jobs"""
+    return ThreadPoolExecutor(max_workers=max(2, (os.cpu_count() or 2) // 2))
+
+
+@st.cache_data(max_entries=1000, show_spinner=False)
+def analyze_text(text_hash, engine, _text):
+    """Analyze a text, memoized by its hash and engine across reruns and sessions"""
+    analyzer = LanguageAnalyzer(_text, engine=engine)
+    return {'analyzer': analyzer, 'result': analyzer.to_result(), 'report': analyzer.generate_report(color=False)}
+
+
+def text_hash(text):
+    """Stable hash used as the analysis cache key"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class UploadJob:
+    """Background processing of uploaded files with progress tracking"""
+
+    def __init__(self, files, engine='langdetect'):
+        # Keep only names and bytes so the job does not touch Streamlit objects off-thread
+        self.files = [(f.name, f.getvalue()) for f in files]
+        self.engine = engine
+        self.total = len(self.files)
+        self.done = 0
+        self.records = 0
+        self.current = None
+        self.rows = []
+        self.errors = []
+        self.outputs = {}
+        self.lock = threading.Lock()
+        self.future = None
+
+    @property
+    def finished(self):
+        return self.future is not None and self.future.done()
+
+    def run(self):
+        """Process all files; runs on the shared executor"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name, data in self.files:
+                self.current = name
+                try:
+                    if Path(name).suffix.lower() in RECORD_EXTENSIONS:
+                        self._process_records(name, data, Path(tmp_dir))
+                    else:
+                        self._process_text(name, data)
+                except Exception as e:
+                    with self.lock:
+                        self.errors.append(f"{name}: {e}")
+                with self.lock:
+                    self.done += 1
+        self.current = None
+
+    def _process_text(self, name, data):
+        """Analyze a whole text file"""
+        text = data.decode('utf-8', errors='replace')
+        analyzer = LanguageAnalyzer(text, engine=self.engine)
+        stats = analyzer.get_text_statistics()
+        confidence = analyzer.probabilities[0].prob * 100 if analyzer.probabilities else 0
+        with self.lock:
+            self.rows.append({
+                'file': name,
+                'language': analyzer.get_language_name(),
+                'code': analyzer.detected_lang,
+                'confidence': round(confidence, 2),
+                'records': 1,
+                'words': stats['total_words'],
+            })
+
+    def _process_records(self, name, data, tmp_dir):
+        """Detect languages per record of a CSV/JSON upload"""
+        source = tmp_dir / Path(name).name
+        source.write_bytes(data)
+        output = tmp_dir / f"{source.stem}_languages{'.csv' if source.suffix.lower() == '.csv' else '.jsonl'}"
+
+        start = self.records
+
+        def on_chunk(summary):
+            self.records = start + summary['records']
+
+        summary = RecordProcessor(engine=self.engine).process_file(source, output, on_chunk=on_chunk)
+        code = dominant_language(summary['language_mix'])
+        with self.lock:
+            self.outputs[output.name] = output.read_bytes()
+            self.rows.append({
+                'file': name,
+                'language': language_name(code),
+                'code': code,
+                'confidence': None,
+                'records': summary['records'],
+                'words': summary['words'],
+            })
+
+
 st.set_page_config(page_title="Advanced NLP Language Detection", layout="wide")
 st.title("🌍 Advanced Language Detection & Analysis System")
 
-text = st.text_area("Enter text to analyze:")
+engine = st.sidebar.selectbox("Detection engine", engine_names())
+load_detector(engine)
+
+single_tab, batch_tab = st.tabs(["Text", "Files / CSV"])
+
+with single_tab:
+    text = st.text_area("Enter text to analyze:")
+
+    if st.button("Analyze"):
+        if text.strip() == "":
+            st.warning("Please enter some text!")
+        else:
+            # Analyze language (memoized by text hash)
+            result = analyze_text(text_hash(text), engine, text)
+            analyzer = result['analyzer']
+            detected_name = analyzer.get_language_name()
+            st.success(f"Detected Language: {detected_name}")
+
+            # Detailed report
+            st.text_area("Detailed Report", result['report'], height=300)
+
+            # Visualization
+            fig = visualize_language_distribution(analyzer)
+            st.plotly_chart(fig, use_container_width=True)
+
+with batch_tab:
+    uploads = st.file_uploader("Upload text, CSV or JSON files", type=UPLOAD_TYPES,
+                               accept_multiple_files=True)
+
+    if st.button("Process files", disabled=not uploads):
+        job = UploadJob(uploads, engine)
+        job.future = get_executor().submit(job.run)
+        st.session_state['upload_job'] = job
+
+    job = st.session_state.get('upload_job')
+    if job is not None:
+        progress = job.done / job.total if job.total else 1.0
+        label = f"Processed {job.done}/{job.total} files"
+        if job.current:
+            label += f" — {job.current} ({job.records:,} records)"
+        st.progress(progress, text=label)
 
-if st.button("Analyze"):
-    if text.strip() == "":
-        st.warning("Please enter some text!")
-    else:
-        # Analyze language
-        analyzer = LanguageAnalyzer(text)
-        language_name = analyzer.get_language_name()
-        st.success(f"Detected Language: {language_name}")
+        with job.lock:
+            rows = list(job.rows)
+            errors = list(job.errors)
+            outputs = dict(job.outputs)
 
-        # Detailed report
-        report = analyzer.generate_report()
-        st.text_area("Detailed Report", report, height=300)
+        if rows:
+            st.dataframe(pd.DataFrame(rows), use_container_width=True)
+        for error in errors:
+            st.error(error)
 
-        # Visualization
-        fig = visualize_language_distribution(analyzer)
-        st.plotly_chart(fig, use_container_width=True)
+        if job.finished:
+            for name, data in outputs.items():
+                st.download_button(f"Download {name}", data, file_name=name)
+        else:
+            # Poll the background job without blocking user interaction
+            time.sleep(0.5)
+            st.rerun()
@@ -0,0 +1,146 @@
+"""
+Asyncio Detection API
+Non-blocking detection for asyncio services with bounded concurrency
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from detection_engine import detect, normalize_languages
+from language_analyzer import LanguageAnalyzer
+from shared_model import SharedModels, init_worker
+
+
+def _detect(text, languages, priors, engine, budget=None):
+    return detect(text, languages, priors, engine=engine, budget=budget)
+
+
+def _analyze(text, languages, priors, engine, include_frequencies, budget=None):
+    return LanguageAnalyzer(text, languages, priors, engine, budget=budget).to_result(include_frequencies)
+
+
+class AsyncDetector:
+    """
+    Runs detection in an executor so coroutines never block the event loop
+
+    At most max_concurrency detections are queued or running at once; callers
+    beyond that wait on a semaphore. Cancelling a waiting coroutine drops its
+    work; a detection that has already started in a worker runs to completion
+    but its result is discarded.
+
+    Args:
+        executor: 'thread', 'process' or an existing concurrent.futures.Executor
+        max_workers: Pool size for 'thread'/'process' executors
+        max_concurrency: In-flight detection limit (default: 2 x max_workers, or 32)
+        languages, priors, engine: Passed to every detection (see detection_engine)
+        budget: Optional budget.DocumentBudget bounding each document's size and
+            CPU time, so one pathological input cannot tie up a worker
+    """
+
+    def __init__(self, executor='thread', max_workers=None, max_concurrency=None,
+                 languages=None, priors=None, engine='langdetect', budget=None):
+        self.languages = normalize_languages(languages)
+        self.priors = priors
+        self.engine = engine
+        self.budget = budget
+        self.shared_models = None
+        self.owns_executor = not isinstance(executor, Executor)
+
+        if executor == 'thread':
+            self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix='langdetect')
+        elif executor == 'process':
+            initializer, initargs = None, ()
+            if engine == 'compact':
+                # Worker processes attach to one shared copy of the model arrays
+                self.shared_models = SharedModels(self.languages)
+                initializer, initargs = init_worker, (self.shared_models.descriptor(),)
+            self.executor = ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context('spawn'),
+                                                initializer=initializer, initargs=initargs)
+        elif isinstance(executor, Executor):
+            self.executor = executor
+        else:
+            raise ValueError("executor must be 'thread', 'process' or a concurrent.futures.Executor")
+
+        self.max_concurrency = max_concurrency or (2 * max_workers if max_workers else 32)
+        self._semaphore = None
+        self._loop = None
+
+    def _get_semaphore(self):
+        """Semaphore bound to the running loop (recreated if the detector moves to a new loop)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _run(self, func, *args):
+        async with self._get_semaphore():
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def detect(self, text):
+        """Most likely language code (raises LangDetectException like detection_engine.detect)"""
+        return await self._run(_detect, text, self.languages, self.priors, self.engine, self.budget)
+
+    async def analyze(self, text, include_frequencies=False):
+        """Full AnalysisResult, as LanguageAnalyzer(text).to_result() returns it"""
+        return await self._run(_analyze, text, self.languages, self.priors, self.engine, include_frequencies,
+                               self.budget)
+
+    async def detect_many(self, texts, return_exceptions=False):
+        """
+        Detect many texts concurrently, preserving input order
+
+        If one detection fails (and return_exceptions is False) or the caller
+        is cancelled, the remaining detections are cancelled.
+        """
+        tasks = [asyncio.ensure_future(self.detect(text)) for text in texts]
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def close(self, wait=True):
+        """Shut down an owned executor and release shared models"""
+        if self.owns_executor:
+            self.executor.shutdown(wait=wait, cancel_futures=True)
+        if self.shared_models:
+            self.shared_models.close()
+            self.shared_models = None
+
+    async def aclose(self):
+        """close() without blocking the event loop"""
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+_default_detector = None
+
+
+def get_default_detector():
+    """Process-wide thread-pool AsyncDetector used by the module-level functions"""
+    global _default_detector
+    if _default_detector is None:
+        _default_detector = AsyncDetector()
+    return _default_detector
+
+
+async def detect_async(text, detector=None):
+    """Async detection_engine.detect(): returns the language code"""
+    return await (detector or get_default_detector()).detect(text)
+
+
+async def analyze_async(text, include_frequencies=False, detector=None):
+    """Async LanguageAnalyzer(text).to_result(): returns an AnalysisResult"""
+    return await (detector or get_default_detector()).analyze(text, include_frequencies)
+
+
+async def detect_many_async(texts, return_exceptions=False, detector=None):
+    """Async detection of many texts with bounded concurrency; returns codes in input order"""
+    return await (detector or get_default_detector()).detect_many(texts, return_exceptions)
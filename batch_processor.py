@@ -3,12 +3,19 @@ Batch File Processor for Language Detection
 Process multiple text files and generate reports
 """
 
+import argparse
+import hashlib
+import json
+import multiprocessing
 import os
+import re
 import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
 from pathlib import Path
-from langdetect import detect, LangDetectException
 from colorama import init, Fore, Style
-import pandas as pd
 from datetime import datetime
 
 # Set UTF-8 encoding for Windows
@@ -20,20 +27,84 @@ if os.name == 'nt':
 
 init(autoreset=True)
 
+from budget import DocumentBudget
+from dedup import MAX_CHARS as SIGNATURE_CHARS, NearDuplicateIndex, minhash
+from detection_engine import parse_engine, parse_languages, parse_priors
 from language_analyzer import LanguageAnalyzer
+from language_metadata import language_name
+from large_file import (CHUNK_BYTES, LARGE_FILE_BYTES, analyze_chunk, analyze_large_file, chunk_ranges,
+                        large_file_outcome)
+from log_follower import LogFollower
+from progress import PRINT_INTERVAL, ProgressReporter
+from result_store import ResultStore
+from scheduler import plan_units, utilization
+from sketches import CorpusSketches
+from shared_model import SharedModels, init_worker, memory_usage
+from record_processor import RecordProcessor, RECORD_EXTENSIONS, dominant_language, print_language_mix
+
+# Files this tool writes to --output-dir (record outputs and shard partials); never read back as inputs
+OUTPUT_NAME_RE = re.compile(r'(_languages\.(csv|jsonl)|^shard_\d+_of_\d+\.jsonl?)$')
 
 
 class BatchProcessor:
     """Process multiple files for language detection"""
     
-    def __init__(self, directory):
+    def __init__(self, directory, record_mode=False, text_fields=None, chunk_size=1000, output_dir='.',
+                 results_path=None, languages=None, priors=None, workers=1, engine='langdetect',
+                 normalize=True, dedup=False, dedup_threshold=0.7, heavy_hitters=False, top_k=20,
+                 shard=None, budget=None, large_file_bytes=LARGE_FILE_BYTES, chunk_bytes=CHUNK_BYTES,
+                 chunk_breakdown=False, verbose=False, quiet=False, status_path=None,
+                 progress_interval=PRINT_INTERVAL, dashboard_path=None, summary_path=None,
+                 dashboard_cdn=False):
         self.directory = Path(directory)
-        self.results = []
+        self.results = ResultStore()
+        self.languages = languages
+        self.priors = priors
+        self.record_mode = record_mode
+        self.record_processor = RecordProcessor(text_fields, chunk_size=chunk_size, languages=languages,
+                                                priors=priors, normalize=normalize,
+                                                engine=engine) if record_mode else None
+        self.output_dir = Path(output_dir)
+        self.record_summaries = []
+        self.results_path = results_path
+        self.results_writer = None
+        self.workers = workers
+        self.engine = engine
+        self.normalize = normalize
+        self.worker_memory = {}
+        self.shared_bytes = 0
+        self.parallel_stats = None
+        self.dedup = dedup
+        self.dedup_threshold = dedup_threshold
+        self.clusters = {}
+        self.cluster_outcomes = {}
+        self.top_k = top_k
+        self.sketches = CorpusSketches(top_k) if heavy_hitters else None
+        self.shard = shard
+        self.file_order = {}
+        self.file_sizes = {}
+        self.budget = budget
+        self.overruns = Counter()
+        self.large_file_bytes = large_file_bytes
+        self.chunk_bytes = chunk_bytes
+        self.chunk_breakdown = chunk_breakdown
+        # Per-file lines only when verbose; otherwise a rate-limited progress line
+        self.verbose = verbose
+        self.quiet = quiet
+        self.status_path = status_path
+        self.progress_interval = progress_interval
+        self.progress = None
+        # Aggregated summary outputs (see generate_summary)
+        self.dashboard_path = dashboard_path
+        self.summary_path = summary_path
+        self.dashboard_cdn = dashboard_cdn
     
     def process_directory(self, extensions=None):
         """Process all text files in directory"""
         if extensions is None:
             extensions = ['.txt', '.md', '.csv', '.log', '.json']
+            if self.record_mode:
+                extensions.append('.jsonl')
         
         print(f"{Fore.CYAN}Scanning directory: {Fore.WHITE}{self.directory}")
         print(f"{Fore.CYAN}Looking for extensions: {Fore.WHITE}{', '.join(extensions)}\n")
@@ -42,65 +113,459 @@ class BatchProcessor:
         for ext in extensions:
             files.extend(self.directory.rglob(f'*{ext}'))
         
+        # Outputs of earlier runs, when --output-dir lies inside the scanned tree
+        output_dir = self.output_dir.resolve()
+        outputs = [f for f in files if OUTPUT_NAME_RE.search(f.name) and f.parent.resolve() == output_dir]
+        if outputs:
+            skipped = set(outputs)
+            files = [f for f in files if f not in skipped]
+            print(f"{Fore.YELLOW}Skipping {len(outputs)} output files of earlier runs in {self.output_dir}\n")
+        
         if not files:
             print(f"{Fore.RED}No files found with specified extensions!")
             return
         
         print(f"{Fore.GREEN}Found {len(files)} files to process\n")
         
-        for i, file_path in enumerate(files, 1):
-            print(f"{Fore.YELLOW}[{i}/{len(files)}] Processing: {Fore.WHITE}{file_path.name}")
-            self.process_file(file_path)
+        # Position in the full listing, so merged shards can be put back in single-node order
+        self.file_order = {str(f): seq for seq, f in enumerate(files)}
+        if self.shard:
+            index, count = self.shard
+            files = [f for f in files
+                     if shard_of(f.relative_to(self.directory).as_posix(), count) == index]
+            print(f"{Fore.CYAN}Shard {index}/{count}: {Fore.WHITE}{len(files)} {Fore.CYAN}files assigned\n")
         
-        self.generate_summary()
+        if self.dedup:
+            self.cluster_files(files)
+        
+        self.file_sizes = {f: f.stat().st_size for f in files}
+        self.progress = ProgressReporter(len(files), sum(self.file_sizes.values()),
+                                         interval=self.progress_interval,
+                                         quiet=self.quiet or self.verbose, status_path=self.status_path)
+        if self.results_path:
+            self.results_writer = open(self.results_path, 'w', encoding='utf-8')
+        try:
+            if self.workers > 1:
+                self.process_parallel(files)
+            else:
+                for i, file_path in enumerate(files, 1):
+                    self.file_message(f"{Fore.YELLOW}[{i}/{len(files)}] Processing: {Fore.WHITE}{file_path.name}")
+                    self.process_file(file_path)
+        except BaseException:
+            self.progress.state = 'failed'
+            raise
+        finally:
+            if self.results_writer:
+                self.results_writer.close()
+                self.results_writer = None
+            self.progress.finish()
+        
+        if self.shard:
+            self.write_partial()
+        else:
+            self.generate_summary()
     
     def process_file(self, file_path):
         """Process a single file"""
-        try:
-            # Try different encodings
-            text = None
-            for encoding in ['utf-8', 'latin-1', 'cp1252']:
+        if self.record_mode and file_path.suffix.lower() in RECORD_EXTENSIONS:
+            self.process_record_file(file_path)
+            return
+        
+        cluster = self.clusters.get(file_path)
+        if cluster and not cluster['representative']:
+            self.record_outcome(file_path, self.duplicate_outcome(file_path, cluster))
+            return
+        
+        if self.is_large(file_path):
+            self.process_large_file(file_path)
+            return
+        
+        self.record_outcome(file_path, analyze_file(file_path, sketches=self.sketches,
+                                                    **self.detection_options()))
+    
+    def max_chars(self):
+        """Characters read per text file (the budget's size limit, if any)"""
+        return self.budget.max_chars if self.budget else None
+    
+    def detection_options(self):
+        """Keyword arguments for analyze_file()"""
+        return {'languages': self.languages, 'priors': self.priors,
+                'engine': self.engine, 'normalize': self.normalize, 'budget': self.budget}
+    
+    def file_message(self, text):
+        """Print a per-file line (verbose mode only)"""
+        if self.verbose:
+            print(text)
+    
+    def track(self, file_path, status, language=None, size=None):
+        """Count one finished file in the progress reporter"""
+        if self.progress is not None:
+            if size is None:
                 try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        text = f.read()
-                    break
-                except UnicodeDecodeError:
-                    continue
+                    size = file_path.stat().st_size
+                except OSError:
+                    size = 0
+            self.progress.update(size, status, language)
+    
+    def is_large(self, file_path):
+        """True for text files analyzed chunk by chunk (a --max-chars budget reads a prefix instead)"""
+        if not self.large_file_bytes or (self.budget and self.budget.max_chars):
+            return False
+        if self.record_mode and file_path.suffix.lower() in RECORD_EXTENSIONS:
+            return False
+        size = self.file_sizes.get(file_path)
+        return (file_path.stat().st_size if size is None else size) >= self.large_file_bytes
+    
+    def process_large_file(self, file_path, executor=None):
+        """Split one huge file into chunks and analyze them (in parallel with an executor)"""
+        size = file_path.stat().st_size
+        self.file_message(f"{Fore.CYAN}  Large file ({size / 1e6:,.0f} MB): analyzing in "
+              f"{Fore.WHITE}{-(-size // self.chunk_bytes)} {Fore.CYAN}chunks")
+        outcome = analyze_large_file(file_path, self.detection_options(), executor, self.chunk_bytes, self.sketches,
+                                     self.chunk_breakdown)
+        self.record_large_outcome(file_path, outcome)
+    
+    def record_large_outcome(self, file_path, outcome):
+        """Print the chunk language mix of a large file, then record its outcome"""
+        chunks = outcome.pop('chunks', None)
+        if chunks:
+            mix = Counter(chunk['language'] for chunk in chunks if chunk['language'])
+            self.file_message(f"{Fore.CYAN}  Chunk languages: {Fore.WHITE}"
+                  f"{', '.join(f'{code} {count}' for code, count in mix.most_common())}")
+        self.record_outcome(file_path, outcome)
+    
+    def cluster_files(self, files):
+        """
+        Group near-duplicate text files so only one file per cluster is detected
+        
+        Only the prefix that minhash() fingerprints is read here; members are
+        counted later, in the detection pass (see duplicate_outcome).
+        """
+        index = NearDuplicateIndex(self.dedup_threshold)
+        # minhash() collapses whitespace in up to twice SIGNATURE_CHARS characters
+        prefix = min(2 * SIGNATURE_CHARS, self.max_chars() or 2 * SIGNATURE_CHARS)
+        for file_path in files:
+            if self.record_mode and file_path.suffix.lower() in RECORD_EXTENSIONS or self.is_large(file_path):
+                continue
+            text = read_text_file(file_path, prefix)
+            if text is None:
+                continue
+            cluster_id, representative = index.assign(minhash(text[:prefix]))
+            self.clusters[file_path] = {'id': cluster_id, 'representative': representative}
+        
+        duplicates = len(self.clusters) - len(index)
+        print(f"{Fore.CYAN}Near-duplicate clusters: {Fore.WHITE}{len(index)} {Fore.CYAN}for "
+              f"{Fore.WHITE}{len(self.clusters)} {Fore.CYAN}files "
+              f"({Fore.GREEN}{duplicates} detections skipped{Fore.CYAN})\n")
+    
+    def representative_ok(self, file_path):
+        """Whether a cluster member's representative was detected (so the member needs counting)"""
+        outcome = self.cluster_outcomes.get(self.clusters[file_path]['id'])
+        return outcome is not None and outcome['status'] == 'ok'
+    
+    def duplicate_outcome(self, file_path, cluster):
+        """Outcome for a cluster member, reusing its representative's detection"""
+        outcome = self.cluster_outcomes.get(cluster['id'])
+        if outcome is None or outcome['status'] != 'ok':
+            return outcome or {'status': 'error', 'message': 'Cluster representative was not analyzed'}
+        
+        # Counted by a worker in parallel runs, here otherwise
+        if 'counts' in cluster:
+            counts = cluster['counts']
+        else:
+            counts = count_file(file_path, self.max_chars(), outcome['row']['code'], self.sketches)
+        if counts is None:
+            return {'status': 'error', 'message': 'Could not read file'}
+        row = dict(outcome['row'], file=file_path.name, path=str(file_path),
+                   size_bytes=file_path.stat().st_size, **counts)
+        return {'status': 'ok', 'message': None, 'row': row,
+                'result': dict(outcome['result'], duplicate=True)}
+    
+    def record_outcome(self, file_path, outcome):
+        """Store and print the outcome of analyze_file()"""
+        cluster = self.clusters.get(file_path)
+        if cluster:
+            if cluster['representative']:
+                self.cluster_outcomes[cluster['id']] = outcome
+            if outcome['status'] == 'ok':
+                outcome['row']['cluster_id'] = cluster['id']
+                outcome['result'] = dict(outcome['result'], cluster_id=cluster['id'])
+        
+        if outcome.get('budget_status', 'ok') != 'ok':
+            self.overruns[outcome['budget_status']] += 1
+        
+        row = outcome.get('row')
+        self.track(file_path, outcome['status'], row['code'] if row else None,
+                   row['size_bytes'] if row else None)
+        
+        if outcome['status'] == 'skipped':
+            self.file_message(f"{Fore.YELLOW}  ⚠ {outcome['message']}\n")
+            return
+        if outcome['status'] == 'error':
+            self.file_message(f"{Fore.RED}  ✗ {outcome['message']}\n")
+            return
+        
+        self.results.append(row)
+        if self.results_writer:
+            record = {'path': str(file_path), **outcome['result']}
+            self.results_writer.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+        reused = ''
+        if cluster and not cluster['representative']:
+            reused = f" {Fore.WHITE}[near-duplicate, cluster {cluster['id']}]"
+        self.file_message(f"{Fore.GREEN}  ✓ Detected: {Fore.MAGENTA}{row['language']} {Fore.CYAN}({row['words']:,} words){reused}\n")
+    
+    def process_parallel(self, files):
+        """
+        Analyze text files in worker processes sharing one copy of the models
+        
+        Work is planned from the file sizes gathered during the scan (see
+        scheduler.plan_units): huge files become chunk units, small files are
+        bundled, and units go out largest first to whichever worker is free.
+        """
+        text_files = [f for f in files
+                      if not (self.record_mode and f.suffix.lower() in RECORD_EXTENSIONS)]
+        duplicates = [f for f in text_files if f in self.clusters and not self.clusters[f]['representative']]
+        skipped = set(duplicates)
+        text_files = [f for f in text_files if f not in skipped]
+        for file_path in files:
+            if self.record_mode and file_path.suffix.lower() in RECORD_EXTENSIONS:
+                self.file_message(f"{Fore.YELLOW}Processing records: {Fore.WHITE}{file_path.name}")
+                self.process_record_file(file_path)
+        
+        units = plan_units(text_files, self.file_sizes, self.workers,
+                           lambda f: chunk_ranges(f, self.chunk_bytes) if self.is_large(f) else None,
+                           self.chunk_bytes)
+        # Only the compact engine reads the shared arrays; other engines load their own models
+        shared = self.engine == 'compact'
+        if not shared:
+            print(f"{Fore.YELLOW}Note: each worker loads its own copy of the '{self.engine}' model; "
+                  f"use --engine compact to share one copy\n")
+        with (SharedModels(self.languages) if shared else nullcontext()) as models:
+            if shared:
+                self.shared_bytes = models.nbytes
+                print(f"{Fore.CYAN}Shared model: {Fore.WHITE}{models.nbytes / 1e6:.1f} MB "
+                      f"{Fore.CYAN}for {Fore.WHITE}{self.workers} {Fore.CYAN}workers, "
+                      f"{Fore.WHITE}{len(units):,} {Fore.CYAN}work units\n")
+            # spawn keeps workers from inheriting the parent's heap, so their RSS is their own
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(self.workers, mp_context=context,
+                                     initializer=init_worker if shared else None,
+                                     initargs=(models.descriptor(),) if shared else ()) as executor:
+                options = self.detection_options()
+                top_k = self.top_k if self.sketches is not None else None
+                started = time.perf_counter()
+                # Submitted largest first; the pool hands them out in that order
+                futures = {}
+                for unit in units:
+                    if unit['kind'] == 'chunk':
+                        future = executor.submit(_analyze_chunk_in_worker, str(unit['file']), unit['start'],
+                                                 unit['end'], options, top_k)
+                    else:
+                        future = executor.submit(_analyze_batch_in_worker, unit['files'], options, top_k)
+                    futures[future] = unit
+                
+                chunk_partials = {}
+                done = 0
+                for future in as_completed(futures):
+                    unit = futures.pop(future)
+                    reply = future.result()
+                    self.track_worker(reply, unit)
+                    if unit['kind'] == 'chunk':
+                        # A large file is merged once its last chunk is back
+                        file_path = unit['file']
+                        partials = chunk_partials.setdefault(file_path, [])
+                        partials.append(reply['partial'])
+                        if len(partials) < unit['chunks']:
+                            continue
+                        del chunk_partials[file_path]
+                        partials.sort(key=lambda partial: partial['start'])
+                        done += 1
+                        self.file_message(f"{Fore.YELLOW}[{done}/{len(text_files)}] Processed large file: "
+                                          f"{Fore.WHITE}{file_path.name} ({unit['chunks']} chunks)")
+                        self.record_large_outcome(file_path, large_file_outcome(
+                            file_path, partials, self.sketches, self.chunk_breakdown))
+                        continue
+                    
+                    if self.sketches is not None:
+                        self.sketches.merge(reply['sketches'])
+                    for file_path, outcome in zip(unit['files'], reply['outcomes']):
+                        done += 1
+                        self.file_message(f"{Fore.YELLOW}[{done}/{len(text_files)}] Processed: {Fore.WHITE}{file_path.name}")
+                        self.record_outcome(file_path, outcome)
+                
+                # Near-duplicates skip detection but are still read and counted, in the same pool
+                members = [f for f in duplicates if self.representative_ok(f)]
+                futures = {}
+                for unit in plan_units(members, self.file_sizes, self.workers):
+                    codes = [self.cluster_outcomes[self.clusters[f]['id']]['row']['code'] for f in unit['files']]
+                    futures[executor.submit(_count_batch_in_worker, unit['files'], codes, self.max_chars(),
+                                            top_k)] = unit
+                for future in as_completed(futures):
+                    unit = futures.pop(future)
+                    reply = future.result()
+                    self.track_worker(reply, unit)
+                    if self.sketches is not None:
+                        self.sketches.merge(reply['sketches'])
+                    for file_path, counts in zip(unit['files'], reply['counts']):
+                        self.clusters[file_path]['counts'] = counts
+                self.parallel_stats = utilization(self.worker_memory, time.perf_counter() - started, self.workers)
+        
+        for file_path in duplicates:
+            self.file_message(f"{Fore.YELLOW}Reusing cluster result: {Fore.WHITE}{file_path.name}")
+            self.record_outcome(file_path, self.duplicate_outcome(file_path, self.clusters[file_path]))
+        
+        # Results arrive in completion order; put them back in directory order
+        self.results = self.results.sorted_by(lambda row: self.file_order.get(row['path'], len(self.file_order)))
+    
+    def track_worker(self, reply, unit):
+        """Add one reply to its worker's memory and utilization figures"""
+        memory = reply['memory']
+        usage = self.worker_memory.setdefault(memory['pid'],
+                                              {'files': 0, 'chunks': 0, 'units': 0, 'bytes': 0, 'busy': 0.0})
+        usage.update(rss=memory['rss'], pss=memory['pss'])
+        usage['units'] += 1
+        usage['busy'] += reply['busy']
+        if unit['kind'] == 'chunk':
+            # A chunked file is spread over several workers; count its chunks, not the file
+            usage['bytes'] += unit['end'] - unit['start']
+            usage['chunks'] += 1
+        else:
+            usage['bytes'] += sum(self.file_sizes.get(f, 0) for f in unit['files'])
+            usage['files'] += len(unit['files'])
+    
+    def process_record_file(self, file_path):
+        """Process a CSV/JSON file record by record"""
+        try:
+            suffix = '.csv' if file_path.suffix.lower() == '.csv' else '.jsonl'
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            output_path = self.output_dir / f"{file_path.stem}_languages{suffix}"
+            summary = self.record_processor.process_file(file_path, output_path)
+            summary['output'] = str(output_path)
+            self.record_summaries.append(summary)
             
-            if not text:
-                print(f"{Fore.RED}  ✗ Could not read file\n")
+            lang_code = dominant_language(summary['language_mix'])
+            if not lang_code:
+                self.track(file_path, 'error')
+                self.file_message(f"{Fore.RED}  ✗ Could not detect language in any record\n")
                 return
             
-            if len(text.strip()) < 10:
-                print(f"{Fore.YELLOW}  ⚠ File too short, skipping\n")
-                return
+            lang_name = language_name(lang_code)
+            self.results.append({
+                'file': file_path.name,
+                'path': str(file_path),
+                'language': lang_name,
+                'code': lang_code,
+                'confidence': None,
+                'size_bytes': file_path.stat().st_size,
+                'chars': summary['chars'],
+                'words': summary['words'],
+                'sentences': summary['sentences'],
+                'records': summary['records']
+            })
+            self.track(file_path, 'ok', lang_code)
+            if self.verbose:
+                print_language_mix(summary)
+            self.file_message(f"{Fore.GREEN}  ✓ Per-record results: {Fore.WHITE}{output_path}\n")
             
-            # Detect language
-            try:
-                lang_code = detect(text)
-                analyzer = LanguageAnalyzer(text)
-                lang_name = analyzer.get_language_name(lang_code)
-                stats = analyzer.get_text_statistics()
-                
-                result = {
-                    'file': file_path.name,
-                    'path': str(file_path),
-                    'language': lang_name,
-                    'code': lang_code,
-                    'size_bytes': file_path.stat().st_size,
-                    'chars': stats['total_chars'],
-                    'words': stats['total_words'],
-                    'sentences': stats['total_sentences']
-                }
-                
-                self.results.append(result)
-                print(f"{Fore.GREEN}  ✓ Detected: {Fore.MAGENTA}{lang_name} {Fore.CYAN}({stats['total_words']:,} words)\n")
-                
-            except LangDetectException:
-                print(f"{Fore.RED}  ✗ Could not detect language\n")
-                
         except Exception as e:
-            print(f"{Fore.RED}  ✗ Error: {str(e)}\n")
+            self.track(file_path, 'error')
+            self.file_message(f"{Fore.RED}  ✗ Error: {str(e)}\n")
+    
+    def write_partial(self):
+        """
+        Write this shard's result rows and summary accumulators for the merge step
+        
+        Produces shard_<i>_of_<N>.jsonl (one report row per line, tagged with its
+        position in the full file listing) and shard_<i>_of_<N>.json (record-mode
+        summaries, heavy-hitter sketches and cluster count) in output_dir.
+        """
+        index, count = self.shard
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"shard_{index}_of_{count}"
+        rows_path = self.output_dir / f"{stem}.jsonl"
+        with open(rows_path, 'w', encoding='utf-8') as f:
+            for row in self.results:
+                row['seq'] = self.file_order.get(row['path'], len(self.file_order))
+                f.write(json.dumps(row, ensure_ascii=False, separators=(',', ':')) + '\n')
+        
+        accumulators = {
+            'shard': index,
+            'shards': count,
+            'directory': str(self.directory),
+            'rows': rows_path.name,
+            'record_summaries': [dict(summary, seq=self.file_order.get(summary['path'], len(self.file_order)))
+                                 for summary in self.record_summaries],
+            'sketches': self.sketches.to_state() if self.sketches is not None else None,
+            'clusters': len({cluster['id'] for cluster in self.clusters.values()}),
+            'overruns': dict(self.overruns),
+        }
+        partial_path = self.output_dir / f"{stem}.json"
+        with open(partial_path, 'w', encoding='utf-8') as f:
+            json.dump(accumulators, f, ensure_ascii=False)
+        
+        print(f"{Fore.GREEN}✓ Shard {index}/{count}: {Fore.WHITE}{len(self.results):,} "
+              f"{Fore.GREEN}results written to {Fore.WHITE}{rows_path} {Fore.GREEN}and {Fore.WHITE}{partial_path}")
+        print(f"{Fore.CYAN}Combine all shards with: {Fore.WHITE}python batch_processor.py merge {self.output_dir}\n")
+    
+    @classmethod
+    def from_partials(cls, paths):
+        """
+        Rebuild a processor holding the combined results of every shard
+        
+        Args:
+            paths (list): Partial .json files or directories containing them
+        
+        Returns:
+            BatchProcessor: Ready for generate_summary(); rows and record
+            summaries are in the order a single-node run lists the files
+        """
+        partial_files = []
+        for path in map(Path, paths):
+            partial_files.extend(sorted(path.glob('shard_*_of_*.json')) if path.is_dir() else [path])
+        if not partial_files:
+            raise ValueError("No shard partials (shard_<i>_of_<N>.json) found")
+        
+        partials = []
+        for partial_file in partial_files:
+            with open(partial_file, 'r', encoding='utf-8') as f:
+                partials.append((partial_file, json.load(f)))
+        partials.sort(key=lambda item: item[1]['shard'])
+        
+        counts = {partial['shards'] for _, partial in partials}
+        if len(counts) != 1:
+            raise ValueError(f"Partials come from different shard counts: {sorted(counts)}")
+        count = counts.pop()
+        indices = [partial['shard'] for _, partial in partials]
+        missing = sorted(set(range(count)) - set(indices))
+        if missing or len(indices) != len(set(indices)):
+            raise ValueError(f"Expected each of shards 0-{count - 1} exactly once; "
+                             f"missing {missing or 'none'}, got {indices}")
+        
+        processor = cls(partials[0][1]['directory'])
+        rows, summaries = [], []
+        offset = 0
+        for partial_file, partial in partials:
+            with open(partial_file.parent / partial['rows'], 'r', encoding='utf-8') as f:
+                for line in f:
+                    row = json.loads(line)
+                    # Cluster ids are per shard; shift them so they stay unique
+                    if row.get('cluster_id', -1) >= 0:
+                        row['cluster_id'] += offset
+                    rows.append(row)
+            offset += partial['clusters']
+            processor.overruns.update(partial.get('overruns', {}))
+            summaries.extend(partial['record_summaries'])
+            if partial['sketches'] is not None:
+                sketches = CorpusSketches.from_state(partial['sketches'])
+                if processor.sketches is None:
+                    processor.sketches = sketches
+                else:
+                    processor.sketches.merge(sketches)
+        
+        for row in sorted(rows, key=lambda row: row.pop('seq')):
+            processor.results.append(row)
+        processor.record_summaries = sorted(summaries, key=lambda summary: summary.pop('seq'))
+        return processor
     
     def generate_summary(self):
         """Generate summary report"""
@@ -108,7 +573,7 @@ class BatchProcessor:
             print(f"{Fore.RED}No results to summarize!")
             return
         
-        df = pd.DataFrame(self.results)
+        df = self.results.to_dataframe()
         
         print(f"\n{Fore.MAGENTA}{'='*80}")
         print(f"{Fore.YELLOW}BATCH PROCESSING SUMMARY")
@@ -127,27 +592,352 @@ class BatchProcessor:
         print(f"{Fore.WHITE}Total Words: {Fore.GREEN}{df['words'].sum():,}")
         print(f"{Fore.WHITE}Total Characters: {Fore.GREEN}{df['chars'].sum():,}")
         print(f"{Fore.WHITE}Total Size: {Fore.GREEN}{df['size_bytes'].sum():,} bytes")
+        print(f"{Fore.WHITE}Chars Skipped by Detector (noise + unsampled): {Fore.GREEN}{df['dropped_chars'].sum():,}")
+        if self.overruns:
+            counts = ', '.join(f"{status} {count:,}" for status, count in sorted(self.overruns.items()))
+            print(f"{Fore.WHITE}Budget Overruns: {Fore.YELLOW}{counts}")
+        
+        # Per-file language mix for record-mode files
+        if self.record_summaries:
+            print(f"\n{Fore.CYAN}Record-Level Language Mix:")
+            for summary in self.record_summaries:
+                print(f"{Fore.MAGENTA}{summary['file']}")
+                print_language_mix(summary)
+        
+        # Memory and utilization per worker process (parallel runs)
+        if self.worker_memory:
+            shared = f"shared model {self.shared_bytes / 1e6:.1f} MB, counted once in PSS" if self.shared_bytes else "no shared model"
+            print(f"\n{Fore.CYAN}Worker Memory ({shared}):")
+            for pid, usage in sorted(self.worker_memory.items()):
+                rss = f"{usage['rss'] / 1e6:.1f} MB" if usage['rss'] else 'n/a'
+                pss = f"{usage['pss'] / 1e6:.1f} MB" if usage['pss'] else 'n/a'
+                chunks = f", {usage['chunks']} chunks" if usage['chunks'] else ''
+                print(f"{Fore.WHITE}pid {pid:<8} {Fore.GREEN}RSS {rss:>10}  PSS {pss:>10}  "
+                      f"{Fore.WHITE}{usage['files']} files{chunks}")
+        
+        if self.parallel_stats:
+            stats = self.parallel_stats
+            print(f"\n{Fore.CYAN}Worker Utilization (wall {stats['wall_seconds']:.2f}s, "
+                  f"ideal {stats['ideal_seconds']:.2f}s = busy time / {self.workers} workers):")
+            for pid, usage in sorted(self.worker_memory.items()):
+                share = usage['busy'] / stats['wall_seconds'] if stats['wall_seconds'] else 0
+                print(f"{Fore.WHITE}pid {pid:<8} {Fore.GREEN}busy {usage['busy']:>8.2f}s {share:>7.1%}  "
+                      f"{Fore.WHITE}{usage['units']} units, {usage['bytes'] / 1e6:,.1f} MB")
+            if stats['efficiency'] is not None:
+                color = Fore.GREEN if stats['efficiency'] >= 0.8 else Fore.YELLOW
+                balance = f" (load balance {stats['balance']:.1%})" if stats['balance'] is not None else ''
+                print(f"{Fore.WHITE}Parallel efficiency: {color}{stats['efficiency']:.1%}{Fore.WHITE}{balance}")
+        
+        # Corpus-wide top words per language
+        if self.sketches is not None and self.sketches.languages:
+            print(f"\n{Fore.CYAN}Top Words per Language "
+                  f"(sketches: {self.sketches.nbytes / 1e6:.1f} MB, estimates may overcount slightly):")
+            if self.record_summaries:
+                print(f"{Fore.YELLOW}Record files ({len(self.record_summaries)}) are not included; "
+                      f"see the record-level language mix above")
+            for code, summary in self.sketches.to_dict().items():
+                words = ', '.join(f"{word} ({count:,})" for word, count in summary['top_words'][:5])
+                print(f"{Fore.MAGENTA}{code:6} {Fore.WHITE}{summary['documents']:>5} docs  {Fore.GREEN}{words}")
         
         # Save to CSV
         output_file = f"language_detection_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         df.to_csv(output_file, index=False)
         print(f"\n{Fore.GREEN}✓ Report saved to: {Fore.WHITE}{output_file}")
+        if self.sketches is not None:
+            sketch_file = output_file.replace('.csv', '_heavy_hitters.json')
+            with open(sketch_file, 'w', encoding='utf-8') as f:
+                json.dump(self.sketches.to_dict(), f, ensure_ascii=False, indent=2)
+            print(f"{Fore.GREEN}✓ Top words/characters per language saved to: {Fore.WHITE}{sketch_file}")
+        if self.dashboard_path or self.summary_path:
+            self.export_summary()
         print(f"{Fore.MAGENTA}{'='*80}\n")
+    
+    def export_summary(self):
+        """Write the aggregated summary as JSON and/or a standalone HTML dashboard"""
+        summary = self.results.summary()
+        if self.summary_path:
+            Path(self.summary_path).parent.mkdir(parents=True, exist_ok=True)
+            with open(self.summary_path, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+            print(f"{Fore.GREEN}✓ Aggregated summary saved to: {Fore.WHITE}{self.summary_path}")
+        if self.dashboard_path:
+            from visualizer import LanguageVisualizer
+            
+            path = Path(self.dashboard_path)
+            fig = LanguageVisualizer().create_batch_dashboard(summary)
+            LanguageVisualizer(path.parent).save_html(fig, path.name, 'cdn' if self.dashboard_cdn else True)
+            print(f"{Fore.GREEN}✓ Dashboard saved to: {Fore.WHITE}{path}")
+
+
+def read_text_file(file_path, max_chars=None):
+    """Read a text file, trying common encodings (one character past max_chars at most, if given)"""
+    for encoding in ['utf-8', 'latin-1', 'cp1252']:
+        try:
+            with open(file_path, 'r', encoding=encoding) as f:
+                return f.read(max_chars + 1 if max_chars else -1)
+        except UnicodeDecodeError:
+            continue
+    return None
+
+
+def count_file(file_path, max_chars=None, language=None, sketches=None):
+    """
+    Character, word and sentence counts of a text file, as in analyze_file() rows (None if unreadable)
+    
+    With sketches, the text is also counted under `language` (a near-duplicate's
+    representative's language), so the sketches cover every file of a cluster.
+    """
+    text = read_text_file(file_path, max_chars)
+    if text is None:
+        return None
+    text = text[:max_chars] if max_chars else text
+    if sketches is not None:
+        sketches.add(language, text)
+    return {'chars': len(text), 'words': len(text.split()), 'sentences': len(re.split(r'[.!?]+', text))}
+
+
+def shard_of(relative_path, shards):
+    """Shard index of a file: a stable hash of its path relative to the scanned directory"""
+    digest = hashlib.md5(relative_path.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % shards
+
+
+def parse_shard(value):
+    """Parse an 'i/N' shard spec (0 <= i < N) into (i, N)"""
+    if not value:
+        return None
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{value}', expected i/N such as 0/4")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard '{value}', need 0 <= i < N")
+    return index, count
+
+
+def analyze_file(file_path, languages=None, priors=None, engine='langdetect', normalize=True,
+                 sketches=None, budget=None):
+    """
+    Detect the language of one text file
+    
+    Args:
+        sketches (CorpusSketches): If given, the file's words and characters are
+            counted under its detected language
+        budget (DocumentBudget): If given, at most max_chars characters are read
+            and detection degrades instead of overrunning max_seconds
+    
+    Returns:
+        dict: 'status' ('ok', 'skipped' or 'error'), 'message', 'budget_status'
+        (see budget.STATUSES), and for 'ok' the report 'row' and the structured
+        'result' (AnalysisResult.to_dict())
+    """
+    try:
+        text = read_text_file(file_path, budget.max_chars if budget else None)
+        if not text:
+            return {'status': 'error', 'message': 'Could not read file'}
+        if len(text.strip()) < 10:
+            return {'status': 'skipped', 'message': 'File too short, skipping'}
+        
+        analysis = LanguageAnalyzer(text, languages, priors, engine, normalize, budget).to_result()
+        budget_status = analysis.stats['budget_status']
+        if not analysis.language:
+            message = 'Detection budget exceeded' if budget_status == 'timeout' else 'Could not detect language'
+            return {'status': 'error', 'message': message, 'budget_status': budget_status}
+        
+        if sketches is not None:
+            sketches.add(analysis.language, text)
+        
+        stats = analysis.stats
+        row = {
+            'file': file_path.name,
+            'path': str(file_path),
+            'language': analysis.language_name,
+            'code': analysis.language,
+            'confidence': round(analysis.confidence, 4),
+            'size_bytes': file_path.stat().st_size,
+            'chars': stats['total_chars'],
+            'words': stats['total_words'],
+            'sentences': stats['total_sentences'],
+            'dropped_chars': stats['dropped_chars'],
+            'status': budget_status
+        }
+        return {'status': 'ok', 'message': None, 'budget_status': budget_status, 'row': row,
+                'result': analysis.to_dict()}
+    except Exception as e:
+        return {'status': 'error', 'message': f"Error: {str(e)}"}
+
+
+def _analyze_batch_in_worker(file_paths, options, top_k=None):
+    """analyze_file() over a batch, plus the batch's sketches (if top_k), busy time and the worker's memory usage"""
+    started = time.perf_counter()
+    sketches = CorpusSketches(top_k) if top_k else None
+    outcomes = [analyze_file(file_path, sketches=sketches, **options) for file_path in file_paths]
+    return {'outcomes': outcomes, 'sketches': sketches, 'busy': time.perf_counter() - started,
+            'memory': memory_usage()}
+
+
+def _count_batch_in_worker(file_paths, languages, max_chars=None, top_k=None):
+    """count_file() over a batch of near-duplicates, plus the batch's sketches (if top_k), busy time and memory usage"""
+    started = time.perf_counter()
+    sketches = CorpusSketches(top_k) if top_k else None
+    counts = [count_file(file_path, max_chars, language, sketches)
+              for file_path, language in zip(file_paths, languages)]
+    return {'counts': counts, 'sketches': sketches, 'busy': time.perf_counter() - started,
+            'memory': memory_usage()}
+
+
+def _analyze_chunk_in_worker(file_path, start, end, options, top_k=None):
+    """analyze_chunk() for one byte range of a large file, plus busy time and the worker's memory usage"""
+    started = time.perf_counter()
+    partial = analyze_chunk(file_path, start, end, options, top_k)
+    return {'partial': partial, 'busy': time.perf_counter() - started, 'memory': memory_usage()}
+
+
+def build_parser():
+    """Build the command line parser"""
+    parser = argparse.ArgumentParser(
+        description="Batch language detection over a directory of text files",
+        epilog="Example: python batch_processor.py ./sample_texts  |  Sharded: python batch_processor.py ./corpus --shard 0/4 --output-dir parts, "
+               "then python batch_processor.py merge parts"
+    )
+    parser.add_argument('directory', help="Directory to scan")
+    parser.add_argument('--records', action='store_true',
+                        help="Detect languages per record in CSV/JSON files instead of per file")
+    parser.add_argument('--text-field', action='append', dest='text_fields',
+                        help="Text column or dotted JSON path for record mode (repeatable)")
+    parser.add_argument('--chunk-size', type=int, default=1000,
+                        help="Records per detection batch in record mode")
+    parser.add_argument('--output-dir', default='.',
+                        help="Where record-mode per-record outputs are written")
+    parser.add_argument('--results-jsonl',
+                        help="Also write one structured JSON result per file to this path")
+    parser.add_argument('--languages',
+                        help="Comma-separated allowlist of language codes, e.g. en,fr,de")
+    parser.add_argument('--priors',
+                        help="Comma-separated prior weights, e.g. en=0.7,fr=0.2,de=0.1")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes; models are shared between them via shared memory")
+    parser.add_argument('--engine', default='langdetect',
+                        help="Detection engine name, .npz model file or profile directory "
+                             "('compact' lets workers share one model copy)")
+    parser.add_argument('--no-normalize', dest='normalize', action='store_false',
+                        help="Detect on raw text instead of stripping URLs, code, markup and IDs first")
+    parser.add_argument('--dedup', action='store_true',
+                        help="Cluster near-duplicate files (MinHash LSH) and detect once per cluster")
+    parser.add_argument('--dedup-threshold', type=float, default=0.7,
+                        help="Estimated Jaccard similarity for two files to share a cluster")
+    parser.add_argument('--heavy-hitters', action='store_true',
+                        help="Track corpus-wide top words and characters per language (fixed-memory sketches)")
+    parser.add_argument('--top-k', type=int, default=20,
+                        help="Items kept per language by --heavy-hitters")
+    parser.add_argument('--max-chars', type=int,
+                        help="Per-file size budget: analyze at most this many characters (status 'truncated')")
+    parser.add_argument('--max-seconds', type=float,
+                        help="Per-file CPU-time budget; detection degrades to sampling or a script-only "
+                             "guess instead of overrunning it")
+    parser.add_argument('--large-file-mb', type=float, default=LARGE_FILE_BYTES / 2**20,
+                        help="Files at least this large are split on paragraph/line boundaries and their "
+                             "chunks analyzed in parallel by the workers (0 disables)")
+    parser.add_argument('--chunk-mb', type=float, default=CHUNK_BYTES / 2**20,
+                        help="Chunk size for large files")
+    parser.add_argument('--chunk-breakdown', action='store_true',
+                        help="Include each large-file chunk's language in the --results-jsonl output")
+    parser.add_argument('--verbose', action='store_true',
+                        help="Print a line per file instead of the periodic progress line")
+    parser.add_argument('--quiet', action='store_true',
+                        help="No progress output; only the final summary")
+    parser.add_argument('--progress-interval', type=float, default=PRINT_INTERVAL,
+                        help="Seconds between progress lines")
+    parser.add_argument('--status-file',
+                        help="Periodically rewrite this JSON file with progress, throughput, ETA, "
+                             "errors and language mix (for orchestration)")
+    parser.add_argument('--shard',
+                        help="Process only shard i of N (i/N, 0-based; files assigned by path hash) and "
+                             "write partial results to --output-dir for the merge subcommand")
+    parser.add_argument('--follow', action='store_true',
+                        help="Keep following .log files for appended lines instead of a one-off scan")
+    add_summary_arguments(parser)
+    return parser
+
+
+def add_summary_arguments(parser):
+    """Options for the aggregated summary outputs, shared by the scan and merge parsers"""
+    parser.add_argument('--dashboard',
+                        help="Write a standalone HTML dashboard of the aggregated results to this path")
+    parser.add_argument('--cdn', action='store_true',
+                        help="Load plotly.js in the dashboard from a CDN instead of embedding it (~4.8 MB)")
+    parser.add_argument('--summary-json',
+                        help="Write the aggregated results (language counts, histograms) as JSON to this path")
+
+
+def build_merge_parser():
+    """Build the command line parser for the merge subcommand"""
+    parser = argparse.ArgumentParser(
+        prog='batch_processor.py merge',
+        description="Combine the partial outputs of --shard runs into the final report",
+        epilog="Example: python batch_processor.py merge ./parts"
+    )
+    parser.add_argument('partials', nargs='+',
+                        help="Shard output directories or shard_<i>_of_<N>.json files")
+    add_summary_arguments(parser)
+    return parser
+
+
+def merge_main(argv):
+    """Entry point of the merge subcommand"""
+    args = build_merge_parser().parse_args(argv)
+    try:
+        processor = BatchProcessor.from_partials(args.partials)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"{Fore.RED}Error: {e}")
+        return
+    processor.dashboard_path = args.dashboard
+    processor.summary_path = args.summary_json
+    processor.dashboard_cdn = args.cdn
+    processor.generate_summary()
 
 
 def main():
     """Main entry point"""
-    if len(sys.argv) < 2:
-        print(f"{Fore.YELLOW}Usage: python batch_processor.py <directory_path>")
-        print(f"{Fore.CYAN}Example: python batch_processor.py ./sample_texts")
+    if sys.argv[1:2] == ['merge']:
+        merge_main(sys.argv[2:])
         return
     
-    directory = sys.argv[1]
+    parser = build_parser()
+    args = parser.parse_args()
+    try:
+        languages = parse_languages(args.languages)
+        priors = parse_priors(args.priors)
+        parse_engine(args.engine)
+        shard = parse_shard(args.shard)
+        budget = None
+        if args.max_chars is not None or args.max_seconds is not None:
+            budget = DocumentBudget(args.max_chars, args.max_seconds)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    directory = args.directory
     if not os.path.exists(directory):
         print(f"{Fore.RED}Error: Directory '{directory}' does not exist!")
         return
     
-    processor = BatchProcessor(directory)
+    if args.follow:
+        print(f"{Fore.CYAN}Following log files in: {Fore.WHITE}{directory}\n")
+        LogFollower([directory], languages=languages, priors=priors, engine=args.engine).follow()
+        return
+    
+    processor = BatchProcessor(directory, record_mode=args.records, text_fields=args.text_fields,
+                               chunk_size=args.chunk_size, output_dir=args.output_dir,
+                               results_path=args.results_jsonl, languages=languages, priors=priors,
+                               workers=args.workers, engine=args.engine, normalize=args.normalize,
+                               dedup=args.dedup, dedup_threshold=args.dedup_threshold,
+                               heavy_hitters=args.heavy_hitters, top_k=args.top_k, shard=shard,
+                               budget=budget, large_file_bytes=int(args.large_file_mb * 2**20),
+                               chunk_bytes=max(1, int(args.chunk_mb * 2**20)),
+                               chunk_breakdown=args.chunk_breakdown, verbose=args.verbose,
+                               quiet=args.quiet, status_path=args.status_file,
+                               progress_interval=args.progress_interval, dashboard_path=args.dashboard,
+                               summary_path=args.summary_json, dashboard_cdn=args.cdn)
     processor.process_directory()
 
 
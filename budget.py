@@ -0,0 +1,152 @@
+"""
+Detection Budgets
+Per-document input-size and CPU-time limits with cheaper fallbacks for pathological inputs
+"""
+
+import threading
+import time
+from collections import Counter
+
+from langdetect.language import Language
+
+from text_stats import script_histogram
+
+# Default limits of DocumentBudget()
+MAX_CHARS = 1000000
+MAX_SECONDS = 2.0
+
+# Inputs longer than this with fewer distinct characters are not worth a model pass
+DEGENERATE_MIN_LENGTH = 200
+DEGENERATE_DISTINCT_CHARS = 4
+# Characters inspected by the degenerate-input check and the script-only fallback
+SAMPLE_CHARS = 10000
+
+# Result status codes, mildest first; a document keeps the most severe one applied
+#   ok          - full detection within budget
+#   truncated   - input over max_chars, only the prefix was analyzed
+#   sampled     - CPU budget ran out during window sampling; result from the windows seen
+#   script_only - model skipped (degenerate input or budget spent); guessed from the script
+#   timeout     - budget spent and no script-based guess possible; no language
+STATUSES = ('ok', 'truncated', 'sampled', 'script_only', 'timeout')
+
+# Most likely language per script for the script-only fallback (Latin is too ambiguous)
+SCRIPT_LANGUAGES = {
+    'Cyrillic': 'ru', 'Arabic': 'ar', 'Chinese': 'zh-cn', 'Japanese': 'ja', 'Korean': 'ko',
+    'Devanagari': 'hi', 'Greek': 'el', 'Hebrew': 'he', 'Thai': 'th',
+}
+
+# Budget overruns in this process, by status (the detection server reports them on /health)
+OVERRUNS = Counter()
+_overruns_lock = threading.Lock()
+
+
+def detect_by_script(text, languages=None):
+    """
+    Guess the language from the dominant script of a text sample
+
+    Kana anywhere in the sample means Japanese even if Han characters dominate.
+
+    Returns:
+        list: A single Language (probability = the script's share of the
+        sample's letters), or [] for Latin/unknown scripts or languages
+        outside the allowlist
+    """
+    scripts = script_histogram(text[:SAMPLE_CHARS])
+    if not scripts:
+        return []
+    script = 'Japanese' if 'Japanese' in scripts else max(scripts.items(), key=lambda x: x[1])[0]
+    lang = SCRIPT_LANGUAGES.get(script)
+    if lang is None or (languages and lang not in languages):
+        return []
+    if script == 'Japanese':
+        share = (scripts['Japanese'] + scripts.get('Chinese', 0)) / sum(scripts.values())
+    else:
+        share = scripts[script] / sum(scripts.values())
+    return [Language(lang, share)]
+
+
+def is_degenerate(text):
+    """True for long inputs made of only a handful of distinct characters"""
+    if len(text) < DEGENERATE_MIN_LENGTH:
+        return False
+    return len(set(text[:SAMPLE_CHARS]) - set(' \t\r\n')) < DEGENERATE_DISTINCT_CHARS
+
+
+class DocumentBudget:
+    """
+    Limits applied to every document; picklable, so it can be sent to workers
+
+    Args:
+        max_chars: Input characters analyzed per document (None = unlimited)
+        max_seconds: CPU seconds (of the detecting thread) per document (None = unlimited)
+    """
+
+    def __init__(self, max_chars=MAX_CHARS, max_seconds=MAX_SECONDS):
+        if max_chars is not None and max_chars < 1:
+            raise ValueError("max_chars must be positive")
+        if max_seconds is not None and max_seconds <= 0:
+            raise ValueError("max_seconds must be positive")
+        self.max_chars = max_chars
+        self.max_seconds = max_seconds
+
+    def start(self):
+        """Start metering one document"""
+        return BudgetMeter(self)
+
+    def __repr__(self):
+        return f"DocumentBudget(max_chars={self.max_chars!r}, max_seconds={self.max_seconds!r})"
+
+
+class BudgetMeter:
+    """Tracks one document's CPU time and the degradations applied to it"""
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.started = time.thread_time()
+        self.status = 'ok'
+
+    @property
+    def cpu_seconds(self):
+        return time.thread_time() - self.started
+
+    def exceeded(self):
+        """True once the document has used up its CPU time"""
+        return self.budget.max_seconds is not None and self.cpu_seconds > self.budget.max_seconds
+
+    def degrade(self, status):
+        """Record an overrun; the most severe status wins"""
+        with _overruns_lock:
+            OVERRUNS[status] += 1
+        if STATUSES.index(status) > STATUSES.index(self.status):
+            self.status = status
+
+    def admit(self, text):
+        """Apply the size budget: returns the (possibly truncated) text to analyze"""
+        max_chars = self.budget.max_chars
+        if max_chars is not None and len(text) > max_chars:
+            self.degrade('truncated')
+            return text[:max_chars]
+        return text
+
+    def script_only(self, text, languages=None):
+        """Script-based fallback; sets 'script_only', or 'timeout' when it has no answer"""
+        result = detect_by_script(text, languages)
+        self.degrade('script_only' if result or not self.exceeded() else 'timeout')
+        return result
+
+    def info(self):
+        """Status fields merged into detection info"""
+        return {'status': self.status, 'cpu_seconds': round(self.cpu_seconds, 4)}
+
+
+def start_budget(budget):
+    """Resolve a `budget` argument: None, a DocumentBudget or an already running BudgetMeter"""
+    if budget is None or isinstance(budget, BudgetMeter):
+        return budget
+    return budget.start()
+
+
+def overrun_counts():
+    """Budget overruns recorded in this process so far, by status"""
+    with _overruns_lock:
+        return dict(OVERRUNS)
@@ -0,0 +1,156 @@
+"""
+Language Metadata Builder
+Generate language_data.py (names, scripts, countries, flags) from the table below and pycountry
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from colorama import init, Fore
+
+# Set UTF-8 encoding for Windows
+if os.name == 'nt':
+    import codecs
+    if hasattr(sys.stdout, 'buffer'):
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+init(autoreset=True)
+
+OUTPUT = Path(__file__).with_name('language_data.py')
+
+# code -> (display name, ISO 15924 scripts, ISO 3166 countries, primary country first)
+SOURCE = {
+    'af': ('Afrikaans', ('Latn',), ('ZA', 'NA')),
+    'ar': ('Arabic', ('Arab',), ('SA', 'EG', 'AE', 'MA')),
+    'bg': ('Bulgarian', ('Cyrl',), ('BG',)),
+    'bn': ('Bengali', ('Beng',), ('BD', 'IN')),
+    'ca': ('Catalan', ('Latn',), ('ES', 'AD')),
+    'cs': ('Czech', ('Latn',), ('CZ',)),
+    'cy': ('Welsh', ('Latn',), ('GB',)),
+    'da': ('Danish', ('Latn',), ('DK',)),
+    'de': ('German', ('Latn',), ('DE', 'AT', 'CH')),
+    'el': ('Greek', ('Grek',), ('GR', 'CY')),
+    'en': ('English', ('Latn',), ('US', 'GB', 'CA', 'AU')),
+    'es': ('Spanish', ('Latn',), ('ES', 'MX', 'AR', 'CO')),
+    'et': ('Estonian', ('Latn',), ('EE',)),
+    'fa': ('Persian', ('Arab',), ('IR', 'AF')),
+    'fi': ('Finnish', ('Latn',), ('FI',)),
+    'fr': ('French', ('Latn',), ('FR', 'BE', 'CA', 'CH')),
+    'gu': ('Gujarati', ('Gujr',), ('IN',)),
+    'he': ('Hebrew', ('Hebr',), ('IL',)),
+    'hi': ('Hindi', ('Deva',), ('IN',)),
+    'hr': ('Croatian', ('Latn',), ('HR', 'BA')),
+    'hu': ('Hungarian', ('Latn',), ('HU',)),
+    'id': ('Indonesian', ('Latn',), ('ID',)),
+    'it': ('Italian', ('Latn',), ('IT', 'CH')),
+    'ja': ('Japanese', ('Hani', 'Hira', 'Kana'), ('JP',)),
+    'kn': ('Kannada', ('Knda',), ('IN',)),
+    'ko': ('Korean', ('Hang', 'Hani'), ('KR', 'KP')),
+    'lt': ('Lithuanian', ('Latn',), ('LT',)),
+    'lv': ('Latvian', ('Latn',), ('LV',)),
+    'mk': ('Macedonian', ('Cyrl',), ('MK',)),
+    'ml': ('Malayalam', ('Mlym',), ('IN',)),
+    'mr': ('Marathi', ('Deva',), ('IN',)),
+    'ne': ('Nepali', ('Deva',), ('NP',)),
+    'nl': ('Dutch', ('Latn',), ('NL', 'BE')),
+    'no': ('Norwegian', ('Latn',), ('NO',)),
+    'pa': ('Punjabi', ('Guru', 'Arab'), ('IN', 'PK')),
+    'pl': ('Polish', ('Latn',), ('PL',)),
+    'pt': ('Portuguese', ('Latn',), ('PT', 'BR')),
+    'ro': ('Romanian', ('Latn',), ('RO', 'MD')),
+    'ru': ('Russian', ('Cyrl',), ('RU', 'BY', 'KZ')),
+    'sk': ('Slovak', ('Latn',), ('SK',)),
+    'sl': ('Slovenian', ('Latn',), ('SI',)),
+    'so': ('Somali', ('Latn',), ('SO',)),
+    'sq': ('Albanian', ('Latn',), ('AL',)),
+    'sv': ('Swedish', ('Latn',), ('SE', 'FI')),
+    'sw': ('Swahili', ('Latn',), ('TZ', 'KE')),
+    'ta': ('Tamil', ('Taml',), ('IN', 'LK')),
+    'te': ('Telugu', ('Telu',), ('IN',)),
+    'th': ('Thai', ('Thai',), ('TH',)),
+    'tl': ('Tagalog', ('Latn',), ('PH',)),
+    'tr': ('Turkish', ('Latn',), ('TR', 'CY')),
+    'uk': ('Ukrainian', ('Cyrl',), ('UA',)),
+    'ur': ('Urdu', ('Arab',), ('PK', 'IN')),
+    'vi': ('Vietnamese', ('Latn',), ('VN',)),
+    'zh-cn': ('Chinese (Simplified)', ('Hans',), ('CN', 'SG')),
+    'zh-tw': ('Chinese (Traditional)', ('Hant',), ('TW', 'HK')),
+}
+
+
+def build_table():
+    """
+    Resolve country names, flags and script names through pycountry
+
+    Returns:
+        tuple: (languages dict, scripts dict) as written to language_data.py
+    """
+    try:
+        import pycountry
+    except ImportError:
+        raise ImportError("Building the metadata table requires the 'pycountry' package: pip install pycountry")
+
+    languages, scripts = {}, {}
+    for code, (name, script_codes, country_codes) in sorted(SOURCE.items()):
+        countries = []
+        for alpha_2 in country_codes:
+            country = pycountry.countries.get(alpha_2=alpha_2)
+            if country is None:
+                raise ValueError(f"Unknown country '{alpha_2}' for language '{code}'")
+            countries.append((country.alpha_2, country.name, getattr(country, 'flag', '')))
+        for alpha_4 in script_codes:
+            script = pycountry.scripts.get(alpha_4=alpha_4)
+            if script is None:
+                raise ValueError(f"Unknown script '{alpha_4}' for language '{code}'")
+            scripts[alpha_4] = script.name
+        languages[code] = (name, script_codes, tuple(countries))
+    return languages, dict(sorted(scripts.items()))
+
+
+def render_module(languages, scripts):
+    """Source of language_data.py"""
+    lines = [
+        '"""',
+        'Language Metadata Table',
+        'Generated by build_language_metadata.py - do not edit by hand',
+        '"""',
+        '',
+        '# code -> (name, ISO 15924 scripts, ((ISO 3166 alpha-2, country name, flag), ...)), primary country first',
+        'LANGUAGES = {',
+    ]
+    lines.extend(f"    {code!r}: {entry!r}," for code, entry in languages.items())
+    lines.extend(['}', '', '# ISO 15924 code -> script name', 'SCRIPTS = {'])
+    lines.extend(f"    {code!r}: {name!r}," for code, name in scripts.items())
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Generate language_data.py, the runtime language metadata table",
+        epilog="Run after editing SOURCE; --check fails when the committed table is stale"
+    )
+    parser.add_argument('--output', type=Path, default=OUTPUT, help="Module to write")
+    parser.add_argument('--check', action='store_true',
+                        help="Exit with status 1 if the output differs from a fresh build instead of writing it")
+    args = parser.parse_args()
+
+    source = render_module(*build_table())
+    if args.check:
+        current = args.output.read_text(encoding='utf-8') if args.output.exists() else None
+        if current != source:
+            print(f"{Fore.RED}✗ {args.output} is out of date; run: python build_language_metadata.py")
+            sys.exit(1)
+        print(f"{Fore.GREEN}✓ {args.output} is up to date")
+        return
+
+    args.output.write_text(source, encoding='utf-8')
+    print(f"{Fore.GREEN}✓ Wrote {Fore.WHITE}{len(SOURCE)} {Fore.GREEN}languages to {Fore.WHITE}{args.output}")
+
+
+if __name__ == "__main__":
+    main()
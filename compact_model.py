@@ -0,0 +1,313 @@
+"""
+Compact Language Model
+Quantized, array-backed representation of the n-gram language profiles
+"""
+
+import argparse
+import os
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+from langdetect.detector import Detector
+from langdetect.language import Language
+from langdetect.utils.ngram import NGram
+from colorama import init, Fore
+
+# Set UTF-8 encoding for Windows
+if os.name == 'nt':
+    import codecs
+    if hasattr(sys.stdout, 'buffer'):
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+init(autoreset=True)
+
+# Same additive smoothing langdetect applies (alpha / BASE_FREQ)
+SMOOTHING = Detector.ALPHA_DEFAULT / Detector.BASE_FREQ
+MAX_TEXT_LENGTH = 10000
+
+
+def pack_ngram(gram):
+    """Pack a 1-3 character n-gram into a uint64 key (21 bits per code point)"""
+    key = 0
+    for ch in gram:
+        key = (key << 21) | ord(ch)
+    return key
+
+
+@lru_cache(maxsize=4096)
+def _normalize_char(ch):
+    return NGram.normalize(ch)
+
+
+def prepare_text(text, max_length=MAX_TEXT_LENGTH):
+    """langdetect's text cleaning: drop URLs/e-mails, normalize Vietnamese, drop stray Latin in non-Latin text"""
+    text = Detector.URL_RE.sub(' ', text[:max_length * 2])
+    text = Detector.MAIL_RE.sub(' ', text)
+    text = NGram.normalize_vi(text)[:max_length]
+
+    latin = sum(1 for ch in text if 'A' <= ch <= 'z')
+    non_latin = sum(1 for ch in text if ch >= '\u0300')
+    if latin * 2 < non_latin:
+        text = ''.join(ch for ch in text if ch < 'A' or 'z' < ch)
+    return text
+
+
+def word_ngrams(word):
+    """Character 1-3 grams of one (normalized) word padded with spaces, as langdetect extracts them"""
+    if len(word) > 1 and word.isupper():
+        # langdetect ignores all-capital words (acronyms)
+        return []
+    padded = f' {word} '
+    grams = []
+    for i in range(len(padded)):
+        for n in (1, 2, 3):
+            gram = padded[i:i + n]
+            if len(gram) == n and gram.strip():
+                grams.append(gram)
+    return grams
+
+
+def extract_ngrams(text):
+    """Character 1-3 grams of each space-padded word, as langdetect extracts them"""
+    normalized = ''.join(_normalize_char(ch) for ch in text)
+    grams = []
+    for word in normalized.split():
+        grams.extend(word_ngrams(word))
+    return grams
+
+
+class CompactModel:
+    """
+    N-gram model stored as sorted uint64 keys and a quantized log-probability matrix
+
+    values[i, l] holds log(P(ngram_i | lang_l) + SMOOTHING), quantized to int8
+    with a per-language scale/offset (or stored as float16 with scale 1).
+    """
+
+    def __init__(self, languages, keys, values, scales, offsets):
+        self.languages = list(languages)
+        self.keys = keys
+        self.values = values
+        self.scales = scales
+        self.offsets = offsets
+
+    @classmethod
+    def from_factory(cls, factory, dtype='int8'):
+        """Build from a loaded langdetect DetectorFactory"""
+        return cls.from_prob_map(factory.get_lang_list(), factory.word_lang_prob_map, dtype)
+
+    @classmethod
+    def from_prob_map(cls, languages, prob_map, dtype='int8'):
+        """Build from a {ngram: [prob per language]} map"""
+        items = sorted((pack_ngram(gram), probs) for gram, probs in prob_map.items() if 1 <= len(gram) <= 3)
+        keys = np.fromiter((key for key, _ in items), dtype=np.uint64, count=len(items))
+        logs = np.log(np.array([probs for _, probs in items], dtype=np.float64) + SMOOTHING)
+        return cls.from_log_probs(languages, keys, logs, dtype)
+
+    @classmethod
+    def from_log_probs(cls, languages, keys, logs, dtype='int8'):
+        """Quantize a float (features x languages) log-probability matrix"""
+        if dtype == 'int8':
+            low, high = logs.min(axis=0), logs.max(axis=0)
+            scales = np.maximum((high - low) / 254.0, 1e-12)
+            offsets = (high + low) / 2.0
+            values = np.clip(np.round((logs - offsets) / scales), -127, 127).astype(np.int8)
+        elif dtype == 'float16':
+            scales = np.ones(len(languages))
+            offsets = np.zeros(len(languages))
+            values = logs.astype(np.float16)
+        else:
+            raise ValueError("dtype must be 'int8' or 'float16'")
+        return cls(languages, keys, values, scales.astype(np.float64), offsets.astype(np.float64))
+
+    @classmethod
+    def load(cls, path):
+        """Load a model saved with save()"""
+        with np.load(path) as data:
+            return cls([str(lang) for lang in data['languages']], data['keys'], data['values'],
+                       data['scales'], data['offsets'])
+
+    def save(self, path):
+        """Save the model as an .npz file"""
+        np.savez(path, languages=np.array(self.languages), keys=self.keys, values=self.values,
+                 scales=self.scales, offsets=self.offsets)
+
+    def restrict(self, languages):
+        """Copy of the model scoring only the given languages"""
+        unknown = set(languages) - set(self.languages)
+        if unknown:
+            raise ValueError(f"Model has no language(s): {', '.join(sorted(unknown))}")
+        columns = [self.languages.index(lang) for lang in languages]
+        return CompactModel(languages, self.keys, np.ascontiguousarray(self.values[:, columns]),
+                            self.scales[columns], self.offsets[columns])
+
+    @property
+    def nbytes(self):
+        """Bytes held by the model arrays"""
+        return self.keys.nbytes + self.values.nbytes + self.scales.nbytes + self.offsets.nbytes
+
+    def lookup(self, grams):
+        """Row indices of the n-grams present in the model"""
+        if not grams:
+            return np.empty(0, dtype=np.intp)
+        keys = np.fromiter((pack_ngram(g) for g in grams), dtype=np.uint64, count=len(grams))
+        idx = np.searchsorted(self.keys, keys)
+        idx[idx == len(self.keys)] = 0
+        return idx[self.keys[idx] == keys]
+
+    def log_likelihood(self, text):
+        """Summed log-likelihood per language, or None if no known n-gram occurs"""
+        rows = self.lookup(extract_ngrams(prepare_text(text)))
+        if not len(rows):
+            return None
+        # Dequantize after summing: sum(q * s + o) == s * sum(q) + n * o
+        summed = self.values[rows].sum(axis=0, dtype=np.float64)
+        return summed * self.scales + len(rows) * self.offsets
+
+    def detect_langs(self, text, threshold=0.1, priors=None):
+        """Ranked langdetect-style Language list; empty when the text has no known n-grams"""
+        scores = self.log_likelihood(text)
+        if scores is None:
+            return []
+        if priors:
+            weights = np.array([priors.get(lang, 0.0) for lang in self.languages], dtype=np.float64)
+            if weights.sum() <= 0:
+                raise ValueError("At least one prior weight must be positive")
+            with np.errstate(divide='ignore'):
+                scores = scores + np.log(weights / weights.sum())
+        probs = np.exp(scores - scores.max())
+        probs /= probs.sum()
+        order = np.argsort(-probs)
+        return [Language(self.languages[i], float(probs[i])) for i in order if probs[i] > threshold]
+
+
+def python_object_size(obj, seen=None):
+    """Deep size of a dict/list/str/float structure, counting shared objects once"""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(python_object_size(k, seen) + python_object_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(python_object_size(v, seen) for v in obj)
+    return size
+
+
+def load_sample_corpus(directory=None):
+    """Labeled (text, code) pairs from sample_texts/ plus the built-in demo sentences"""
+    directory = Path(directory or Path(__file__).parent / 'sample_texts')
+    names = {'english': 'en', 'spanish': 'es', 'french': 'fr', 'german': 'de',
+             'japanese': 'ja', 'chinese': 'zh-cn'}
+    corpus = []
+    for path in sorted(directory.glob('*.txt')):
+        code = names.get(path.stem)
+        if code:
+            text = path.read_text(encoding='utf-8')
+            corpus.append((text, code))
+            # Sentence-sized slices make the comparison less trivial than whole files
+            corpus.extend((line, code) for line in text.splitlines() if len(line.strip()) >= 20)
+    corpus.extend([
+        ("Hello, how are you today? This is a sample English text.", 'en'),
+        ("Bonjour, comment allez-vous? Ceci est un exemple de texte français.", 'fr'),
+        ("Hola, ¿cómo estás? Este es un texto de ejemplo en español.", 'es'),
+        ("Guten Tag, wie geht es Ihnen? Dies ist ein deutscher Beispieltext.", 'de'),
+        ("Ciao, come stai? Questo è un testo di esempio in italiano.", 'it'),
+        ("Olá, como você está? Este é um texto de exemplo em português.", 'pt'),
+        ("Привет, как дела? Это пример текста на русском языке.", 'ru'),
+        ("こんにちは、お元気ですか？これは日本語のサンプルテキストです。", 'ja'),
+        ("你好，你好吗？这是一个中文示例文本。", 'zh-cn'),
+        ("नमस्ते, आप कैसे हैं? यह हिंदी में एक नमूना पाठ है।", 'hi'),
+    ])
+    return corpus
+
+
+def build_report(corpus=None):
+    """Measure memory and accuracy of the compact formats against the langdetect profiles"""
+    from langdetect import DetectorFactory, detector_factory
+    from langdetect.lang_detect_exception import LangDetectException
+    from langdetect.detector_factory import init_factory
+
+    DetectorFactory.seed = 0
+    init_factory()
+    factory = detector_factory._factory
+    corpus = corpus or load_sample_corpus()
+
+    def evaluate(detect):
+        predictions = []
+        start = time.perf_counter()
+        for text, _ in corpus:
+            try:
+                result = detect(text)
+            except LangDetectException:
+                result = []
+            predictions.append(result[0].lang if result else None)
+        elapsed = (time.perf_counter() - start) / len(corpus)
+        correct = sum(pred == code for pred, (_, code) in zip(predictions, corpus))
+        return predictions, correct / len(corpus), elapsed
+
+    def langdetect_detect(text):
+        detector = factory.create()
+        detector.append(text)
+        return detector.get_probabilities()
+
+    base_predictions, base_acc, base_time = evaluate(langdetect_detect)
+    rows = [('langdetect (dict of float lists)', python_object_size(factory.word_lang_prob_map),
+             base_acc, 1.0, base_time)]
+    for dtype in ('float16', 'int8'):
+        model = CompactModel.from_factory(factory, dtype)
+        predictions, acc, elapsed = evaluate(model.detect_langs)
+        agreement = sum(a == b for a, b in zip(predictions, base_predictions)) / len(corpus)
+        rows.append((f'compact {dtype}', model.nbytes, acc, agreement, elapsed))
+
+    return {'samples': len(corpus), 'features': len(factory.word_lang_prob_map),
+            'languages': len(factory.langlist), 'rows': rows}
+
+
+def print_report(report):
+    """Print a build_report() result"""
+    print(f"{Fore.CYAN}{'='*78}")
+    print(f"{Fore.YELLOW}COMPACT MODEL REPORT "
+          f"{Fore.WHITE}({report['features']:,} n-grams x {report['languages']} languages, "
+          f"{report['samples']} samples)")
+    print(f"{Fore.CYAN}{'='*78}")
+    base_bytes, base_acc = report['rows'][0][1], report['rows'][0][2]
+    print(f"{Fore.WHITE}{'Format':33} {'Memory':>11} {'Saved':>6} {'Accuracy':>8} {'Δ acc':>6} "
+          f"{'Agree':>6} {'ms/doc':>6}")
+    for name, nbytes, acc, agreement, elapsed in report['rows']:
+        saved = 1 - nbytes / base_bytes
+        print(f"{Fore.GREEN}{name:33} {nbytes / 1e6:>8.2f} MB {saved:>6.1%} {acc:>8.1%} "
+              f"{(acc - base_acc) * 100:>+6.1f} {agreement:>6.1%} {elapsed * 1000:>6.2f}")
+    print(f"{Fore.CYAN}{'='*78}")
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Build and evaluate compact language models")
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help="Write a compact model file from the langdetect profiles")
+    build.add_argument('output', help="Output .npz path")
+    build.add_argument('--dtype', choices=['int8', 'float16'], default='int8')
+    build.add_argument('--languages', help="Comma-separated allowlist of language codes")
+    report = sub.add_parser('report', help="Compare memory and accuracy against the current profiles")
+    report.add_argument('--corpus', help="Directory of <language>.txt samples (default: sample_texts/)")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        from detection_engine import get_factory, parse_languages
+        model = CompactModel.from_factory(get_factory(parse_languages(args.languages)), args.dtype)
+        model.save(args.output)
+        size = os.path.getsize(args.output if args.output.endswith('.npz') else args.output + '.npz')
+        print(f"{Fore.GREEN}✓ Saved {len(model.keys):,} n-grams x {len(model.languages)} languages "
+              f"({model.nbytes / 1e6:.2f} MB in memory, {size / 1e6:.2f} MB on disk)")
+    else:
+        print_report(build_report(load_sample_corpus(args.corpus) if args.corpus else None))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Engine Comparison
+Run several detection engines over one corpus and report agreement, accuracy and throughput
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from colorama import init, Fore
+
+# Set UTF-8 encoding for Windows
+if os.name == 'nt':
+    import codecs
+    if hasattr(sys.stdout, 'buffer'):
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+init(autoreset=True)
+
+from langdetect import LangDetectException
+
+from compact_model import load_sample_corpus
+from detection_engine import detect_langs, engine_names, get_engine, parse_languages, parse_priors, warm_up
+from record_processor import extract_field
+
+# Accuracy (in percentage points) an engine may lose against the most accurate one and still be picked
+MAX_ACCURACY_DROP = 1.0
+
+
+def load_labeled_corpus(path=None, text_field='text', label_field=None):
+    """
+    (text, expected code) pairs to compare engines on
+
+    Args:
+        path: Directory of <language>.txt samples (default: sample_texts/) or a JSON Lines file
+        text_field: Text field (dotted path) in JSONL records
+        label_field: Optional field holding the expected language code; without
+            it JSONL texts are unlabeled (expected code None)
+    """
+    if path is None or Path(path).is_dir():
+        return load_sample_corpus(path)
+    corpus = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            text = extract_field(record, text_field)
+            if text:
+                corpus.append((text, extract_field(record, label_field) if label_field else None))
+    if not corpus:
+        raise ValueError(f"No texts found in {path}")
+    return corpus
+
+
+def run_engine(engine, corpus, languages=None, priors=None):
+    """
+    Detect every corpus text with one engine, after warming its models up
+
+    Returns:
+        tuple: (predicted codes, per-document latencies in seconds)
+    """
+    warm_up(engine, languages)
+    predictions, latencies = [], []
+    for text, _ in corpus:
+        start = time.perf_counter()
+        try:
+            result = detect_langs(text, languages, priors, engine=engine)
+        except LangDetectException:
+            result = []
+        latencies.append(time.perf_counter() - start)
+        predictions.append(result[0].lang if result else None)
+    return predictions, latencies
+
+
+def compare_engines(corpus, engines=None, languages=None, priors=None, max_accuracy_drop=MAX_ACCURACY_DROP):
+    """
+    Compare engines on the same corpus
+
+    Agreement is measured against the first engine (the reference) and
+    pairwise. The recommendation is the fastest engine whose accuracy is
+    within max_accuracy_drop points of the best one (or whose agreement
+    with the reference is, for an unlabeled corpus).
+
+    Returns:
+        dict: 'samples', 'chars', 'labeled', per-engine 'rows', pairwise
+        'agreement' matrix and the 'recommended' engine
+    """
+    engines = list(engines or engine_names())
+    for engine in engines:
+        get_engine(engine)
+    labels = [code for _, code in corpus]
+    labeled = [i for i, code in enumerate(labels) if code]
+    chars = sum(len(text) for text, _ in corpus)
+
+    predictions, rows = {}, []
+    for engine in engines:
+        predicted, latencies = run_engine(engine, corpus, languages, priors)
+        predictions[engine] = predicted
+        elapsed = sum(latencies)
+        latencies.sort()
+        reference = predictions[engines[0]]
+        rows.append({
+            'engine': engine,
+            'accuracy': (sum(predicted[i] == labels[i] for i in labeled) / len(labeled)) if labeled else None,
+            'agreement': sum(a == b for a, b in zip(predicted, reference)) / len(corpus),
+            'undetected': predicted.count(None),
+            'docs_per_sec': len(corpus) / elapsed if elapsed else None,
+            'mb_per_sec': chars / elapsed / 1e6 if elapsed else None,
+            'ms_per_doc': 1000 * elapsed / len(corpus),
+            'p95_ms': 1000 * latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        })
+
+    agreement = {a: {b: sum(x == y for x, y in zip(predictions[a], predictions[b])) / len(corpus)
+                     for b in engines} for a in engines}
+
+    quality = 'accuracy' if labeled else 'agreement'
+    best = max(row[quality] for row in rows)
+    acceptable = [row for row in rows if 100 * (best - row[quality]) <= max_accuracy_drop]
+    recommended = max(acceptable, key=lambda row: row['docs_per_sec'] or 0)['engine']
+
+    return {'samples': len(corpus), 'chars': chars, 'labeled': len(labeled), 'rows': rows,
+            'agreement': agreement, 'recommended': recommended, 'max_accuracy_drop': max_accuracy_drop}
+
+
+def print_comparison(report):
+    """Print a compare_engines() result"""
+    print(f"{Fore.CYAN}{'='*86}")
+    print(f"{Fore.YELLOW}ENGINE COMPARISON "
+          f"{Fore.WHITE}({report['samples']:,} texts, {report['chars']:,} chars, {report['labeled']:,} labeled)")
+    print(f"{Fore.CYAN}{'='*86}")
+    width = max(24, max(len(row['engine']) for row in report['rows']))
+    print(f"{Fore.WHITE}{'Engine':{width}} {'Accuracy':>8} {'Agree':>6} {'Undet.':>6} "
+          f"{'docs/s':>9} {'MB/s':>7} {'ms/doc':>7} {'p95 ms':>7}")
+    for row in report['rows']:
+        accuracy = f"{row['accuracy']:.1%}" if row['accuracy'] is not None else '-'
+        color = Fore.MAGENTA if row['engine'] == report['recommended'] else Fore.GREEN
+        print(f"{color}{row['engine']:{width}} {accuracy:>8} {row['agreement']:>6.1%} {row['undetected']:>6} "
+              f"{row['docs_per_sec'] or 0:>9,.1f} {row['mb_per_sec'] or 0:>7.2f} "
+              f"{row['ms_per_doc']:>7.2f} {row['p95_ms']:>7.2f}")
+
+    engines = [row['engine'] for row in report['rows']]
+    if len(engines) > 2:
+        print(f"\n{Fore.YELLOW}Pairwise agreement:")
+        for a in engines:
+            cells = ' '.join(f"{report['agreement'][a][b]:>7.1%}" for b in engines)
+            print(f"{Fore.WHITE}  {a:{width}} {cells}")
+    print(f"\n{Fore.GREEN}✓ Recommended: {Fore.MAGENTA}{report['recommended']} "
+          f"{Fore.WHITE}(fastest within {report['max_accuracy_drop']:g} points of the best "
+          f"{'accuracy' if report['labeled'] else 'agreement'})")
+    print(f"{Fore.CYAN}{'='*86}")
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compare detection engines on one corpus (agreement, accuracy, throughput)",
+        epilog="Example: python compare_engines.py --engines langdetect,compact,models/en_fr.npz"
+    )
+    parser.add_argument('--engines', help=f"Comma-separated engine names or .npz model files "
+                                          f"(default: {','.join(engine_names())})")
+    parser.add_argument('--corpus', help="Directory of <language>.txt samples (default: sample_texts/) "
+                                         "or a JSON Lines file")
+    parser.add_argument('--text-field', default='text', help="Text field (dotted path) in JSONL records")
+    parser.add_argument('--label-field', help="Expected language code field in JSONL records")
+    parser.add_argument('--languages', help="Comma-separated allowlist of language codes, e.g. en,fr,de")
+    parser.add_argument('--priors', help="Comma-separated prior weights, e.g. en=0.7,fr=0.3")
+    parser.add_argument('--max-accuracy-drop', type=float, default=MAX_ACCURACY_DROP,
+                        help="Accuracy points an engine may lose and still be recommended")
+    parser.add_argument('--json', action='store_true', help="Print the comparison as JSON")
+    args = parser.parse_args()
+
+    engines = args.engines.split(',') if args.engines else None
+    try:
+        languages = parse_languages(args.languages)
+        priors = parse_priors(args.priors)
+        corpus = load_labeled_corpus(args.corpus, args.text_field, args.label_field)
+        report = compare_engines(corpus, engines, languages, priors, args.max_accuracy_drop)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_comparison(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Near-Duplicate Clustering
+MinHash signatures and a banded LSH index to skip redundant detections
+"""
+
+import re
+
+import numpy as np
+
+# Characters per shingle and the prefix of each document that is fingerprinted
+SHINGLE_SIZE = 5
+MAX_CHARS = 20000
+# Signature length (power of two) and the value marking an empty bin
+NUM_PERM = 64
+EMPTY = np.uint64(2**64 - 1)
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+_MULTIPLIER = np.uint64(0x100000001B3)
+
+
+def _mix(h):
+    """splitmix64 finalizer: spreads the rolling hash over all 64 bits"""
+    h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+
+def shingle_hashes(text, size=SHINGLE_SIZE, max_chars=MAX_CHARS):
+    """64-bit hashes of the overlapping character shingles of a text (vectorized)"""
+    text = WHITESPACE_RE.sub(' ', text[:max_chars * 2].lower()).strip()[:max_chars]
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    if len(codes) < size:
+        return _mix(codes[:1] + np.uint64(len(codes))) if len(codes) else codes
+    h = np.zeros(len(codes) - size + 1, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for k in range(size):
+            h = h * _MULTIPLIER + codes[k:len(codes) - size + 1 + k]
+        return _mix(h)
+
+
+def minhash(text, num_perm=NUM_PERM, size=SHINGLE_SIZE, max_chars=MAX_CHARS):
+    """
+    One-permutation MinHash signature of a text's shingle set
+
+    The hash range is split into num_perm bins by the top bits and the
+    minimum of each bin is kept, so one pass replaces num_perm hash functions.
+    Empty bins hold EMPTY.
+    """
+    hashes = np.unique(shingle_hashes(text, size, max_chars))
+    shift = np.uint64(64 - (num_perm.bit_length() - 1))
+    signature = np.full(num_perm, EMPTY, dtype=np.uint64)
+    if len(hashes):
+        bins = (hashes >> shift).astype(np.intp)
+        # hashes are sorted, so the first hash of each bin is its minimum
+        first = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+        signature[bins[first]] = hashes[first] & np.uint64((1 << int(shift)) - 1)
+    return signature
+
+
+def jaccard(a, b):
+    """Estimated Jaccard similarity of two signatures (bins empty in both are ignored)"""
+    used = (a != EMPTY) | (b != EMPTY)
+    if not used.any():
+        return 1.0
+    return float((a[used] == b[used]).mean())
+
+
+class NearDuplicateIndex:
+    """
+    Groups documents whose estimated Jaccard similarity to a cluster
+    representative is at least `threshold`
+
+    Signatures are split into bands of `rows` values; representatives sharing
+    a whole band with a query land in the same bucket and are the only ones
+    compared (locality-sensitive hashing).
+    """
+
+    def __init__(self, threshold=0.7, num_perm=NUM_PERM, rows=4):
+        if num_perm & (num_perm - 1) or num_perm % rows:
+            raise ValueError("num_perm must be a power of two and a multiple of rows")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.rows = rows
+        self.bands = num_perm // rows
+        self.buckets = [{} for _ in range(self.bands)]
+        self.representatives = []
+
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def find(self, signature):
+        """Cluster id of the most similar representative above threshold, or None"""
+        best, best_similarity = None, self.threshold
+        seen = set()
+        for bucket, key in zip(self.buckets, self._band_keys(signature)):
+            for cluster_id in bucket.get(key, ()):
+                if cluster_id in seen:
+                    continue
+                seen.add(cluster_id)
+                similarity = jaccard(signature, self.representatives[cluster_id])
+                if similarity >= best_similarity:
+                    best, best_similarity = cluster_id, similarity
+        return best
+
+    def add(self, signature):
+        """Start a new cluster with this signature as representative; returns its id"""
+        cluster_id = len(self.representatives)
+        self.representatives.append(signature)
+        for bucket, key in zip(self.buckets, self._band_keys(signature)):
+            bucket.setdefault(key, []).append(cluster_id)
+        return cluster_id
+
+    def assign(self, signature):
+        """
+        Cluster a signature
+
+        Returns:
+            tuple: (cluster_id, is_representative)
+        """
+        cluster_id = self.find(signature)
+        if cluster_id is not None:
+            return cluster_id, False
+        return self.add(signature), True
+
+    def __len__(self):
+        return len(self.representatives)
@@ -174,7 +174,7 @@ def demo_visualizations():
     visualizer = LanguageVisualizer(output_dir='demo_visualizations')
     
     try:
-        visualizer.create_comprehensive_dashboard(analyzer)
+        visualizer.save_html(visualizer.create_comprehensive_dashboard(analyzer), 'dashboard.html')
         print(f"\n{Fore.GREEN}✓ Visualizations saved to 'demo_visualizations/' directory")
     except Exception as e:
         print(f"{Fore.RED}Note: Visualization generation requires display (skipped in some environments)")
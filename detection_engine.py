@@ -0,0 +1,498 @@
+"""
+Detection Engine
+Single entry point for language detection used by every front end
+"""
+
+import json
+import math
+import os
+from functools import lru_cache
+
+from langdetect import LangDetectException, detector_factory
+from langdetect.detector_factory import DetectorFactory, PROFILES_DIRECTORY, init_factory
+from langdetect.lang_detect_exception import ErrorCode
+from langdetect.language import Language
+from langdetect.utils.lang_profile import LangProfile
+
+from budget import is_degenerate, start_budget
+from compact_model import CompactModel
+from short_text import SHORT_TEXT_THRESHOLD, get_short_text_model
+from text_normalizer import normalize_text
+
+# Texts longer than this are detected from sampled windows (detect_sequential)
+SEQUENTIAL_THRESHOLD = 20000
+SEQUENTIAL_WINDOW = 2000
+SEQUENTIAL_MAX_WINDOWS = 16
+# Stop sampling once P(top) - P(runner-up) reaches this
+SEQUENTIAL_MARGIN = 0.95
+# Probability assumed for a language a window did not report (langdetect drops those below 0.1)
+WINDOW_FLOOR = 0.01
+
+
+
+@lru_cache(maxsize=1)
+def _profile_languages():
+    return tuple(sorted(name for name in os.listdir(PROFILES_DIRECTORY) if not name.startswith('.')))
+
+
+def available_languages():
+    """Language codes that have a detection profile"""
+    return list(_profile_languages())
+
+
+def normalize_languages(languages):
+    """Validate an allowlist and return it as a sorted tuple (None means all languages)"""
+    if not languages:
+        return None
+    languages = tuple(sorted({lang.strip() for lang in languages if lang.strip()}))
+    unknown = set(languages) - set(_profile_languages())
+    if unknown:
+        raise ValueError(f"Unsupported language code(s): {', '.join(sorted(unknown))}")
+    return languages
+
+
+def parse_languages(value):
+    """Parse a comma-separated CLI allowlist such as 'en,fr,de'"""
+    return normalize_languages(value.split(',')) if value else None
+
+
+def parse_priors(value):
+    """Parse comma-separated CLI priors such as 'en=0.7,fr=0.2,de=0.1'"""
+    if not value:
+        return None
+    priors = {}
+    for item in value.split(','):
+        lang, _, weight = item.partition('=')
+        try:
+            priors[lang.strip()] = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid prior '{item}', expected code=weight")
+    normalize_languages(priors)
+    return priors
+
+
+def build_factory(languages=None, directory=PROFILES_DIRECTORY):
+    """Uncached langdetect factory holding only the allowlisted profiles' n-grams (None = all)"""
+    languages = languages or _profile_languages()
+    factory = DetectorFactory()
+    for index, lang in enumerate(languages):
+        with open(os.path.join(directory, lang), 'r', encoding='utf-8') as f:
+            factory.add_profile(LangProfile(**json.load(f)), index, len(languages))
+    return factory
+
+
+@lru_cache(maxsize=32)
+def _reduced_factory(languages, directory=PROFILES_DIRECTORY):
+    """build_factory(), cached per allowlist"""
+    return build_factory(languages, directory)
+
+
+def get_factory(languages=None):
+    """langdetect factory for an allowlist (None = the shared full model), cached per allowlist"""
+    languages = normalize_languages(languages)
+    if languages is None:
+        init_factory()
+        return detector_factory._factory
+    return _reduced_factory(languages)
+
+
+# Models installed by register_models() (e.g. shared-memory views in worker processes)
+_registered = {}
+
+
+def register_models(languages=None, compact=None, short_text=None):
+    """Use pre-built models for an allowlist instead of building private copies"""
+    languages = normalize_languages(languages)
+    if compact is not None:
+        _registered['compact', languages] = compact
+    if short_text is not None:
+        _registered['short_text', languages] = short_text
+
+
+@lru_cache(maxsize=32)
+def _compact_model(languages):
+    return CompactModel.from_factory(get_factory(languages))
+
+
+def get_compact_model(languages=None):
+    """Quantized compact model for an allowlist, built once from the matching factory and cached"""
+    languages = normalize_languages(languages)
+    return _registered.get(('compact', languages)) or _compact_model(languages)
+
+
+def _short_text_model(languages):
+    return _registered.get(('short_text', languages)) or get_short_text_model(languages)
+
+
+class DetectionEngine:
+    """
+    Interface of a detection backend
+
+    An engine scores one already normalized block of text; detect_details()
+    adds normalization, sampling and budgets around it, and the short-text
+    path for engines that set short_text (it is built from the stock
+    profiles, so custom profile sets and model files don't use it).
+    Instances registered with register_engine() are selectable by name
+    everywhere an `engine` option is taken (LanguageAnalyzer, BatchProcessor,
+    the CLIs' --engine).
+    """
+
+    name = None
+    short_text = False
+
+    def detect_langs(self, text, languages=None, priors=None):
+        """Ranked langdetect Language objects (.lang, .prob), best first"""
+        raise NotImplementedError
+
+    def warm_up(self, languages=None):
+        """Build or load the models for an allowlist ahead of the first request"""
+        self.detect_langs("warm up the detector", languages)
+
+
+class LangdetectEngine(DetectionEngine):
+    """langdetect's profile dicts (the reference implementation)"""
+
+    name = 'langdetect'
+    short_text = True
+
+    def detect_langs(self, text, languages=None, priors=None):
+        return _factory_probabilities(get_factory(languages), text, priors)
+
+
+def _factory_probabilities(factory, text, priors=None):
+    """Run one langdetect detector from a factory"""
+    detector = factory.create()
+    if priors:
+        detector.set_prior_map(priors)
+    detector.append(text)
+    return detector.get_probabilities()
+
+
+class CompactEngine(DetectionEngine):
+    """Vectorized scoring over the quantized int8 n-gram arrays (compact_model.py)"""
+
+    name = 'compact'
+    short_text = True
+
+    def detect_langs(self, text, languages=None, priors=None):
+        return get_compact_model(languages).detect_langs(text, priors=priors)
+
+
+class ModelFileEngine(DetectionEngine):
+    """A compact model file written by `compact_model.py build`, loaded on first use"""
+
+    def __init__(self, path):
+        self.name = str(path)
+        self.path = path
+        self._models = {}
+
+    def model(self, languages=None):
+        """The file's model, restricted to an allowlist (cached per allowlist)"""
+        model = self._models.get(languages)
+        if model is None:
+            if languages is None:
+                model = CompactModel.load(self.path)
+            else:
+                model = self.model().restrict(languages)
+            self._models[languages] = model
+        return model
+
+    def detect_langs(self, text, languages=None, priors=None):
+        return self.model(languages).detect_langs(text, priors=priors)
+
+
+class ProfileDirectoryEngine(DetectionEngine):
+    """langdetect scoring over a directory of profiles (e.g. written by train_profiles.py)"""
+
+    def __init__(self, directory):
+        self.name = str(directory)
+        self.directory = str(directory)
+        self.languages = tuple(sorted(name for name in os.listdir(directory)
+                                      if not name.startswith('.') and not name.endswith('.json')))
+
+    def detect_langs(self, text, languages=None, priors=None):
+        languages = languages or self.languages
+        unknown = set(languages) - set(self.languages)
+        if unknown:
+            raise ValueError(f"No profile for language(s) {', '.join(sorted(unknown))} in {self.directory}")
+        return _factory_probabilities(_reduced_factory(tuple(languages), self.directory), text, priors)
+
+
+# Engines selectable by name, in registration order
+_engines = {}
+
+
+def register_engine(engine, name=None):
+    """Make a DetectionEngine selectable as engine=name (default: engine.name)"""
+    _engines[name or engine.name] = engine
+    return engine
+
+
+register_engine(LangdetectEngine())
+register_engine(CompactEngine())
+
+
+def engine_names():
+    """Names of the registered engines"""
+    return list(_engines)
+
+
+def get_engine(name):
+    """
+    Registered engine by name; a path to a .npz model file or to a directory of
+    langdetect profiles is loaded as an engine
+
+    Raises:
+        ValueError: If the name is neither registered nor an existing model file or directory
+    """
+    engine = _engines.get(name)
+    if engine is None:
+        if str(name).endswith('.npz') and os.path.isfile(name):
+            engine = register_engine(ModelFileEngine(name))
+        elif os.path.isdir(str(name)):
+            engine = register_engine(ProfileDirectoryEngine(name))
+        else:
+            raise ValueError(f"Unknown engine '{name}', expected one of: {', '.join(_engines)}, "
+                             f"a .npz model file or a profile directory")
+    return engine
+
+
+def parse_engine(value):
+    """Validate a CLI --engine value (engine name, model file or profile directory) and return it"""
+    get_engine(value)
+    return value
+
+
+def warm_up(engine='langdetect', languages=None):
+    """Load an engine's and the short-text models before serving concurrent requests"""
+    languages = normalize_languages(languages)
+    engine = get_engine(engine)
+    engine.warm_up(languages)
+    if engine.short_text:
+        _short_text_model(languages)
+
+
+def _detect_block(text, languages, priors, short_text_threshold, engine):
+    """Score one (already normalized) block of text with the selected engine"""
+    engine = get_engine(engine)
+    if engine.short_text and len(text.strip()) < short_text_threshold:
+        result = _short_text_model(languages).detect_langs(text, priors=priors)
+        if result:
+            return result
+    return engine.detect_langs(text, languages, priors)
+
+
+def window_starts(length, window_chars, max_windows):
+    """
+    Start offsets of spread-out windows, in sampling order
+
+    Uses the base-2 van der Corput sequence (0, 1/2, 1/4, 3/4, 1/8, ...), so
+    each new window lands in the largest region not yet sampled.
+    """
+    slots = max(1, length // window_chars)
+    starts, seen = [], set()
+    i = 0
+    while len(starts) < min(slots, max_windows):
+        fraction, denominator, n = 0.0, 1, i
+        while n:
+            denominator *= 2
+            fraction += (n & 1) / denominator
+            n >>= 1
+        slot = int(fraction * slots)
+        if slot not in seen:
+            seen.add(slot)
+            starts.append(slot * window_chars)
+        i += 1
+    return starts
+
+
+def detect_sequential(text, languages=None, priors=None, engine='langdetect', normalize=True,
+                      window_chars=SEQUENTIAL_WINDOW, max_windows=SEQUENTIAL_MAX_WINDOWS,
+                      margin=SEQUENTIAL_MARGIN, min_windows=3, budget=None):
+    """
+    Detect a long document from spread-out windows, stopping once the answer is clear
+
+    Each window is detected on its own and its probabilities are multiplied
+    into a running posterior (languages a window did not report get
+    WINDOW_FLOOR). Sampling stops when the top language leads the runner-up by
+    at least `margin`, so cost depends on how ambiguous the text is rather
+    than on its length. With a running budget (BudgetMeter), sampling also
+    stops once the document's CPU time is spent ('sampled' status).
+
+    Returns:
+        tuple: (Language list, info) where info has 'windows', 'used_chars',
+        'dropped_chars', 'converged' and 'margin'
+    """
+    languages = normalize_languages(languages)
+    scores, windows, used, top_margin = {}, 0, 0, 0.0
+    for start in window_starts(len(text), window_chars, max_windows):
+        if budget is not None and windows and budget.exceeded():
+            budget.degrade('sampled')
+            break
+        # Snap to the next whitespace so windows don't start mid-word
+        space = text.find(' ', start, start + 100)
+        start = space + 1 if space >= 0 and start else start
+        block, _ = normalize_text(text[start:start + window_chars], normalize)
+        windows += 1
+        used += len(block)
+        try:
+            result = _detect_block(block, languages, None, 0, engine)
+        except LangDetectException:
+            continue
+
+        probs = {p.lang: p.prob for p in result}
+        for lang in probs.keys() - scores.keys():
+            scores[lang] = (windows - 1) * math.log(WINDOW_FLOOR)
+        for lang in scores:
+            scores[lang] += math.log(max(probs.get(lang, 0.0), WINDOW_FLOOR))
+
+        posterior = _posterior(scores, priors)
+        ranked = sorted(posterior.values(), reverse=True) + [0.0]
+        top_margin = ranked[0] - ranked[1]
+        if windows >= min_windows and top_margin >= margin:
+            break
+
+    posterior = _posterior(scores, priors) if scores else {}
+    result = [Language(lang, prob) for lang, prob in posterior.items() if prob > 0.1]
+    result.sort(key=lambda p: -p.prob)
+    return result, {
+        'windows': windows,
+        'used_chars': used,
+        'dropped_chars': len(text) - used,
+        'converged': top_margin >= margin,
+        'margin': top_margin,
+    }
+
+
+def _posterior(scores, priors=None):
+    """Normalize summed log-probabilities (plus optional log priors) into probabilities"""
+    if priors:
+        scores = {lang: score + math.log(priors[lang]) for lang, score in scores.items()
+                  if priors.get(lang, 0) > 0}
+    if not scores:
+        return {}
+    best = max(scores.values())
+    weights = {lang: math.exp(score - best) for lang, score in scores.items()}
+    total = sum(weights.values())
+    return {lang: weight / total for lang, weight in weights.items()}
+
+
+def detect_details(text, languages=None, priors=None, short_text_threshold=SHORT_TEXT_THRESHOLD,
+                   engine='langdetect', normalize=True, sequential_threshold=SEQUENTIAL_THRESHOLD,
+                   budget=None):
+    """
+    Detect ranked language probabilities and report how much text was used
+
+    With the stock engines, texts shorter than short_text_threshold characters
+    go through the compact short-text model; texts longer than sequential_threshold are sampled
+    window by window (detect_sequential); everything else is normalized and
+    scored in one block.
+
+    Args:
+        text (str): Input text
+        languages (iterable): Optional allowlist of language codes; only their models are scored
+        priors (dict): Optional {code: weight} prior over languages
+        short_text_threshold (int): Length below which the short-text path is used (0 disables it)
+        engine (str): Registered engine name ('langdetect', 'compact', ...), a
+            .npz model file or a profile directory (see get_engine)
+        normalize: True strips URLs/code/markup/IDs first (text_normalizer), False
+            disables it, or pass a configured TextNormalizer
+        sequential_threshold (int): Length above which sequential sampling is used (0 disables it)
+        budget: Optional DocumentBudget (or running BudgetMeter). Oversized input is
+            truncated, degenerate input (e.g. one repeated character) and input
+            left without CPU time are guessed from their script, and sampling
+            stops when the time is spent
+
+    Returns:
+        tuple: (langdetect Language objects best first, info dict with
+        'used_chars', 'dropped_chars', 'windows' and the normalizer's 'removed' counts;
+        with a budget also 'status' (see budget.STATUSES) and 'cpu_seconds')
+
+    Raises:
+        LangDetectException: If no language features are found
+    """
+    languages = normalize_languages(languages)
+    budget = start_budget(budget)
+    if budget is None:
+        return _detect_text(text, languages, priors, short_text_threshold, engine, normalize,
+                            sequential_threshold)
+
+    original_chars = len(text)
+    text = budget.admit(text)
+    if is_degenerate(text) or budget.exceeded():
+        result = budget.script_only(text, languages)
+        info = {'windows': 0, 'used_chars': 0, 'dropped_chars': original_chars, 'removed': {}}
+    else:
+        result, info = _detect_text(text, languages, priors, short_text_threshold, engine, normalize,
+                                    sequential_threshold, budget)
+        info['dropped_chars'] += original_chars - len(text)
+        if not result and budget.exceeded():
+            result = budget.script_only(text, languages)
+    info.update(budget.info())
+    return result, info
+
+
+def _detect_text(text, languages, priors, short_text_threshold, engine, normalize,
+                 sequential_threshold, budget=None):
+    """detect_details() without the budget checks on the input"""
+    if sequential_threshold and len(text) > sequential_threshold:
+        return detect_sequential(text, languages, priors, engine, normalize, budget=budget)
+
+    clean, stats = normalize_text(text, normalize)
+    result = _detect_block(clean, languages, priors, short_text_threshold, engine)
+    return result, {
+        'windows': 1,
+        'used_chars': len(clean),
+        'dropped_chars': len(text) - len(clean),
+        'removed': stats['removed'] if stats else {},
+    }
+
+
+def detect_langs(text, languages=None, priors=None, short_text_threshold=SHORT_TEXT_THRESHOLD,
+                 engine='langdetect', normalize=True, sequential_threshold=SEQUENTIAL_THRESHOLD,
+                 budget=None):
+    """
+    Detect ranked language probabilities for a text (see detect_details for the options)
+
+    Returns:
+        list: langdetect Language objects (.lang, .prob), best first
+    """
+    return detect_details(text, languages, priors, short_text_threshold, engine, normalize,
+                          sequential_threshold, budget)[0]
+
+
+def detect_batch(texts, languages=None, priors=None, short_text_threshold=SHORT_TEXT_THRESHOLD,
+                 engine='langdetect', normalize=True, sequential_threshold=SEQUENTIAL_THRESHOLD,
+                 budget=None):
+    """
+    Ranked language probabilities for many texts in one call
+
+    The allowlist and engine are resolved once for the whole batch, and a text
+    repeated in the batch (common in record exports) is detected once.
+
+    Returns:
+        list: One detect_langs() result per text; [] where no language features were found
+    """
+    languages = normalize_languages(languages)
+    get_engine(engine)
+    results = {}
+    for text in texts:
+        if text in results:
+            continue
+        try:
+            results[text] = detect_langs(text, languages, priors, short_text_threshold, engine, normalize,
+                                         sequential_threshold, budget)
+        except LangDetectException:
+            results[text] = []
+    return [results[text] for text in texts]
+
+
+def detect(text, languages=None, priors=None, short_text_threshold=SHORT_TEXT_THRESHOLD,
+           engine='langdetect', normalize=True, sequential_threshold=SEQUENTIAL_THRESHOLD,
+           budget=None):
+    """Detect the most likely language code for a text"""
+    result = detect_langs(text, languages, priors, short_text_threshold, engine, normalize,
+                          sequential_threshold, budget)
+    if not result:
+        raise LangDetectException(ErrorCode.CantDetectError, 'No features in text.')
+    return result[0].lang
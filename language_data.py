@@ -0,0 +1,87 @@
+"""
+Language Metadata Table
+Generated by build_language_metadata.py - do not edit by hand
+"""
+
+# code -> (name, ISO 15924 scripts, ((ISO 3166 alpha-2, country name, flag), ...)), primary country first
+LANGUAGES = {
+    'af': ('Afrikaans', ('Latn',), (('ZA', 'South Africa', '🇿🇦'), ('NA', 'Namibia', '🇳🇦'))),
+    'ar': ('Arabic', ('Arab',), (('SA', 'Saudi Arabia', '🇸🇦'), ('EG', 'Egypt', '🇪🇬'), ('AE', 'United Arab Emirates', '🇦🇪'), ('MA', 'Morocco', '🇲🇦'))),
+    'bg': ('Bulgarian', ('Cyrl',), (('BG', 'Bulgaria', '🇧🇬'),)),
+    'bn': ('Bengali', ('Beng',), (('BD', 'Bangladesh', '🇧🇩'), ('IN', 'India', '🇮🇳'))),
+    'ca': ('Catalan', ('Latn',), (('ES', 'Spain', '🇪🇸'), ('AD', 'Andorra', '🇦🇩'))),
+    'cs': ('Czech', ('Latn',), (('CZ', 'Czechia', '🇨🇿'),)),
+    'cy': ('Welsh', ('Latn',), (('GB', 'United Kingdom', '🇬🇧'),)),
+    'da': ('Danish', ('Latn',), (('DK', 'Denmark', '🇩🇰'),)),
+    'de': ('German', ('Latn',), (('DE', 'Germany', '🇩🇪'), ('AT', 'Austria', '🇦🇹'), ('CH', 'Switzerland', '🇨🇭'))),
+    'el': ('Greek', ('Grek',), (('GR', 'Greece', '🇬🇷'), ('CY', 'Cyprus', '🇨🇾'))),
+    'en': ('English', ('Latn',), (('US', 'United States', '🇺🇸'), ('GB', 'United Kingdom', '🇬🇧'), ('CA', 'Canada', '🇨🇦'), ('AU', 'Australia', '🇦🇺'))),
+    'es': ('Spanish', ('Latn',), (('ES', 'Spain', '🇪🇸'), ('MX', 'Mexico', '🇲🇽'), ('AR', 'Argentina', '🇦🇷'), ('CO', 'Colombia', '🇨🇴'))),
+    'et': ('Estonian', ('Latn',), (('EE', 'Estonia', '🇪🇪'),)),
+    'fa': ('Persian', ('Arab',), (('IR', 'Iran, Islamic Republic of', '🇮🇷'), ('AF', 'Afghanistan', '🇦🇫'))),
+    'fi': ('Finnish', ('Latn',), (('FI', 'Finland', '🇫🇮'),)),
+    'fr': ('French', ('Latn',), (('FR', 'France', '🇫🇷'), ('BE', 'Belgium', '🇧🇪'), ('CA', 'Canada', '🇨🇦'), ('CH', 'Switzerland', '🇨🇭'))),
+    'gu': ('Gujarati', ('Gujr',), (('IN', 'India', '🇮🇳'),)),
+    'he': ('Hebrew', ('Hebr',), (('IL', 'Israel', '🇮🇱'),)),
+    'hi': ('Hindi', ('Deva',), (('IN', 'India', '🇮🇳'),)),
+    'hr': ('Croatian', ('Latn',), (('HR', 'Croatia', '🇭🇷'), ('BA', 'Bosnia and Herzegovina', '🇧🇦'))),
+    'hu': ('Hungarian', ('Latn',), (('HU', 'Hungary', '🇭🇺'),)),
+    'id': ('Indonesian', ('Latn',), (('ID', 'Indonesia', '🇮🇩'),)),
+    'it': ('Italian', ('Latn',), (('IT', 'Italy', '🇮🇹'), ('CH', 'Switzerland', '🇨🇭'))),
+    'ja': ('Japanese', ('Hani', 'Hira', 'Kana'), (('JP', 'Japan', '🇯🇵'),)),
+    'kn': ('Kannada', ('Knda',), (('IN', 'India', '🇮🇳'),)),
+    'ko': ('Korean', ('Hang', 'Hani'), (('KR', 'Korea, Republic of', '🇰🇷'), ('KP', "Korea, Democratic People's Republic of", '🇰🇵'))),
+    'lt': ('Lithuanian', ('Latn',), (('LT', 'Lithuania', '🇱🇹'),)),
+    'lv': ('Latvian', ('Latn',), (('LV', 'Latvia', '🇱🇻'),)),
+    'mk': ('Macedonian', ('Cyrl',), (('MK', 'North Macedonia', '🇲🇰'),)),
+    'ml': ('Malayalam', ('Mlym',), (('IN', 'India', '🇮🇳'),)),
+    'mr': ('Marathi', ('Deva',), (('IN', 'India', '🇮🇳'),)),
+    'ne': ('Nepali', ('Deva',), (('NP', 'Nepal', '🇳🇵'),)),
+    'nl': ('Dutch', ('Latn',), (('NL', 'Netherlands', '🇳🇱'), ('BE', 'Belgium', '🇧🇪'))),
+    'no': ('Norwegian', ('Latn',), (('NO', 'Norway', '🇳🇴'),)),
+    'pa': ('Punjabi', ('Guru', 'Arab'), (('IN', 'India', '🇮🇳'), ('PK', 'Pakistan', '🇵🇰'))),
+    'pl': ('Polish', ('Latn',), (('PL', 'Poland', '🇵🇱'),)),
+    'pt': ('Portuguese', ('Latn',), (('PT', 'Portugal', '🇵🇹'), ('BR', 'Brazil', '🇧🇷'))),
+    'ro': ('Romanian', ('Latn',), (('RO', 'Romania', '🇷🇴'), ('MD', 'Moldova, Republic of', '🇲🇩'))),
+    'ru': ('Russian', ('Cyrl',), (('RU', 'Russian Federation', '🇷🇺'), ('BY', 'Belarus', '🇧🇾'), ('KZ', 'Kazakhstan', '🇰🇿'))),
+    'sk': ('Slovak', ('Latn',), (('SK', 'Slovakia', '🇸🇰'),)),
+    'sl': ('Slovenian', ('Latn',), (('SI', 'Slovenia', '🇸🇮'),)),
+    'so': ('Somali', ('Latn',), (('SO', 'Somalia', '🇸🇴'),)),
+    'sq': ('Albanian', ('Latn',), (('AL', 'Albania', '🇦🇱'),)),
+    'sv': ('Swedish', ('Latn',), (('SE', 'Sweden', '🇸🇪'), ('FI', 'Finland', '🇫🇮'))),
+    'sw': ('Swahili', ('Latn',), (('TZ', 'Tanzania, United Republic of', '🇹🇿'), ('KE', 'Kenya', '🇰🇪'))),
+    'ta': ('Tamil', ('Taml',), (('IN', 'India', '🇮🇳'), ('LK', 'Sri Lanka', '🇱🇰'))),
+    'te': ('Telugu', ('Telu',), (('IN', 'India', '🇮🇳'),)),
+    'th': ('Thai', ('Thai',), (('TH', 'Thailand', '🇹🇭'),)),
+    'tl': ('Tagalog', ('Latn',), (('PH', 'Philippines', '🇵🇭'),)),
+    'tr': ('Turkish', ('Latn',), (('TR', 'Türkiye', '🇹🇷'), ('CY', 'Cyprus', '🇨🇾'))),
+    'uk': ('Ukrainian', ('Cyrl',), (('UA', 'Ukraine', '🇺🇦'),)),
+    'ur': ('Urdu', ('Arab',), (('PK', 'Pakistan', '🇵🇰'), ('IN', 'India', '🇮🇳'))),
+    'vi': ('Vietnamese', ('Latn',), (('VN', 'Viet Nam', '🇻🇳'),)),
+    'zh-cn': ('Chinese (Simplified)', ('Hans',), (('CN', 'China', '🇨🇳'), ('SG', 'Singapore', '🇸🇬'))),
+    'zh-tw': ('Chinese (Traditional)', ('Hant',), (('TW', 'Taiwan, Province of China', '🇹🇼'), ('HK', 'Hong Kong', '🇭🇰'))),
+}
+
+# ISO 15924 code -> script name
+SCRIPTS = {
+    'Arab': 'Arabic',
+    'Beng': 'Bengali (Bangla)',
+    'Cyrl': 'Cyrillic',
+    'Deva': 'Devanagari (Nagari)',
+    'Grek': 'Greek',
+    'Gujr': 'Gujarati',
+    'Guru': 'Gurmukhi',
+    'Hang': 'Hangul (Hangŭl, Hangeul)',
+    'Hani': 'Han (Hanzi, Kanji, Hanja)',
+    'Hans': 'Han (Simplified variant)',
+    'Hant': 'Han (Traditional variant)',
+    'Hebr': 'Hebrew',
+    'Hira': 'Hiragana',
+    'Kana': 'Katakana',
+    'Knda': 'Kannada',
+    'Latn': 'Latin',
+    'Mlym': 'Malayalam',
+    'Taml': 'Tamil',
+    'Telu': 'Telugu',
+    'Thai': 'Thai',
+}
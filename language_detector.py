@@ -1,13 +1,16 @@
 """
 Language Detection NLP Project
-Detects the language of input text using the langdetect library
+Detects the language of input text (langdetect by default; see detection_engine for other engines)
 """
 
-from langdetect import detect, detect_langs, LangDetectException
+from langdetect import LangDetectException
 from colorama import init, Fore, Style
 import sys
 import os
 
+from detection_engine import detect, detect_langs
+from language_metadata import language_name
+
 # Set UTF-8 encoding for Windows console
 if os.name == 'nt':
     import codecs
@@ -18,35 +21,37 @@ if os.name == 'nt':
 init(autoreset=True)
 
 
-def detect_language(text):
+def detect_language(text, engine='langdetect'):
     """
     Detect the language of the given text
     
     Args:
         text (str): Input text to analyze
+        engine (str): Detection engine name or model file
         
     Returns:
         str: Detected language code (e.g., 'en', 'es', 'fr')
     """
     try:
-        language = detect(text)
+        language = detect(text, engine=engine)
         return language
     except LangDetectException:
         return None
 
 
-def detect_language_with_probabilities(text):
+def detect_language_with_probabilities(text, engine='langdetect'):
     """
     Detect language with probability scores
     
     Args:
         text (str): Input text to analyze
+        engine (str): Detection engine name or model file
         
     Returns:
         list: List of language probabilities
     """
     try:
-        languages = detect_langs(text)
+        languages = detect_langs(text, engine=engine)
         return languages
     except LangDetectException:
         return None
@@ -62,46 +67,16 @@ def get_language_name(code):
     Returns:
         str: Full language name
     """
-    language_map = {
-        'en': 'English',
-        'es': 'Spanish',
-        'fr': 'French',
-        'de': 'German',
-        'it': 'Italian',
-        'pt': 'Portuguese',
-        'nl': 'Dutch',
-        'ru': 'Russian',
-        'ja': 'Japanese',
-        'zh-cn': 'Chinese (Simplified)',
-        'zh-tw': 'Chinese (Traditional)',
-        'ko': 'Korean',
-        'ar': 'Arabic',
-        'hi': 'Hindi',
-        'tr': 'Turkish',
-        'pl': 'Polish',
-        'sv': 'Swedish',
-        'da': 'Danish',
-        'no': 'Norwegian',
-        'fi': 'Finnish',
-        'cs': 'Czech',
-        'el': 'Greek',
-        'he': 'Hebrew',
-        'th': 'Thai',
-        'vi': 'Vietnamese',
-        'id': 'Indonesian',
-        'ro': 'Romanian',
-        'hu': 'Hungarian',
-        'uk': 'Ukrainian',
-    }
-    return language_map.get(code, code.upper())
-
-
-def analyze_text(text):
+    return language_name(code)
+
+
+def analyze_text(text, engine='langdetect'):
     """
     Analyze text and display language detection results
     
     Args:
         text (str): Input text to analyze
+        engine (str): Detection engine name or model file
     """
     print(f"\n{Fore.CYAN}{'='*60}")
     print(f"{Fore.YELLOW}Text to analyze:{Style.RESET_ALL}")
@@ -109,7 +84,7 @@ def analyze_text(text):
     print(f"{Fore.CYAN}{'='*60}\n")
     
     # Simple detection
-    language = detect_language(text)
+    language = detect_language(text, engine)
     if language:
         lang_name = get_language_name(language)
         print(f"{Fore.GREEN}✓ Detected Language: {Fore.MAGENTA}{lang_name} ({language})")
@@ -119,7 +94,7 @@ def analyze_text(text):
     
     # Detection with probabilities
     print(f"\n{Fore.YELLOW}Probability Distribution:")
-    languages = detect_language_with_probabilities(text)
+    languages = detect_language_with_probabilities(text, engine)
     if languages:
         for lang in languages:
             lang_name = get_language_name(lang.lang)
@@ -131,7 +106,7 @@ def analyze_text(text):
     print(f"{Fore.CYAN}{'='*60}\n")
 
 
-def interactive_mode():
+def interactive_mode(engine='langdetect'):
     """
     Run the language detector in interactive mode
     """
@@ -152,7 +127,7 @@ def interactive_mode():
                 print(f"{Fore.RED}Please enter some text!\n")
                 continue
             
-            analyze_text(user_input)
+            analyze_text(user_input, engine)
             
         except KeyboardInterrupt:
             print(f"\n\n{Fore.YELLOW}Goodbye!")
@@ -161,7 +136,7 @@ def interactive_mode():
             print(f"{Fore.RED}Error: {str(e)}\n")
 
 
-def demo_mode():
+def demo_mode(engine='langdetect'):
     """
     Run demonstration with sample texts in different languages
     """
@@ -183,17 +158,22 @@ def demo_mode():
     ]
     
     for text in sample_texts:
-        analyze_text(text)
+        analyze_text(text, engine)
         input(f"{Fore.YELLOW}Press Enter to continue...{Style.RESET_ALL}")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--demo":
-            demo_mode()
+    args = sys.argv[1:]
+    engine = 'langdetect'
+    # Optional leading "--engine NAME" selects the detection backend
+    if len(args) > 1 and args[0] == "--engine":
+        engine, args = args[1], args[2:]
+    if args:
+        if args[0] == "--demo":
+            demo_mode(engine)
         else:
             # Detect language from command line argument
-            text = " ".join(sys.argv[1:])
-            analyze_text(text)
+            text = " ".join(args)
+            analyze_text(text, engine)
     else:
-        interactive_mode()
+        interactive_mode(engine)
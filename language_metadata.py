@@ -0,0 +1,47 @@
+"""
+Language Metadata
+Immutable code -> name, scripts, countries and flag lookups (no pycountry at runtime)
+"""
+
+from collections import namedtuple
+from types import MappingProxyType
+
+from language_data import LANGUAGES as _LANGUAGES, SCRIPTS
+
+Country = namedtuple('Country', ['code', 'name', 'flag'])
+LanguageInfo = namedtuple('LanguageInfo', ['code', 'name', 'scripts', 'countries', 'flag'])
+
+# Built once at import from the generated table (see build_language_metadata.py)
+LANGUAGES = MappingProxyType({
+    code: LanguageInfo(code, name, scripts, tuple(Country(*country) for country in countries),
+                       countries[0][2] if countries else '')
+    for code, (name, scripts, countries) in _LANGUAGES.items()
+})
+LANGUAGE_NAMES = MappingProxyType({code: info.name for code, info in LANGUAGES.items()})
+SCRIPTS = MappingProxyType(SCRIPTS)
+
+
+def language_info(code):
+    """LanguageInfo for a code, or None for unknown codes"""
+    return LANGUAGES.get(code)
+
+
+def language_name(code):
+    """Full language name for a code ('Unknown' for none, the upper-cased code if not in the table)"""
+    if not code:
+        return 'Unknown'
+    return LANGUAGE_NAMES.get(code, code.upper())
+
+
+def country_info(code):
+    """
+    Primary country of a language
+
+    Returns:
+        dict: 'name', 'code' (ISO 3166 alpha-2) and 'flag', or None
+    """
+    info = LANGUAGES.get(code)
+    if info is None or not info.countries:
+        return None
+    country = info.countries[0]
+    return {'name': country.name, 'code': country.code, 'flag': country.flag}
@@ -0,0 +1,265 @@
+"""
+Large File Analyzer
+Split one huge text file on paragraph/line boundaries and analyze the chunks in parallel
+"""
+
+import os
+import re
+from collections import Counter
+from itertools import repeat
+
+from langdetect import LangDetectException
+
+from analysis_result import AnalysisResult
+from budget import STATUSES
+from detection_engine import detect_details
+from language_metadata import language_name
+from sketches import WORD_RE, CountMinTopK, DistinctCounter
+from text_stats import script_histogram
+
+# Files at least this large are analyzed chunk by chunk (batch_processor --large-file-mb)
+LARGE_FILE_BYTES = 256 * 1024 * 1024
+CHUNK_BYTES = 16 * 1024 * 1024
+# How far back from a cut point to look for a paragraph, line or word break
+BOUNDARY_SEARCH = 64 * 1024
+
+SENTENCE_END_RE = re.compile(r'[.!?]+')
+
+
+def chunk_ranges(file_path, chunk_bytes=CHUNK_BYTES):
+    """
+    Byte ranges (start, end) covering a file, about chunk_bytes each
+
+    Each cut is moved back to the nearest paragraph break, else line break,
+    else space within BOUNDARY_SEARCH bytes, so words and sentences are not
+    split. Without any break it falls back to a UTF-8 character boundary.
+    """
+    size = os.path.getsize(file_path)
+    ranges, start = [], 0
+    with open(file_path, 'rb') as f:
+        while start < size:
+            end = min(start + chunk_bytes, size)
+            if end < size:
+                low = max(start + 1, end - BOUNDARY_SEARCH)
+                f.seek(low)
+                window = f.read(end - low + 1)
+                for separator in (b'\n\n', b'\n', b' '):
+                    cut = window.rfind(separator, 0, end - low)
+                    if cut >= 0:
+                        end = low + cut + len(separator)
+                        break
+                else:
+                    # Never start the next chunk on a UTF-8 continuation byte
+                    pos = end - low
+                    while pos > 1 and window[pos] & 0xC0 == 0x80:
+                        pos -= 1
+                    end = low + pos
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _decode(data):
+    """Decode a chunk like read_text_file() decodes a file"""
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return data.decode('latin-1')
+
+
+def analyze_chunk(file_path, start, end, options, top_k=None):
+    """
+    Statistics and language detection for one byte range of a file
+
+    Character classes and scripts are derived from one Counter of the chunk's
+    characters rather than per-character Python loops.
+
+    Returns:
+        dict: Mergeable partial counts (see merge_chunks)
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        text = _decode(f.read(end - start))
+
+    char_counts = Counter(text)
+    words = text.split()
+    distinct = DistinctCounter()
+    distinct.update(set(words))
+
+    try:
+        probabilities, info = detect_details(text, **options)
+    except LangDetectException:
+        probabilities, info = [], {'windows': 0, 'dropped_chars': len(text)}
+
+    scripts, letters = Counter(), Counter()
+    alphabetic = numeric = special = whitespace = 0
+    for char, count in char_counts.items():
+        for script in script_histogram(char):
+            scripts[script] += count
+        if char.isalpha():
+            alphabetic += count
+            letters[char.lower()] += count
+        elif char.isdigit():
+            numeric += count
+        if char.isspace():
+            whitespace += count
+        elif not char.isalnum():
+            special += count
+
+    partial = {
+        'start': start,
+        'end': end,
+        'chars': len(text),
+        'spaces': char_counts[' '],
+        'whitespace': whitespace,
+        'newlines': char_counts['\n'],
+        'words': len(words),
+        'sentence_breaks': len(SENTENCE_END_RE.findall(text)),
+        'alphabetic': alphabetic,
+        'numeric': numeric,
+        'special': special,
+        'letters': letters,
+        'scripts': scripts,
+        'distinct_words': distinct,
+        'probabilities': [(p.lang, p.prob) for p in probabilities],
+        'dropped_chars': info['dropped_chars'],
+        'windows': info['windows'],
+        'status': info.get('status', 'ok'),
+        'word_sketch': None,
+        'char_sketch': None,
+    }
+    if top_k:
+        partial['word_sketch'] = CountMinTopK(top_k)
+        partial['word_sketch'].update(Counter(WORD_RE.findall(text.lower())))
+        partial['char_sketch'] = CountMinTopK(top_k)
+        partial['char_sketch'].update(letters)
+    return partial
+
+
+def merge_chunks(partials):
+    """
+    Combine chunk partials into one file-level result
+
+    The file's language distribution is the chunks' probabilities weighted by
+    chunk length; the status is the most severe chunk status.
+
+    Returns:
+        tuple: (AnalysisResult, per-chunk breakdown list)
+    """
+    total = Counter()
+    letters, scripts = Counter(), Counter()
+    distinct = DistinctCounter()
+    weights = Counter()
+    breakdown = []
+    status = 'ok'
+    for partial in partials:
+        for key in ('chars', 'spaces', 'whitespace', 'newlines', 'words', 'sentence_breaks',
+                    'alphabetic', 'numeric', 'special', 'dropped_chars', 'windows'):
+            total[key] += partial[key]
+        letters.update(partial['letters'])
+        scripts.update(partial['scripts'])
+        distinct.merge(partial['distinct_words'])
+        for lang, prob in partial['probabilities']:
+            weights[lang] += prob * partial['chars']
+        if STATUSES.index(partial['status']) > STATUSES.index(status):
+            status = partial['status']
+        top = partial['probabilities'][0] if partial['probabilities'] else (None, 0.0)
+        breakdown.append({'start': partial['start'], 'end': partial['end'], 'chars': partial['chars'],
+                          'language': top[0], 'confidence': round(top[1], 4)})
+
+    weight_sum = sum(weights.values())
+    probabilities = sorted(((lang, weight / weight_sum) for lang, weight in weights.items()
+                            if weight / weight_sum > 0.1), key=lambda p: -p[1]) if weight_sum else []
+    language = probabilities[0][0] if probabilities else None
+    non_whitespace = total['chars'] - total['whitespace']
+    stats = {
+        'total_chars': total['chars'],
+        'total_chars_no_spaces': total['chars'] - total['spaces'],
+        'total_words': total['words'],
+        'total_sentences': total['sentence_breaks'] + 1,
+        'total_lines': total['newlines'] + 1,
+        'avg_word_length': non_whitespace / total['words'] if total['words'] else 0,
+        'unique_words': distinct.estimate(),
+        'alphabetic_chars': total['alphabetic'],
+        'numeric_chars': total['numeric'],
+        'special_chars': total['special'],
+        'dropped_chars': total['dropped_chars'],
+        'detection_windows': total['windows'],
+        'budget_status': status,
+        'chunks': len(breakdown),
+    }
+    result = AnalysisResult(
+        language=language,
+        language_name=language_name(language),
+        probabilities=probabilities,
+        stats=stats,
+        scripts=dict(scripts),
+        top_chars=letters.most_common(10),
+    )
+    return result, breakdown
+
+
+def analyze_large_file(file_path, options, executor=None, chunk_bytes=CHUNK_BYTES, sketches=None,
+                       include_chunks=False):
+    """
+    Analyze one huge file chunk by chunk, in parallel when an executor is given
+
+    Only one chunk per worker is held in memory at a time, so the file never
+    has to fit in memory as a single string.
+
+    Args:
+        options (dict): detect_details() keyword arguments (languages, priors, engine, ...)
+        executor: Optional concurrent.futures executor the chunks are mapped over
+        sketches (CorpusSketches): If given, the file's words and characters are
+            counted once under its detected language
+        include_chunks (bool): Add the per-chunk language breakdown to the result
+
+    Returns:
+        dict: Same shape as batch_processor.analyze_file()
+    """
+    ranges = chunk_ranges(file_path, chunk_bytes)
+    top_k = sketches.k if sketches is not None else None
+    mapper = executor.map if executor is not None else map
+    partials = list(mapper(analyze_chunk, repeat(str(file_path)), [start for start, _ in ranges],
+                           [end for _, end in ranges], repeat(options), repeat(top_k)))
+    return large_file_outcome(file_path, partials, sketches, include_chunks)
+
+
+def large_file_outcome(file_path, partials, sketches=None, include_chunks=False):
+    """
+    analyze_file()-shaped outcome from all chunk partials of one file (in file order)
+
+    Lets a scheduler run the chunks as independent tasks and merge them once
+    the last one has finished.
+    """
+    analysis, breakdown = merge_chunks(partials)
+    budget_status = analysis.stats['budget_status']
+    if not analysis.language:
+        return {'status': 'error', 'message': 'Could not detect language', 'budget_status': budget_status}
+
+    if sketches is not None:
+        words, chars = CountMinTopK(sketches.k), CountMinTopK(sketches.k)
+        for partial in partials:
+            words.merge(partial['word_sketch'])
+            chars.merge(partial['char_sketch'])
+        sketches.add_sketches(analysis.language, words, chars)
+
+    stats = analysis.stats
+    row = {
+        'file': os.path.basename(file_path),
+        'path': str(file_path),
+        'language': analysis.language_name,
+        'code': analysis.language,
+        'confidence': round(analysis.confidence, 4),
+        'size_bytes': os.path.getsize(file_path),
+        'chars': stats['total_chars'],
+        'words': stats['total_words'],
+        'sentences': stats['total_sentences'],
+        'dropped_chars': stats['dropped_chars'],
+        'status': budget_status
+    }
+    result = analysis.to_dict()
+    if include_chunks:
+        result['chunks'] = breakdown
+    return {'status': 'ok', 'message': None, 'budget_status': budget_status, 'row': row,
+            'result': result, 'chunks': breakdown}
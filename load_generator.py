@@ -0,0 +1,252 @@
+"""
+Load Generator
+Replays a corpus against a detection endpoint and reports throughput and latency percentiles
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection, HTTPException
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from colorama import init, Fore
+
+# Set UTF-8 encoding for Windows
+if os.name == 'nt':
+    import codecs
+    if hasattr(sys.stdout, 'buffer'):
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+init(autoreset=True)
+
+from record_processor import extract_field
+
+PERCENTILES = (50, 95, 99, 99.9)
+TEXT_EXTENSIONS = ('.txt', '.md', '.log', '.csv', '.json')
+# A sweep step must add at least this much throughput to count as unsaturated
+SATURATION_GAIN = 1.05
+
+
+def load_corpus(path, text_field='text'):
+    """
+    Request texts from a directory of text files or a JSON Lines file
+
+    Returns:
+        list: Request bodies (UTF-8 encoded JSON)
+    """
+    path = Path(path)
+    texts = []
+    if path.is_dir():
+        for file_path in sorted(path.rglob('*')):
+            if file_path.suffix.lower() in TEXT_EXTENSIONS:
+                texts.append(file_path.read_text(encoding='utf-8', errors='replace'))
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    text = extract_field(json.loads(line), text_field)
+                    if text:
+                        texts.append(text)
+    if not texts:
+        raise ValueError(f"No texts found in {path}")
+    return [json.dumps({'text': text}, ensure_ascii=False).encode('utf-8') for text in texts]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[min(int(rank), len(sorted_values)) - 1]
+
+
+class LoadGenerator:
+    """
+    Sends corpus texts to an HTTP endpoint from a pool of keep-alive connections
+
+    Closed loop (rate=None): `concurrency` clients each send the next request
+    as soon as the previous one returns. Open loop (rate=R): requests are
+    scheduled every 1/R seconds regardless of responses, and latency is
+    measured from the scheduled time, so queueing delay is not hidden when
+    the server falls behind (no coordinated omission).
+    """
+
+    def __init__(self, url, bodies, concurrency=8, rate=None, timeout=30.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.path = parts.path or '/detect'
+        self.bodies = bodies
+        self.concurrency = concurrency
+        self.rate = rate
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def request(self, body):
+        """Send one request; returns True on a 2xx response"""
+        conn = self._connection()
+        try:
+            conn.request('POST', self.path, body, {'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            return 200 <= response.status < 300
+        except (OSError, HTTPException):
+            conn.close()
+            self._local.conn = None
+            return False
+
+    def run(self, duration=10.0):
+        """
+        Generate load for `duration` seconds
+
+        Returns:
+            dict: requests, errors, error_rate, throughput (successful req/s),
+            duration and latency percentiles in milliseconds
+        """
+        latencies, errors = [], 0
+        lock = threading.Lock()
+
+        def record(start, ok):
+            nonlocal errors
+            latency = time.perf_counter() - start
+            with lock:
+                latencies.append(latency)
+                errors += not ok
+
+        started = time.perf_counter()
+        deadline = started + duration
+        if self.rate:
+            with ThreadPoolExecutor(self.concurrency) as executor:
+                interval = 1.0 / self.rate
+                i = 0
+                while True:
+                    scheduled = started + i * interval
+                    if scheduled >= deadline:
+                        break
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    body = self.bodies[i % len(self.bodies)]
+                    executor.submit(lambda s=scheduled, b=body: record(s, self.request(b)))
+                    i += 1
+        else:
+            counter = iter(range(sys.maxsize))
+
+            def client():
+                while time.perf_counter() < deadline:
+                    body = self.bodies[next(counter) % len(self.bodies)]
+                    start = time.perf_counter()
+                    record(start, self.request(body))
+
+            threads = [threading.Thread(target=client, daemon=True) for _ in range(self.concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        elapsed = time.perf_counter() - started
+        latencies.sort()
+        requests = len(latencies)
+        return {
+            'concurrency': self.concurrency,
+            'rate': self.rate,
+            'requests': requests,
+            'errors': errors,
+            'error_rate': errors / requests if requests else 0.0,
+            'throughput': (requests - errors) / elapsed,
+            'duration': elapsed,
+            'latency_ms': {f"p{p:g}": round(percentile(latencies, p) * 1000, 2) if latencies else None
+                           for p in PERCENTILES},
+        }
+
+
+def sweep(url, bodies, levels, duration=10.0, timeout=30.0):
+    """
+    Closed-loop runs at increasing concurrency
+
+    Returns:
+        tuple: (list of run results, saturation concurrency) where saturation
+        is the first level after which adding clients no longer raised
+        throughput by SATURATION_GAIN (None if never reached)
+    """
+    results, saturation = [], None
+    for level in levels:
+        result = LoadGenerator(url, bodies, level, timeout=timeout).run(duration)
+        if saturation is None and results and result['throughput'] < results[-1]['throughput'] * SATURATION_GAIN:
+            saturation = results[-1]['concurrency']
+        results.append(result)
+    return results, saturation
+
+
+def print_result(result):
+    """Print one run as a table row"""
+    latency = result['latency_ms']
+    mode = f"rate {result['rate']:g}/s" if result['rate'] else f"conc {result['concurrency']}"
+    error_color = Fore.RED if result['errors'] else Fore.GREEN
+    print(f"{Fore.CYAN}{mode:>14} {Fore.WHITE}{result['requests']:>8,} req "
+          f"{Fore.GREEN}{result['throughput']:>9,.1f} req/s "
+          f"{error_color}{100 * result['error_rate']:>6.2f}% err  "
+          f"{Fore.WHITE}p50 {latency['p50']:>8} ms  p95 {latency['p95']:>8} ms  "
+          f"p99 {latency['p99']:>8} ms  p99.9 {latency['p99.9']:>8} ms")
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Load-test a detection endpoint (see detection_server.py) with a replayed corpus",
+        epilog="Example: python load_generator.py http://127.0.0.1:8080/detect --corpus sample_texts "
+               "--sweep 1,2,4,8,16"
+    )
+    parser.add_argument('url', help="Endpoint, e.g. http://127.0.0.1:8080/detect")
+    parser.add_argument('--corpus', default='sample_texts', help="Directory of text files or a JSONL file")
+    parser.add_argument('--text-field', default='text', help="Text field (dotted path) in JSONL records")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds per run")
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help="Clients (closed loop), or the connection pool size with --rate")
+    parser.add_argument('--rate', type=float, help="Open-loop target requests per second")
+    parser.add_argument('--sweep', help="Comma-separated concurrency levels, e.g. 1,2,4,8,16")
+    parser.add_argument('--timeout', type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    try:
+        bodies = load_corpus(args.corpus, args.text_field)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    if args.sweep:
+        levels = [int(level) for level in args.sweep.split(',')]
+        results, saturation = sweep(args.url, bodies, levels, args.duration, args.timeout)
+    else:
+        results = [LoadGenerator(args.url, bodies, args.concurrency, args.rate, args.timeout).run(args.duration)]
+        saturation = None
+
+    if args.json:
+        print(json.dumps({'results': results, 'saturation_concurrency': saturation}, indent=2))
+        return
+    print(f"{Fore.CYAN}Replaying {Fore.WHITE}{len(bodies)} {Fore.CYAN}texts against {Fore.WHITE}{args.url}\n")
+    for result in results:
+        print_result(result)
+    if args.sweep:
+        if saturation:
+            print(f"\n{Fore.YELLOW}Throughput saturates at about {Fore.WHITE}{saturation} "
+                  f"{Fore.YELLOW}concurrent clients")
+        else:
+            print(f"\n{Fore.YELLOW}No saturation within the tested levels")
+
+
+if __name__ == "__main__":
+    main()
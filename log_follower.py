@@ -0,0 +1,295 @@
+"""
+Log Follower for Continuous Language Monitoring
+Tail appended log files, detect languages on new lines and keep rolling counts
+"""
+
+import json
+import os
+import sys
+import time
+from collections import Counter, deque
+from datetime import datetime
+from pathlib import Path
+from langdetect import LangDetectException
+from detection_engine import detect_langs, parse_engine, parse_languages, parse_priors
+from colorama import init, Fore, Style
+
+# Set UTF-8 encoding for Windows
+if os.name == 'nt':
+    import codecs
+    if hasattr(sys.stdout, 'buffer'):
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+init(autoreset=True)
+
+# Bytes read per call; a line longer than this is cut at the block boundary
+READ_BLOCK = 1024 * 1024
+
+
+class RollingLanguageCounts:
+    """Per-language counts over a sliding time window, kept in fixed-size buckets"""
+
+    def __init__(self, window_seconds=300, bucket_seconds=10):
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.buckets = deque()
+        self.totals = Counter()
+
+    def add(self, lang, count=1, now=None):
+        """Record `count` lines of language `lang`"""
+        now = time.time() if now is None else now
+        start = now - (now % self.bucket_seconds)
+        if not self.buckets or self.buckets[-1][0] != start:
+            self.buckets.append((start, Counter()))
+        self.buckets[-1][1][lang] += count
+        self.totals[lang] += count
+        self.expire(now)
+
+    def expire(self, now=None):
+        """Drop buckets that have left the window"""
+        now = time.time() if now is None else now
+        while self.buckets and self.buckets[0][0] + self.bucket_seconds <= now - self.window_seconds:
+            _, counts = self.buckets.popleft()
+            self.totals.subtract(counts)
+        self.totals = +self.totals
+
+    def snapshot(self):
+        """Current per-language counts, most common first"""
+        self.expire()
+        return dict(self.totals.most_common())
+
+
+class LogFollower:
+    """Follow growing log files, detecting languages only on newly appended lines"""
+
+    def __init__(self, paths, state_file='.log_follower_state.json', pattern='*.log',
+                 group='line', min_length=10, window_seconds=300, bucket_seconds=10,
+                 languages=None, priors=None, engine='langdetect', start_at_end=False):
+        self.paths = [Path(p) for p in paths]
+        self.languages = languages
+        self.priors = priors
+        self.engine = engine
+        self.state_file = Path(state_file)
+        self.pattern = pattern
+        self.group = group
+        self.min_length = min_length
+        self.counts = RollingLanguageCounts(window_seconds, bucket_seconds)
+        self.lines_seen = 0
+        self.handles = {}
+        self.state = self._load_state()
+        # Files found by the first poll without a usable saved offset start at their end
+        self.start_at_end = start_at_end
+        self.first_poll = True
+
+    def _load_state(self):
+        """Load persisted offsets from a previous run"""
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {}
+
+    def save_state(self):
+        """Persist offsets atomically so a restart continues where it left off"""
+        tmp_file = self.state_file.with_name(self.state_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_file, self.state_file)
+
+    def discover_files(self):
+        """List the files to follow, expanding directories with the glob pattern"""
+        files = []
+        for path in self.paths:
+            if path.is_dir():
+                files.extend(sorted(path.rglob(self.pattern)))
+            elif path.exists():
+                files.append(path)
+        return files
+
+    def _open(self, file_path, st):
+        """Open a file and seek to its persisted offset if it is the same file"""
+        key = str(file_path)
+        saved = self.state.get(key)
+        handle = open(file_path, 'rb')
+        offset = 0
+        if saved and saved.get('inode') == st.st_ino and saved.get('offset', 0) <= st.st_size:
+            offset = saved['offset']
+        elif self.start_at_end and self.first_poll:
+            offset = st.st_size
+        handle.seek(offset)
+        self.handles[key] = handle
+        self.state[key] = {'inode': st.st_ino, 'offset': offset}
+        return handle
+
+    def _read_new_lines(self, key, handle):
+        """
+        Read complete new lines from the current offset, one READ_BLOCK at a time
+
+        A partial tail is left unread for the next poll. A block without any
+        newline is taken as one line, so a writer that never ends its line
+        cannot make every poll re-read an ever-growing tail.
+
+        Yields:
+            list: Decoded lines of one block
+        """
+        while True:
+            offset = self.state[key]['offset']
+            handle.seek(offset)
+            data = handle.read(READ_BLOCK)
+            end = data.rfind(b'\n')
+            if end < 0:
+                if len(data) < READ_BLOCK:
+                    return
+                end = len(data)
+            self.state[key]['offset'] = offset + min(end + 1, len(data))
+            yield data[:end].decode('utf-8', errors='replace').splitlines()
+
+    def _drain(self, key, handle):
+        """Detect every complete line appended since the last read; returns the number of lines"""
+        return sum(self._handle_lines(lines) for lines in self._read_new_lines(key, handle))
+
+    def poll(self):
+        """Process everything appended since the last poll; returns the number of new lines"""
+        new_lines = 0
+        files = self.discover_files()
+        for file_path in files:
+            key = str(file_path)
+            try:
+                st = file_path.stat()
+            except OSError:
+                continue
+
+            handle = self.handles.get(key)
+            if handle is None:
+                handle = self._open(file_path, st)
+            elif os.fstat(handle.fileno()).st_ino != st.st_ino:
+                # Rotated: drain what was appended to the old file, then switch
+                new_lines += self._drain(key, handle)
+                handle.close()
+                self.state[key] = {'inode': st.st_ino, 'offset': 0}
+                handle = self._open(file_path, st)
+            elif st.st_size < self.state[key]['offset']:
+                # Truncated in place (copytruncate)
+                self.state[key]['offset'] = 0
+
+            new_lines += self._drain(key, handle)
+
+        # Files that disappeared (rotated away without replacement): drain and release
+        for key in set(self.handles) - {str(p) for p in files}:
+            handle = self.handles.pop(key)
+            new_lines += self._drain(key, handle)
+            handle.close()
+
+        self.first_poll = False
+        if new_lines:
+            self.save_state()
+        return new_lines
+
+    def _handle_lines(self, lines):
+        """Detect languages for new lines, per line or for the whole batch"""
+        lines = [line for line in lines if len(line.strip()) >= self.min_length]
+        if not lines:
+            return 0
+        self.lines_seen += len(lines)
+
+        if self.group == 'batch':
+            lang = self._detect('\n'.join(lines))
+            self.counts.add(lang, len(lines))
+        else:
+            for line in lines:
+                self.counts.add(self._detect(line))
+        return len(lines)
+
+    def _detect(self, text):
+        """Detect the language of a text, 'unknown' on failure"""
+        try:
+            return detect_langs(text, self.languages, self.priors, engine=self.engine)[0].lang
+        except (LangDetectException, IndexError):
+            return 'unknown'
+
+    def close(self):
+        """Close open file handles and persist offsets"""
+        for handle in self.handles.values():
+            handle.close()
+        self.handles = {}
+        self.save_state()
+
+    def follow(self, poll_interval=1.0, report_interval=10.0, as_json=False):
+        """Poll forever, emitting rolling per-language counts every report_interval seconds"""
+        last_report = 0.0
+        try:
+            while True:
+                self.poll()
+                now = time.time()
+                if now - last_report >= report_interval:
+                    self.report(as_json)
+                    last_report = now
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def report(self, as_json=False):
+        """Print the current rolling language counts"""
+        counts = self.counts.snapshot()
+        if as_json:
+            print(json.dumps({'time': datetime.now().isoformat(timespec='seconds'),
+                              'window_seconds': self.counts.window_seconds,
+                              'lines_total': self.lines_seen,
+                              'counts': counts}), flush=True)
+            return
+
+        total = sum(counts.values())
+        print(f"{Fore.CYAN}[{datetime.now().strftime('%H:%M:%S')}] "
+              f"{Fore.WHITE}last {self.counts.window_seconds}s: {Fore.GREEN}{total:,} lines "
+              f"{Fore.WHITE}(total {self.lines_seen:,})")
+        for lang, count in list(counts.items())[:10]:
+            percentage = (count / total) * 100 if total else 0
+            print(f"{Fore.WHITE}  {lang:8} {Fore.GREEN}{count:,} ({percentage:.1f}%)")
+
+
+def main(argv=None):
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Follow log files and monitor their language mix")
+    parser.add_argument('paths', nargs='+', help="Log files or directories to follow")
+    parser.add_argument('--pattern', default='*.log', help="Glob used inside directories")
+    parser.add_argument('--state-file', default='.log_follower_state.json',
+                        help="Where read offsets are persisted between runs")
+    parser.add_argument('--group', choices=['line', 'batch'], default='line',
+                        help="Detect per line, or once per batch of newly appended lines")
+    parser.add_argument('--window', type=int, default=300, help="Rolling window in seconds")
+    parser.add_argument('--poll-interval', type=float, default=1.0)
+    parser.add_argument('--report-interval', type=float, default=10.0)
+    parser.add_argument('--json', action='store_true', help="Emit counts as JSON lines")
+    parser.add_argument('--languages', help="Comma-separated allowlist of language codes, e.g. en,fr,de")
+    parser.add_argument('--priors', help="Comma-separated prior weights, e.g. en=0.7,fr=0.3")
+    parser.add_argument('--engine', default='langdetect', help="Detection engine name, .npz model file or profile directory")
+    parser.add_argument('--from-end', action='store_true',
+                        help="Skip existing content of files that have no saved offset yet (first start)")
+    args = parser.parse_args(argv)
+
+    try:
+        languages = parse_languages(args.languages)
+        priors = parse_priors(args.priors)
+        engine = parse_engine(args.engine)
+    except ValueError as e:
+        parser.error(str(e))
+
+    follower = LogFollower(args.paths, state_file=args.state_file, pattern=args.pattern,
+                           group=args.group, window_seconds=args.window,
+                           languages=languages, priors=priors, engine=engine,
+                           start_at_end=args.from_end)
+    if not args.json:
+        print(f"{Fore.CYAN}Following: {Fore.WHITE}{', '.join(str(p) for p in follower.paths)}"
+              f"{Style.RESET_ALL}\n")
+    follower.follow(args.poll_interval, args.report_interval, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+pandas Language Accessor
+Bulk detection for DataFrame text columns: df['text'].langdetect.detect()
+"""
+
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from detection_engine import normalize_languages
+from record_processor import RecordProcessor
+from shared_model import SharedModels, init_worker
+
+# Distinct texts per detection task
+CHUNK_SIZE = 2000
+
+
+def _detect_chunk(texts, options):
+    """(code, confidence) per text; module-level so process pools can pickle it"""
+    return RecordProcessor(**options).detect_chunk(texts)
+
+
+def _is_arrow_string(series):
+    """True for string columns whose values live in Arrow buffers"""
+    dtype = series.dtype
+    if isinstance(dtype, pd.StringDtype):
+        return dtype.storage == 'pyarrow'
+    if isinstance(dtype, pd.ArrowDtype):
+        import pyarrow as pa
+        return pa.types.is_string(dtype.pyarrow_dtype) or pa.types.is_large_string(dtype.pyarrow_dtype)
+    return False
+
+
+def unique_texts(series):
+    """
+    Distinct texts of a Series and each row's position among them
+
+    Arrow-backed string columns are deduplicated by pyarrow.compute on the
+    Arrow buffers, so only the distinct values become Python strings. Other
+    columns go through pd.factorize; non-string values count as missing.
+
+    Returns:
+        tuple: (int64 array of positions, -1 for missing rows; list of distinct texts)
+    """
+    if _is_arrow_string(series):
+        import pyarrow.compute as pc
+
+        values = series.array.__arrow_array__()
+        uniques = pc.drop_null(pc.unique(values))
+        positions = pc.fill_null(pc.index_in(values, value_set=uniques), -1)
+        return positions.to_numpy().astype(np.int64, copy=False), uniques.to_pylist()
+
+    positions, uniques = pd.factorize(series, use_na_sentinel=True)
+    texts = [value if isinstance(value, str) else None for value in uniques]
+    return positions.astype(np.int64, copy=False), texts
+
+
+def detect_texts(texts, languages=None, priors=None, engine='langdetect', normalize=True, min_length=3,
+                 chunk_size=CHUNK_SIZE, executor=None, max_workers=None):
+    """
+    (code, confidence) for a list of texts, detected chunk by chunk
+
+    Args:
+        executor: None (this process), 'process' (a spawn pool of max_workers;
+            with engine='compact' the workers share one copy of the models) or
+            an existing concurrent.futures.Executor
+    """
+    options = {'languages': languages, 'priors': priors, 'engine': engine, 'normalize': normalize,
+               'min_length': min_length}
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    if executor is None or len(chunks) <= 1:
+        return [result for chunk in chunks for result in _detect_chunk(chunk, options)]
+
+    if isinstance(executor, Executor):
+        return [result for part in executor.map(_detect_chunk, chunks, repeat(options)) for result in part]
+    if executor != 'process':
+        raise ValueError("executor must be None, 'process' or a concurrent.futures.Executor")
+
+    shared_models = SharedModels(languages) if engine == 'compact' else None
+    initializer, initargs = (init_worker, (shared_models.descriptor(),)) if shared_models else (None, ())
+    try:
+        with ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=initializer, initargs=initargs) as pool:
+            return [result for part in pool.map(_detect_chunk, chunks, repeat(options)) for result in part]
+    finally:
+        if shared_models:
+            shared_models.close()
+
+
+def detect_series(series, **options):
+    """
+    Detect the language of every text in a Series
+
+    Each distinct text is detected once (see unique_texts), then the
+    results are broadcast back to the rows with numpy indexing.
+
+    Args:
+        options: detect_texts() keyword arguments
+
+    Returns:
+        pandas.DataFrame: 'language' (categorical codes, NaN when missing or
+        undetected) and 'confidence' (float32, NaN likewise), on the Series' index
+    """
+    languages = normalize_languages(options.pop('languages', None))
+    positions, texts = unique_texts(series)
+    valid = [i for i, text in enumerate(texts) if text]
+    results = detect_texts([texts[i] for i in valid], languages, **options)
+
+    categories = sorted({code for code, _ in results if code})
+    category_ids = {code: i for i, code in enumerate(categories)}
+    # One extra slot at the end, so rows at position -1 pick up the "missing" values
+    unique_codes = np.full(len(texts) + 1, -1, dtype=np.int32)
+    unique_confidence = np.full(len(texts) + 1, np.nan, dtype=np.float32)
+    for i, (code, confidence) in zip(valid, results):
+        if code:
+            unique_codes[i] = category_ids[code]
+            unique_confidence[i] = confidence
+
+    return pd.DataFrame({
+        'language': pd.Categorical.from_codes(unique_codes[positions], categories=categories),
+        'confidence': unique_confidence[positions],
+    }, index=series.index)
+
+
+@pd.api.extensions.register_series_accessor('langdetect')
+class LanguageAccessor:
+    """
+    series.langdetect: bulk language detection for a text column
+
+    Importing this module registers the accessor:
+
+        import pandas_accessor
+        df[['language', 'confidence']] = df['text'].langdetect.detect(executor='process')
+    """
+
+    def __init__(self, series):
+        self._series = series
+
+    def detect(self, languages=None, priors=None, engine='langdetect', normalize=True, min_length=3,
+               chunk_size=CHUNK_SIZE, executor=None, max_workers=None):
+        """
+        Language code and confidence per row (see detect_series)
+
+        Args:
+            languages, priors, engine, normalize: Detection options (see detection_engine)
+            min_length: Texts shorter than this (stripped) are left undetected
+            chunk_size: Distinct texts per detection task
+            executor: None, 'process' or a concurrent.futures.Executor
+            max_workers: Pool size for executor='process'
+
+        Returns:
+            pandas.DataFrame: categorical 'language' and float32 'confidence'
+        """
+        return detect_series(self._series, languages=languages, priors=priors, engine=engine,
+                             normalize=normalize, min_length=min_length, chunk_size=chunk_size,
+                             executor=executor, max_workers=max_workers)
+
+    def code(self, **options):
+        """Categorical language codes only (see detect)"""
+        return self.detect(**options)['language']
@@ -0,0 +1,151 @@
+"""
+Progress Reporter
+Rate-limited throughput, ETA and language-mix reporting for long batch runs
+"""
+
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+from colorama import Fore
+
+# Seconds between progress lines and between status-file writes
+PRINT_INTERVAL = 2.0
+STATUS_INTERVAL = 10.0
+
+
+class ProgressReporter:
+    """
+    Aggregates per-file outcomes and reports them at most every `interval` seconds
+
+    update() only bumps counters and compares one monotonic clock reading, so
+    it is cheap enough to call for every file of a multi-million-file run.
+    On a terminal the progress line is redrawn in place; otherwise (logs,
+    pipes) one line is printed per interval.
+
+    Args:
+        total_files: Files expected in this run
+        total_bytes: Their combined size (for MB/sec and a size-based ETA)
+        interval: Seconds between progress lines
+        quiet: Print nothing (the status file is still written)
+        status_path: Optional JSON file rewritten every status_interval seconds
+        status_interval: Seconds between status-file writes
+        stream: Output stream (default sys.stdout)
+    """
+
+    def __init__(self, total_files=0, total_bytes=0, interval=PRINT_INTERVAL, quiet=False,
+                 status_path=None, status_interval=STATUS_INTERVAL, stream=None):
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.interval = interval
+        self.quiet = quiet
+        self.status_path = status_path
+        self.status_interval = status_interval
+        self.stream = stream or sys.stdout
+        self.inline = hasattr(self.stream, 'isatty') and self.stream.isatty()
+        self.files = 0
+        self.bytes = 0
+        self.outcomes = Counter()
+        self.languages = Counter()
+        self.started = time.monotonic()
+        self.next_print = self.started + interval
+        self.next_status = self.started + status_interval
+        self.state = 'running'
+
+    def update(self, size=0, status='ok', language=None):
+        """
+        Record one processed file
+
+        Args:
+            size: File size in bytes
+            status: 'ok', 'skipped' or 'error'
+            language: Detected language code, if any
+        """
+        self.files += 1
+        self.bytes += size
+        self.outcomes[status] += 1
+        if language:
+            self.languages[language] += 1
+        now = time.monotonic()
+        if now >= self.next_print:
+            self.next_print = now + self.interval
+            self.print_line()
+        if self.status_path and now >= self.next_status:
+            self.next_status = now + self.status_interval
+            self.write_status()
+
+    def snapshot(self):
+        """Current progress as a JSON-ready dict"""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        files_per_sec = self.files / elapsed
+        bytes_per_sec = self.bytes / elapsed
+        eta = None
+        if self.state == 'done':
+            eta = 0.0
+        elif self.total_bytes and bytes_per_sec:
+            eta = max(self.total_bytes - self.bytes, 0) / bytes_per_sec
+        elif self.total_files and files_per_sec:
+            eta = max(self.total_files - self.files, 0) / files_per_sec
+        return {
+            'state': self.state,
+            'pid': os.getpid(),
+            'elapsed_seconds': round(elapsed, 1),
+            'files_done': self.files,
+            'files_total': self.total_files,
+            'bytes_done': self.bytes,
+            'bytes_total': self.total_bytes,
+            'files_per_sec': round(files_per_sec, 2),
+            'mb_per_sec': round(bytes_per_sec / 1e6, 3),
+            'eta_seconds': round(eta, 1) if eta is not None else None,
+            'errors': self.outcomes['error'],
+            'skipped': self.outcomes['skipped'],
+            'languages': dict(self.languages.most_common()),
+            'updated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+
+    def print_line(self):
+        """Print the progress line now"""
+        if self.quiet:
+            return
+        snap = self.snapshot()
+        percent = f"{100 * self.files / self.total_files:5.1f}%" if self.total_files else ''
+        eta = _format_seconds(snap['eta_seconds']) if snap['eta_seconds'] is not None else '--'
+        detected = sum(self.languages.values())
+        mix = ' '.join(f"{code} {100 * count / detected:.0f}%"
+                       for code, count in self.languages.most_common(3)) if detected else '-'
+        line = (f"{Fore.CYAN}{percent} {Fore.WHITE}{self.files:,}/{self.total_files:,} files  "
+                f"{Fore.GREEN}{snap['files_per_sec']:,.1f} files/s  {snap['mb_per_sec']:,.2f} MB/s  "
+                f"{Fore.CYAN}ETA {eta}  "
+                f"{Fore.RED if snap['errors'] else Fore.WHITE}errors {snap['errors']:,}  "
+                f"{Fore.MAGENTA}{mix}")
+        if self.inline:
+            self.stream.write('\r\033[K' + line)
+        else:
+            self.stream.write(line + '\n')
+        self.stream.flush()
+
+    def write_status(self):
+        """Rewrite the status file atomically (readers never see a partial file)"""
+        temp_path = f"{self.status_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.status_path)
+
+    def finish(self):
+        """Print the final line and mark the status file done (unless the run failed)"""
+        if self.state == 'running':
+            self.state = 'done'
+        self.print_line()
+        if self.inline and not self.quiet:
+            self.stream.write('\n')
+            self.stream.flush()
+        if self.status_path:
+            self.write_status()
+
+
+def _format_seconds(seconds):
+    """Format seconds as h:mm:ss"""
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
@@ -0,0 +1,314 @@
+"""
+Record-Level Language Detection
+Stream CSV rows or JSON records and detect the language of selected fields
+"""
+
+import csv
+import json
+import os
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+from detection_engine import detect_batch, parse_engine, parse_languages, parse_priors
+from colorama import init, Fore, Style
+
+# Set UTF-8 encoding for Windows
+if os.name == 'nt':
+    import codecs
+    if hasattr(sys.stdout, 'buffer'):
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+init(autoreset=True)
+
+# Allow very long review/comment cells
+csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+
+RECORD_EXTENSIONS = ['.csv', '.json', '.jsonl']
+
+# Input encodings tried in order, as for text files (batch_processor.read_text_file);
+# utf-8-sig also drops the byte order mark of e.g. spreadsheet CSV exports
+RECORD_ENCODINGS = ['utf-8-sig', 'latin-1', 'cp1252']
+
+
+def extract_field(record, field_path):
+    """Get a value from a record using a dotted path (e.g. 'review.body' or 'items.0.text')"""
+    value = record
+    for part in field_path.split('.'):
+        if isinstance(value, dict):
+            value = value.get(part)
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return None
+        if value is None:
+            return None
+    if isinstance(value, (dict, list)):
+        return None
+    return str(value)
+
+
+def iter_csv_records(file_path, encoding='utf-8-sig'):
+    """Yield CSV rows one at a time as dicts"""
+    with open(file_path, 'r', encoding=encoding, newline='') as f:
+        for row in csv.DictReader(f):
+            yield row
+
+
+def iter_json_records(file_path, encoding='utf-8-sig', read_size=1 << 16):
+    """
+    Yield records from a JSON array, a JSON Lines file or concatenated (e.g. pretty-printed)
+    JSON objects without loading it whole
+    """
+    decoder = json.JSONDecoder()
+    with open(file_path, 'r', encoding=encoding) as f:
+        buffer = f.read(read_size).lstrip()
+        # Array elements are separated by commas; JSON Lines and concatenated objects by whitespace
+        in_array = buffer.startswith('[')
+        separators = ' \t\r\n,' if in_array else ' \t\r\n'
+        pos = 1 if in_array else 0
+        eof = False
+        while True:
+            while pos < len(buffer) and buffer[pos] in separators:
+                pos += 1
+            if in_array and pos < len(buffer) and buffer[pos] == ']':
+                return
+            if eof and pos == len(buffer) and not in_array:
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+                if end == len(buffer) and not eof:
+                    # A scalar cut at the buffer edge may still continue
+                    raise json.JSONDecodeError('Incomplete record', buffer, end)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # Read at least as much again, so a record spanning many blocks is re-decoded only a few times
+                chunk = f.read(max(read_size, len(buffer) - pos))
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+            yield record
+            pos = end
+            if pos > read_size:
+                buffer = buffer[pos:]
+                pos = 0
+
+
+def detect_encoding(file_path, encodings=RECORD_ENCODINGS):
+    """First of `encodings` that decodes the whole file (read in blocks), or None"""
+    for encoding in encodings:
+        try:
+            with open(file_path, 'r', encoding=encoding) as f:
+                while f.read(1 << 20):
+                    pass
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return None
+
+
+def iter_records(file_path, encoding='utf-8-sig'):
+    """Yield records from a CSV, JSON (array or concatenated objects) or JSON Lines file"""
+    if Path(file_path).suffix.lower() == '.csv':
+        return iter_csv_records(file_path, encoding)
+    return iter_json_records(file_path, encoding)
+
+
+def infer_text_fields(record):
+    """Pick the top-level fields of a record that hold free text"""
+    return [key for key, value in record.items()
+            if isinstance(value, str) and any(c.isalpha() for c in value)]
+
+
+class RecordProcessor:
+    """Detect languages per record for CSV and JSON inputs, in bounded-memory chunks"""
+
+    def __init__(self, text_fields=None, chunk_size=1000, min_length=3, languages=None, priors=None,
+                 normalize=True, engine='langdetect'):
+        self.text_fields = list(text_fields) if text_fields else None
+        self.chunk_size = chunk_size
+        self.min_length = min_length
+        self.languages = languages
+        self.priors = priors
+        self.normalize = normalize
+        self.engine = engine
+
+    def detect_chunk(self, texts):
+        """Detect languages for a chunk of texts, returning (code, confidence) pairs"""
+        results = [(None, 0.0)] * len(texts)
+        indices = [i for i, text in enumerate(texts) if text and len(text.strip()) >= self.min_length]
+        ranked = detect_batch([texts[i] for i in indices], self.languages, self.priors,
+                              engine=self.engine, normalize=self.normalize)
+        for i, probabilities in zip(indices, ranked):
+            if probabilities:
+                results[i] = (probabilities[0].lang, probabilities[0].prob)
+        return results
+
+    def process_file(self, file_path, output_path=None, encoding=None, on_chunk=None):
+        """
+        Stream records from a file, detect languages per field and write them out
+
+        Args:
+            file_path: CSV, JSON array, JSON Lines or concatenated JSON objects file
+            output_path: Where to write per-record results (CSV for CSV input, JSON Lines otherwise)
+            encoding: Input encoding (default: the first of RECORD_ENCODINGS that decodes the file)
+            on_chunk: Optional callback receiving the running summary after each chunk
+
+        Returns:
+            dict: Per-file summary with record counts and language mix per field
+        """
+        file_path = Path(file_path)
+        is_csv = file_path.suffix.lower() == '.csv'
+        records = iter_records(file_path, encoding or detect_encoding(file_path))
+
+        fields = self.text_fields
+        mix = {}
+        summary = {
+            'file': file_path.name,
+            'path': str(file_path),
+            'records': 0,
+            'detected': 0,
+            'chars': 0,
+            'words': 0,
+            'sentences': 0,
+            'fields': fields,
+            'language_mix': mix,
+        }
+
+        out = None
+        writer = None
+        completed = False
+        try:
+            if output_path:
+                out = open(output_path, 'w', encoding='utf-8', newline='')
+
+            chunk = []
+            for record in records:
+                if not isinstance(record, dict):
+                    record = {'value': record}
+                if fields is None:
+                    fields = infer_text_fields(record)
+                    summary['fields'] = fields
+                chunk.append(record)
+                if len(chunk) >= self.chunk_size:
+                    writer = self._process_chunk(chunk, fields, summary, out, writer, is_csv)
+                    chunk = []
+                    if on_chunk:
+                        on_chunk(summary)
+            if chunk:
+                writer = self._process_chunk(chunk, fields, summary, out, writer, is_csv)
+                if on_chunk:
+                    on_chunk(summary)
+            completed = True
+        finally:
+            if out:
+                out.close()
+                if not completed:
+                    # Don't leave a truncated per-record file behind
+                    os.remove(output_path)
+
+        for field in mix:
+            mix[field] = dict(mix[field].most_common())
+        return summary
+
+    def _process_chunk(self, chunk, fields, summary, out, writer, is_csv):
+        """Run detection on one chunk of records and write the annotated rows"""
+        mix = summary['language_mix']
+        annotations = [{} for _ in chunk]
+
+        for field in fields:
+            texts = [extract_field(record, field) for record in chunk]
+            counts = mix.setdefault(field, Counter())
+            for i, (text, (code, prob)) in enumerate(zip(texts, self.detect_chunk(texts))):
+                annotations[i][f'{field}_lang'] = code or ''
+                annotations[i][f'{field}_confidence'] = round(prob, 4)
+                if text:
+                    summary['chars'] += len(text)
+                    summary['words'] += len(text.split())
+                    summary['sentences'] += len(re.split(r'[.!?]+', text))
+                if code:
+                    counts[code] += 1
+                    summary['detected'] += 1
+
+        summary['records'] += len(chunk)
+
+        if out is None:
+            return writer
+
+        for record, extra in zip(chunk, annotations):
+            if is_csv:
+                row = {**record, **extra}
+                if writer is None:
+                    writer = csv.DictWriter(out, fieldnames=list(row.keys()), extrasaction='ignore')
+                    writer.writeheader()
+                writer.writerow(row)
+            else:
+                out.write(json.dumps({**record, '_languages': extra}, ensure_ascii=False) + '\n')
+        return writer
+
+
+def dominant_language(language_mix):
+    """Return the most common language code across all fields of a language mix"""
+    totals = Counter()
+    for counts in language_mix.values():
+        totals.update(counts)
+    if not totals:
+        return None
+    return totals.most_common(1)[0][0]
+
+
+def print_language_mix(summary):
+    """Print the per-field language mix of a processed file"""
+    print(f"{Fore.CYAN}Records: {Fore.WHITE}{summary['records']:,} "
+          f"{Fore.CYAN}| Detected values: {Fore.WHITE}{summary['detected']:,}")
+    for field, counts in summary['language_mix'].items():
+        total = sum(counts.values())
+        if not total:
+            continue
+        print(f"{Fore.YELLOW}  Field '{field}':")
+        for code, count in list(counts.items())[:10]:
+            percentage = (count / total) * 100 if total else 0
+            print(f"{Fore.WHITE}    {code:8} {Fore.GREEN}{count:,} ({percentage:.1f}%)")
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Detect languages per record in CSV/JSON files")
+    parser.add_argument('file', help="CSV, JSON array, JSON Lines or concatenated JSON objects file")
+    parser.add_argument('--field', action='append', dest='fields',
+                        help="Text column or dotted JSON path (repeatable); defaults to all text fields")
+    parser.add_argument('--chunk-size', type=int, default=1000, help="Records per detection batch")
+    parser.add_argument('--output', help="Per-record output file")
+    parser.add_argument('--languages', help="Comma-separated allowlist of language codes, e.g. en,fr,de")
+    parser.add_argument('--priors', help="Comma-separated prior weights, e.g. en=0.7,fr=0.3")
+    parser.add_argument('--engine', default='langdetect', help="Detection engine name, .npz model file or profile directory")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        print(f"{Fore.RED}Error: File '{args.file}' does not exist!")
+        return
+
+    output = args.output
+    if output is None:
+        path = Path(args.file)
+        output = str(path.with_name(f"{path.stem}_languages{'.csv' if path.suffix.lower() == '.csv' else '.jsonl'}"))
+
+    try:
+        languages, priors = parse_languages(args.languages), parse_priors(args.priors)
+        parse_engine(args.engine)
+    except ValueError as e:
+        parser.error(str(e))
+    processor = RecordProcessor(args.fields, chunk_size=args.chunk_size, languages=languages, priors=priors,
+                                engine=args.engine)
+    summary = processor.process_file(args.file, output)
+    print_language_mix(summary)
+    print(f"\n{Fore.GREEN}✓ Per-record results saved to: {Fore.WHITE}{output}{Style.RESET_ALL}")
+
+
+if __name__ == "__main__":
+    main()
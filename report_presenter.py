@@ -0,0 +1,102 @@
+"""
+Terminal Report Presenter
+Renders an AnalysisResult as a human-readable (optionally colored) report
+"""
+
+from colorama import Fore
+
+from language_metadata import language_name
+
+
+class _NoColor:
+    """Stand-in for colorama.Fore that emits no escape codes"""
+
+    def __getattr__(self, name):
+        return ''
+
+
+def render_report(result, color=True):
+    """
+    Render a comprehensive analysis report
+
+    Args:
+        result (AnalysisResult): Structured analysis result
+        color (bool): Include ANSI color codes (disable for web/text output)
+
+    Returns:
+        str: Formatted report
+    """
+    if not result.language:
+        return "Unable to detect language"
+
+    c = Fore if color else _NoColor()
+    report = []
+    report.append(f"\n{c.CYAN}{'='*70}")
+    report.append(f"{c.YELLOW}LANGUAGE ANALYSIS REPORT")
+    report.append(f"{c.CYAN}{'='*70}\n")
+
+    # Primary language
+    report.append(f"{c.GREEN}Primary Language: {c.MAGENTA}{result.language_name} ({result.language})")
+    report.append(f"{c.GREEN}Confidence: {c.YELLOW}{result.confidence * 100:.2f}%\n")
+
+    # Country info
+    if result.country:
+        report.append(f"{c.GREEN}Primary Region: {c.CYAN}{result.country['name']} ({result.country['code']})\n")
+
+    # Script type
+    report.append(f"{c.GREEN}Writing Script: {c.CYAN}{result.script}\n")
+
+    # Multilingual check
+    if result.is_multilingual():
+        report.append(f"{c.YELLOW}⚠ Multilingual text detected!\n")
+        report.append(f"{c.CYAN}All detected languages:")
+        for code, prob in result.probabilities[:5]:
+            name = language_name(code)
+            report.append(f"  • {name} ({code}): {prob * 100:.2f}%")
+        report.append("")
+
+    # Text statistics
+    stats = result.stats
+    if stats:
+        report.append(f"{c.CYAN}{'─'*70}")
+        report.append(f"{c.YELLOW}TEXT STATISTICS")
+        report.append(f"{c.CYAN}{'─'*70}")
+        report.append(f"{c.WHITE}Total Characters: {c.GREEN}{stats['total_chars']:,}")
+        report.append(f"{c.WHITE}Total Words: {c.GREEN}{stats['total_words']:,}")
+        report.append(f"{c.WHITE}Total Sentences: {c.GREEN}{stats['total_sentences']:,}")
+        report.append(f"{c.WHITE}Unique Words: {c.GREEN}{stats['unique_words']:,}")
+        report.append(f"{c.WHITE}Average Word Length: {c.GREEN}{stats['avg_word_length']:.2f} chars")
+        report.append(f"{c.WHITE}Alphabetic: {c.GREEN}{stats['alphabetic_chars']:,} {c.WHITE}| "
+                      f"Numeric: {c.GREEN}{stats['numeric_chars']:,} {c.WHITE}| "
+                      f"Special: {c.GREEN}{stats['special_chars']:,}\n")
+        if stats.get('dropped_chars'):
+            sampled = (f" {c.WHITE}| Sampled Windows: {c.GREEN}{stats['detection_windows']}"
+                       if stats.get('detection_windows', 1) > 1 else '')
+            report.append(f"{c.WHITE}Chars Skipped by Detector: {c.GREEN}{stats['dropped_chars']:,}{sampled}\n")
+
+    # Character distribution
+    if result.top_chars:
+        alphabetic = stats.get('alphabetic_chars', 0)
+        report.append(f"{c.CYAN}{'─'*70}")
+        report.append(f"{c.YELLOW}TOP 10 CHARACTERS")
+        report.append(f"{c.CYAN}{'─'*70}")
+        for char, count in result.top_chars:
+            percentage = (count / alphabetic) * 100 if alphabetic > 0 else 0
+            bar = '█' * int(percentage)
+            report.append(f"{c.MAGENTA}'{char}': {c.GREEN}{bar} {count:,} ({percentage:.1f}%)")
+        report.append("")
+
+    # Word frequency
+    if result.top_words:
+        total_words = stats.get('total_words', 0)
+        report.append(f"{c.CYAN}{'─'*70}")
+        report.append(f"{c.YELLOW}TOP 10 WORDS")
+        report.append(f"{c.CYAN}{'─'*70}")
+        for word, count in result.top_words:
+            percentage = (count / total_words) * 100 if total_words > 0 else 0
+            report.append(f"{c.CYAN}{word:15} {c.GREEN}{count:,} occurrences ({percentage:.1f}%)")
+        report.append("")
+
+    report.append(f"{c.CYAN}{'='*70}\n")
+
+    return '\n'.join(report)
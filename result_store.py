@@ -0,0 +1,323 @@
+"""
+Columnar Result Store
+Typed-array storage for batch results with cheap DataFrame/Arrow conversion
+"""
+
+import os
+from array import array
+
+import numpy as np
+import pandas as pd
+
+from budget import STATUSES
+from language_metadata import language_name
+
+
+# Equal-width confidence bins in summaries
+CONFIDENCE_BINS = 20
+
+
+class ResultStore:
+    """
+    Append-only columnar store for per-file detection results
+
+    Language codes are interned as small ints, numeric columns live in typed
+    arrays and all paths share one UTF-8 string pool, so a row costs a few
+    dozen bytes instead of a dict of boxed Python objects. The budget status
+    (budget.STATUSES) is stored as a one-byte code.
+
+    column(), language_ids(), to_dataframe() and to_arrow() share the store's
+    buffers instead of copying them, so they freeze it: append() raises
+    BufferError from then on. sorted_by() returns a new, appendable store.
+    """
+
+    # column name -> array typecode
+    NUMERIC_COLUMNS = {
+        'confidence': 'f',
+        'size_bytes': 'q',
+        'chars': 'q',
+        'words': 'q',
+        'sentences': 'q',
+        'records': 'q',
+        'dropped_chars': 'q',
+        'cluster_id': 'q',
+    }
+    COLUMN_ORDER = ['file', 'path', 'language', 'code', 'confidence', 'size_bytes',
+                    'chars', 'words', 'sentences', 'records', 'dropped_chars', 'cluster_id', 'status']
+
+    def __init__(self):
+        self._lang_codes = []
+        self._lang_ids = {}
+        self._lang = array('h')
+        self._status = array('b')
+        self._columns = {name: array(typecode) for name, typecode in self.NUMERIC_COLUMNS.items()}
+        self._pool = bytearray()
+        self._offsets = array('q', [0])
+        self._frozen = False
+
+    def __len__(self):
+        return len(self._lang)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('result index out of range')
+        path = self.path(i)
+        code = self.code(i)
+        row = {
+            'file': os.path.basename(path),
+            'path': path,
+            'language': _language_name(code),
+            'code': code,
+        }
+        for name, column in self._columns.items():
+            row[name] = column[i]
+        row['status'] = STATUSES[self._status[i]]
+        if np.isnan(row['confidence']):
+            row['confidence'] = None
+        return row
+
+    def intern(self, code):
+        """Map a language code to its small-int id (-1 for unknown)"""
+        if not code:
+            return -1
+        lang_id = self._lang_ids.get(code)
+        if lang_id is None:
+            lang_id = len(self._lang_codes)
+            self._lang_codes.append(code)
+            self._lang_ids[code] = lang_id
+        return lang_id
+
+    def append(self, row):
+        """Append one result given as a dict (same keys as the report CSV)"""
+        if self._frozen:
+            raise BufferError("ResultStore is read-only once its columns are exported "
+                              "(column, language_ids, to_dataframe, to_arrow)")
+        # Convert every field before touching a column, so a bad row leaves all columns the same length
+        confidence = row.get('confidence')
+        values = {name: int(row.get(name) or 0)
+                  for name in ('size_bytes', 'chars', 'words', 'sentences', 'dropped_chars')}
+        values['confidence'] = float('nan') if confidence is None else float(confidence)
+        records = row.get('records', 1)
+        values['records'] = 1 if records is None else int(records)
+        cluster_id = row.get('cluster_id')
+        values['cluster_id'] = -1 if cluster_id is None else int(cluster_id)
+        status = STATUSES.index(row.get('status') or 'ok')
+        path = str(row.get('path', '')).encode('utf-8')
+
+        self._lang.append(self.intern(row.get('code')))
+        for name, column in self._columns.items():
+            column.append(values[name])
+        self._status.append(status)
+        self._pool += path
+        self._offsets.append(len(self._pool))
+
+    def extend(self, other):
+        """Append every row of another store"""
+        for row in other:
+            self.append(row)
+
+    def sorted_by(self, key):
+        """New store with the same rows ordered by key(row)"""
+        store = ResultStore()
+        for row in sorted(self, key=key):
+            store.append(row)
+        return store
+
+    def path(self, i):
+        """Decode the path of row i from the string pool"""
+        return self._pool[self._offsets[i]:self._offsets[i + 1]].decode('utf-8')
+
+    def code(self, i):
+        """Language code of row i"""
+        lang_id = self._lang[i]
+        return self._lang_codes[lang_id] if lang_id >= 0 else None
+
+    @staticmethod
+    def _view(values):
+        """numpy view of a typed array, for aggregates that don't keep it (does not freeze the store)"""
+        return np.frombuffer(values, dtype=values.typecode)
+
+    def column(self, name):
+        """Zero-copy numpy view of a numeric column (freezes the store)"""
+        self._frozen = True
+        return self._view(self._columns[name])
+
+    def language_ids(self):
+        """Zero-copy numpy view of the interned language ids (freezes the store)"""
+        self._frozen = True
+        return self._view(self._lang)
+
+    def language_counts(self):
+        """Count rows per language code without materializing rows"""
+        ids = self._view(self._lang)
+        counts = np.bincount(ids[ids >= 0], minlength=len(self._lang_codes))
+        return {code: int(count) for code, count in zip(self._lang_codes, counts) if count}
+
+    def status_counts(self):
+        """Count rows per budget status"""
+        counts = np.bincount(self._view(self._status), minlength=len(STATUSES))
+        return {status: int(count) for status, count in zip(STATUSES, counts) if count}
+
+    def total(self, name):
+        """Sum of a numeric column"""
+        return int(self._view(self._columns[name]).sum())
+
+    def summary(self, confidence_bins=CONFIDENCE_BINS):
+        """Aggregates for dashboards (see summarize), computed on the column views"""
+        return summarize(self._view(self._lang), self._lang_codes, self._view(self._columns['confidence']),
+                         self._view(self._columns['size_bytes']), self.status_counts(), confidence_bins)
+
+    def nbytes(self):
+        """Approximate memory held by the store's buffers"""
+        return (self._lang.itemsize * len(self._lang) + len(self._status)
+                + sum(c.itemsize * len(c) for c in self._columns.values())
+                + len(self._pool) + self._offsets.itemsize * len(self._offsets))
+
+    def _paths(self):
+        """Decode all paths from the pool"""
+        pool = bytes(self._pool).decode('utf-8') if self._pool.isascii() else None
+        offsets = self._offsets
+        if pool is not None:
+            # ASCII pool: byte offsets are character offsets
+            return [pool[offsets[i]:offsets[i + 1]] for i in range(len(self))]
+        return [self.path(i) for i in range(len(self))]
+
+    def to_dataframe(self):
+        """Build a pandas DataFrame; numeric columns are wrapped without copying (freezes the store)"""
+        codes = pd.Categorical.from_codes(self.language_ids(), categories=self._lang_codes)
+        names = pd.Categorical.from_codes(self.language_ids(),
+                                          categories=[_language_name(c) for c in self._lang_codes])
+        paths = pd.Series(self._paths(), dtype=object)
+        data = {
+            'file': paths.map(os.path.basename),
+            'path': paths,
+            'language': names,
+            'code': codes,
+        }
+        for name in self.NUMERIC_COLUMNS:
+            data[name] = self.column(name)
+        data['status'] = pd.Categorical.from_codes(self._view(self._status),
+                                                   categories=list(STATUSES))
+        return pd.DataFrame(data, columns=self.COLUMN_ORDER, copy=False)
+
+    def to_arrow(self):
+        """Build a pyarrow Table; buffers are shared with the store, not copied (freezes the store)"""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("Arrow export requires the 'pyarrow' package: pip install pyarrow")
+
+        self._frozen = True
+
+        n = len(self)
+        paths = pa.LargeStringArray.from_buffers(n, pa.py_buffer(self._offsets), pa.py_buffer(self._pool))
+        indices = pa.array(self.language_ids(), mask=self.language_ids() < 0)
+        codes = pa.DictionaryArray.from_arrays(indices, pa.array(self._lang_codes, type=pa.string()))
+        columns = {'path': paths, 'code': codes}
+        for name in self.NUMERIC_COLUMNS:
+            columns[name] = pa.array(self.column(name))
+        columns['status'] = pa.DictionaryArray.from_arrays(
+            pa.array(self._view(self._status)), pa.array(STATUSES, type=pa.string()))
+        return pa.table(columns)
+
+
+def _language_name(code):
+    """Human-readable language name for a code"""
+    if not code:
+        return 'Unknown'
+    return language_name(code)
+
+
+def size_histogram(sizes):
+    """
+    File sizes counted in power-of-two bins ([0, 1), [1, 2), [2, 4), ...)
+
+    Returns:
+        dict: 'edges' (bytes, one more than 'counts') and 'counts', trimmed to
+        the occupied range
+    """
+    sizes = np.asarray(sizes, dtype=np.float64)
+    if not len(sizes):
+        return {'edges': [], 'counts': []}
+    # frexp's exponent e puts a size in [2**(e-1), 2**e); size 0 gets e = 0
+    counts = np.bincount(np.frexp(sizes)[1])
+    occupied = np.flatnonzero(counts)
+    first, last = int(occupied[0]), int(occupied[-1])
+    edges = [0 if first == 0 else 2 ** (first - 1)] + [2 ** e for e in range(first, last + 1)]
+    return {'edges': edges, 'counts': counts[first:last + 1].tolist()}
+
+
+def confidence_histogram(confidence, bins=CONFIDENCE_BINS):
+    """Confidences counted in equal-width bins over [0, 1] (missing values are left out)"""
+    scaled = np.asarray(confidence) * bins
+    with np.errstate(invalid='ignore'):
+        index = scaled.astype(np.int64)
+    np.clip(index, 0, bins - 1, out=index)
+    # Missing values go to an extra bin that is dropped
+    index[np.isnan(scaled)] = bins
+    return {'edges': np.linspace(0, 1, bins + 1).round(6).tolist(),
+            'counts': np.bincount(index, minlength=bins + 1)[:bins].tolist()}
+
+
+def summarize(language_ids, language_codes, confidence, sizes, statuses, confidence_bins=CONFIDENCE_BINS):
+    """
+    Fixed-size aggregates of per-document results
+
+    The output size depends on the number of languages and bins, not on the
+    number of documents, so a dashboard for millions of rows stays a few KB.
+
+    Args:
+        language_ids: Integer code per row (-1 for undetected)
+        language_codes: Code for each id
+        confidence, sizes: Per-row confidence (NaN when missing) and size in bytes
+        statuses (dict): Row count per budget status
+
+    Returns:
+        dict: 'documents', 'total_bytes', 'languages' (code -> count, most
+        frequent first), 'mean_confidence' per code, 'statuses',
+        'confidence_histogram' and 'size_histogram'
+    """
+    slots = len(language_codes) + 1
+    ids = np.asarray(language_ids, dtype=np.intp)
+    confidence = np.asarray(confidence)
+    # Undetected rows are counted in an extra last slot instead of being masked out
+    undetected = ids < 0
+    if undetected.any():
+        ids = np.where(undetected, slots - 1, ids)
+    counts = np.bincount(ids, minlength=slots)[:-1]
+    missing = np.isnan(confidence)
+    if missing.any():
+        sums = np.bincount(ids, weights=np.where(missing, 0, confidence), minlength=slots)[:-1]
+        scored_counts = counts - np.bincount(ids[missing], minlength=slots)[:-1]
+    else:
+        sums = np.bincount(ids, weights=confidence, minlength=slots)[:-1]
+        scored_counts = counts
+
+    order = np.argsort(-counts, kind='stable')
+    languages = {language_codes[i]: int(counts[i]) for i in order if counts[i]}
+    mean_confidence = {language_codes[i]: round(float(sums[i] / scored_counts[i]), 4)
+                       for i in order if scored_counts[i]}
+    return {
+        'documents': int(len(ids)),
+        'total_bytes': int(np.asarray(sizes, dtype=np.int64).sum()),
+        'languages': languages,
+        'mean_confidence': mean_confidence,
+        'statuses': dict(statuses),
+        'confidence_histogram': confidence_histogram(confidence, confidence_bins),
+        'size_histogram': size_histogram(sizes),
+    }
+
+
+def summarize_dataframe(df, confidence_bins=CONFIDENCE_BINS):
+    """summarize() for a batch report DataFrame (code, confidence, size_bytes, status columns)"""
+    ids, codes = pd.factorize(df['code'], use_na_sentinel=True)
+    statuses = df['status'].value_counts() if 'status' in df else pd.Series({'ok': len(df)})
+    return summarize(ids, [str(code) for code in codes], pd.to_numeric(df['confidence'], errors='coerce'),
+                     df['size_bytes'].fillna(0), {str(k): int(v) for k, v in statuses.items() if v},
+                     confidence_bins)
@@ -0,0 +1,99 @@
+"""
+Size-Aware Work Scheduler
+Plan parallel batch work from file sizes: largest first, huge files chunked, small files bundled
+"""
+
+from large_file import CHUNK_BYTES
+
+# Bundles aimed for per worker, so the tail of the schedule is made of small units
+BUNDLES_PER_WORKER = 8
+# Fixed cost of one file (open, detect, report) expressed in bytes of text
+FILE_COST_BYTES = 16 * 1024
+# Files per bundle at most, so one reply never carries too many outcomes
+MAX_BUNDLE_FILES = 64
+
+
+def file_cost(size):
+    """Estimated cost of analyzing one file of the given size"""
+    return size + FILE_COST_BYTES
+
+
+def plan_units(files, sizes, workers, chunk_ranges=None, chunk_bytes=CHUNK_BYTES, bundle_bytes=None,
+               max_bundle_files=MAX_BUNDLE_FILES):
+    """
+    Split files into work units, ordered largest estimated cost first
+
+    Handing the units out in this order to whichever worker is free
+    (longest-processing-time-first list scheduling) keeps the big units from
+    landing at the end of the run, where one worker would grind on while the
+    others sit idle.
+
+    Args:
+        files: Text files to analyze
+        sizes (dict): File -> size in bytes, as gathered by the directory scan
+        workers (int): Worker processes the units will be spread over
+        chunk_ranges: Optional callable returning the (start, end) byte ranges of
+            a file to split into chunk units, or None to keep the file whole
+        bundle_bytes: Target cost of a bundle of small files (default: the total
+            cost spread over BUNDLES_PER_WORKER bundles per worker, at most chunk_bytes)
+
+    Returns:
+        list: Unit dicts, either {'kind': 'files', 'files': [...]} or
+        {'kind': 'chunk', 'file', 'start', 'end', 'chunks'}, each with its 'cost'
+    """
+    units, small = [], []
+    whole = []
+    for file_path in files:
+        ranges = chunk_ranges(file_path) if chunk_ranges else None
+        if ranges:
+            units.extend({'kind': 'chunk', 'file': file_path, 'start': start, 'end': end,
+                          'chunks': len(ranges), 'cost': file_cost(end - start)} for start, end in ranges)
+        else:
+            whole.append((file_cost(sizes.get(file_path, 0)), file_path))
+
+    if bundle_bytes is None:
+        total = sum(cost for cost, _ in whole)
+        bundle_bytes = min(chunk_bytes, max(FILE_COST_BYTES, total // (max(1, workers) * BUNDLES_PER_WORKER)))
+
+    for cost, file_path in whole:
+        if cost >= bundle_bytes:
+            units.append({'kind': 'files', 'files': [file_path], 'cost': cost})
+        else:
+            small.append((cost, file_path))
+
+    # Pack small files largest first, closing a bundle once it reaches the target
+    small.sort(key=lambda item: item[0], reverse=True)
+    bundle, bundle_cost = [], 0
+    for cost, file_path in small:
+        bundle.append(file_path)
+        bundle_cost += cost
+        if bundle_cost >= bundle_bytes or len(bundle) >= max_bundle_files:
+            units.append({'kind': 'files', 'files': bundle, 'cost': bundle_cost})
+            bundle, bundle_cost = [], 0
+    if bundle:
+        units.append({'kind': 'files', 'files': bundle, 'cost': bundle_cost})
+
+    units.sort(key=lambda unit: unit['cost'], reverse=True)
+    return units
+
+
+def utilization(worker_stats, wall_seconds, workers):
+    """
+    How close a parallel run came to total work divided by workers
+
+    Args:
+        worker_stats (dict): pid -> {'busy': seconds spent on units, ...}
+        wall_seconds (float): Elapsed time from the first submitted unit to the last reply
+        workers (int): Pool size
+
+    Returns:
+        dict: 'wall_seconds', 'busy_seconds', 'ideal_seconds' (busy time / workers),
+        'efficiency' (ideal / wall) and 'balance' (ideal / busiest worker; the gap
+        between the two is worker startup and dispatch rather than scheduling)
+    """
+    busy = sum(stats.get('busy', 0.0) for stats in worker_stats.values())
+    busiest = max((stats.get('busy', 0.0) for stats in worker_stats.values()), default=0.0)
+    ideal = busy / max(1, workers)
+    return {'wall_seconds': wall_seconds, 'busy_seconds': busy, 'ideal_seconds': ideal,
+            'efficiency': ideal / wall_seconds if wall_seconds else None,
+            'balance': ideal / busiest if busiest else None}
@@ -0,0 +1,183 @@
+"""
+Shared-Memory Language Models
+Publish the model arrays once and let worker processes attach to them read-only
+"""
+
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from compact_model import CompactModel
+from short_text import ShortTextModel
+
+# Array offsets inside the block are aligned to this many bytes
+ALIGNMENT = 64
+
+# Models attached by this (worker) process; kept alive for its lifetime
+_attached = None
+
+
+class SharedArrays:
+    """
+    Named numpy arrays packed into one shared memory block
+
+    The creating process owns the block and must unlink() it; attaching
+    processes get read-only views and only close() their mapping.
+    """
+
+    def __init__(self, shm, layout, owner=False):
+        self.shm = shm
+        self.layout = layout
+        self.owner = owner
+        self.arrays = {}
+        for name, dtype, shape, offset in layout:
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+            if not owner:
+                array.flags.writeable = False
+            self.arrays[name] = array
+
+    @classmethod
+    def create(cls, arrays):
+        """Copy a {name: ndarray} dict into a new shared memory block"""
+        layout = []
+        size = 0
+        for name, array in arrays.items():
+            size = -(-size // ALIGNMENT) * ALIGNMENT
+            layout.append((name, array.dtype.str, array.shape, size))
+            size += array.nbytes
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        shared = cls(shm, layout, owner=True)
+        for name, array in arrays.items():
+            shared.arrays[name][...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, descriptor):
+        """Map an existing block described by descriptor() without copying"""
+        try:
+            shm = shared_memory.SharedMemory(name=descriptor['name'], track=False)
+        except TypeError:
+            # Python < 3.13 registers the block again; pool workers share the owner's
+            # resource tracker, so the owner's unlink() clears that registration too
+            shm = shared_memory.SharedMemory(name=descriptor['name'])
+        return cls(shm, descriptor['layout'])
+
+    def descriptor(self):
+        """Picklable description used by attach()"""
+        return {'name': self.shm.name, 'layout': self.layout}
+
+    @property
+    def nbytes(self):
+        return self.shm.size
+
+    def close(self):
+        """Release this process's views and mapping"""
+        self.arrays = {}
+        self.shm.close()
+
+    def unlink(self):
+        """Close and destroy the block (owner only)"""
+        self.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.unlink() if self.owner else self.close()
+
+
+class SharedModels:
+    """The compact and short-text models for one allowlist, published in shared memory"""
+
+    def __init__(self, languages=None):
+        from detection_engine import build_factory, normalize_languages
+
+        self.languages = normalize_languages(languages)
+        # Built from an uncached factory and dropped after copying, so the parent
+        # keeps only the shared copy (not langdetect's global profiles)
+        compact = CompactModel.from_factory(build_factory(self.languages))
+        short = ShortTextModel.build(list(self.languages) if self.languages else None)
+        self.compact_languages = compact.languages
+        self.short_languages = short.languages
+        self.short_scale = short.scale
+        self.arrays = SharedArrays.create({
+            'keys': compact.keys,
+            'values': compact.values,
+            'scales': compact.scales,
+            'offsets': compact.offsets,
+            'short_table': short.table,
+        })
+
+    @property
+    def nbytes(self):
+        return self.arrays.nbytes
+
+    def descriptor(self):
+        """Picklable payload for init_worker()"""
+        return {
+            'arrays': self.arrays.descriptor(),
+            'languages': self.languages,
+            'compact_languages': self.compact_languages,
+            'short_languages': self.short_languages,
+            'short_scale': self.short_scale,
+        }
+
+    def close(self):
+        """Destroy the shared block once all workers are done"""
+        self.arrays.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_models(descriptor):
+    """Attach to published models and register them with the detection engine"""
+    from detection_engine import register_models
+
+    arrays = SharedArrays.attach(descriptor['arrays'])
+    views = arrays.arrays
+    compact = CompactModel(descriptor['compact_languages'], views['keys'], views['values'],
+                           views['scales'], views['offsets'])
+    short = ShortTextModel(descriptor['short_languages'], views['short_table'], descriptor['short_scale'])
+    register_models(descriptor['languages'], compact=compact, short_text=short)
+    return arrays
+
+
+def init_worker(descriptor):
+    """ProcessPoolExecutor initializer: attach this worker to the shared models"""
+    global _attached
+    _attached = attach_models(descriptor)
+
+
+def memory_usage():
+    """
+    Memory of the current process in bytes
+
+    Returns:
+        dict: 'rss' (resident set) and 'pss' (proportional set: shared pages are
+        split between the processes mapping them; Linux only, else None)
+    """
+    usage = {'pid': os.getpid(), 'rss': None, 'pss': None}
+    try:
+        with open('/proc/self/smaps_rollup', 'r') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in ('Rss', 'Pss'):
+                    usage[key.lower()] = int(value.split()[0]) * 1024
+        return usage
+    except OSError:
+        pass
+    try:
+        import resource
+        # Peak rather than current RSS; kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        usage['rss'] = peak if os.uname().sysname == 'Darwin' else peak * 1024
+    except (ImportError, AttributeError):
+        pass
+    return usage
@@ -0,0 +1,215 @@
+"""
+Short-Text Language Classifier
+Compact word + character n-gram lexicon model for chat messages and queries
+"""
+
+import json
+import math
+import os
+import re
+import zlib
+from functools import lru_cache
+
+import numpy as np
+from langdetect.detector_factory import PROFILES_DIRECTORY
+from langdetect.language import Language
+from langdetect.utils.ngram import NGram
+
+# Texts shorter than this (stripped) use the short-text model
+SHORT_TEXT_THRESHOLD = 40
+
+# Most frequent function words and greetings per language (space separated)
+FREQUENT_WORDS = {
+    'af': "die en is van het nie ek jy hallo hoe gaan dit dankie goed met",
+    'ar': "في من على إلى أن هذا مرحبا كيف حالك شكرا نعم لا",
+    'bg': "и в не на се да как си здравей благодаря това ти вие е",
+    'ca': "el la els les i és que hola gràcies com estàs amb per molt",
+    'cs': "a je se na to že ne jak máš ahoj děkuji dobrý den ano jsem",
+    'cy': "yr y a ac yn mae ydw diolch sut wyt ti helo bore da dda",
+    'da': "og er det at en et jeg du hej hvordan har tak ikke med hvad går",
+    'de': "der die das und ist nicht ich du sie wie es ein eine mit guten tag danke hallo geht ihnen",
+    'en': "the and is are you how what this that of to in it hello hi thanks please yes with for my",
+    'es': "el la los las y es que en un una hola gracias cómo estás por para con sí muy qué",
+    'et': "ja on ei see et tere aitäh kuidas läheb mina sina jah",
+    'fa': "و در از به است سلام چطور هستید ممنون این آن",
+    'fi': "ja on ei se että mitä kiitos hyvää moi hei minä sinä kuinka kuuluu olen",
+    'fr': "le la les et est vous je tu un une des du de bonjour merci comment oui non pour avec pas allez",
+    'hi': "है के में की और नमस्ते आप कैसे हैं यह धन्यवाद",
+    'hr': "i je u na se da ne kako si bok hvala dobar dan što sam",
+    'hu': "a az és hogy nem van egy szia köszönöm vagy jó igen",
+    'id': "dan yang di ini itu apa kabar halo terima kasih saya anda tidak dengan ada",
+    'it': "il lo la gli le e è di che come stai ciao grazie sono non per un una sei bene",
+    'lt': "ir yra kad su ne labas ačiū kaip sekasi aš tu taip",
+    'lv': "un ir ka ar ne labdien paldies kā tev iet es tu jā sveiki",
+    'mk': "и во не на се да како си здраво благодарам ова ти е",
+    'mr': "आहे आणि मी तू नमस्कार कसे आहात धन्यवाद हे",
+    'ne': "छ र मा को नमस्ते तपाईं कस्तो हुनुहुन्छ धन्यवाद",
+    'nl': "de het een en is van ik je niet hallo hoe gaat dank goed wat met op dat",
+    'no': "og er det at en et jeg du hei hvordan har takk ikke med hva går deg",
+    'pl': "i w na nie jest to się że z jak masz cześć dziękuję dzień dobry tak co",
+    'pt': "o a os as e é de que não um uma olá obrigado obrigada você como está com para bom tudo",
+    'ro': "și este în de la nu cu ce bună mulțumesc salut sunt un o",
+    'ru': "и в не на я что как дела привет спасибо это ты вы",
+    'sk': "a je sa na to že nie ako máš ahoj ďakujem dobrý deň áno som",
+    'sl': "in je v na se da ne kako si živjo hvala dober dan kaj sem",
+    'so': "iyo waa ku ka oo soo nabad mahadsanid sidee tahay haa maya",
+    'sq': "dhe në të është një për me përshëndetje faleminderit si je mirë po jo",
+    'sv': "och att är det som en ett jag du hej hur mår tack inte med på för vad",
+    'sw': "na ya wa ni kwa habari gani asante sana jambo ndiyo hapana mimi wewe nzuri",
+    'tl': "ang ng sa mga ka kamusta kumusta salamat po ako ikaw ito na hindi oo",
+    'tr': "ve bir bu da de ne için merhaba nasılsın teşekkürler evet hayır ben sen çok",
+    'uk': "і в не на що як справи привіт дякую це ти ви",
+    'ur': "اور میں ہے کے کی سلام آپ کیسے ہیں شکریہ",
+    'vi': "và là của có không tôi bạn chào xin cảm ơn khỏe được này",
+}
+
+WORD_RE = re.compile(r'\w+')
+
+
+@lru_cache(maxsize=4096)
+def _normalize_char(ch):
+    """langdetect's character normalization (script classes, CJK/kana folding), memoized"""
+    return NGram.normalize(ch)
+
+
+@lru_cache(maxsize=1 << 16)
+def _hash(feature):
+    """Stable (process-independent) hash of a feature string"""
+    return zlib.crc32(feature.encode('utf-8'))
+
+
+def _ngram_features(text):
+    """Character 1-3 grams of each space-padded word, using langdetect's normalization"""
+    normalized = ''.join(_normalize_char(ch) for ch in text).lower()
+    features = []
+    for word in normalized.split():
+        padded = f' {word} '
+        for i in range(len(padded)):
+            for n in (1, 2, 3):
+                gram = padded[i:i + n]
+                if len(gram) == n and gram.strip():
+                    features.append(gram)
+    return features
+
+
+class ShortTextModel:
+    """
+    Hashed lexicon model: one uint8 array of shape (buckets, languages)
+
+    Each row holds quantized log-probability ratios of the features hashed into
+    that bucket, so scoring a text is a gather plus a column sum.
+    """
+
+    WORD_PREFIX = '\x01'
+
+    def __init__(self, languages, table, scale):
+        self.languages = list(languages)
+        self.table = table
+        self.scale = scale
+        self.mask = table.shape[0] - 1
+
+    @classmethod
+    def build(cls, languages=None, top_ngrams=(60, 200, 400), buckets=None,
+              word_weight=8.0, smoothing=5e-5, profile_directory=PROFILES_DIRECTORY):
+        """
+        Build the model from langdetect's n-gram profiles plus FREQUENT_WORDS
+
+        Args:
+            languages: Language codes to include (default: every available profile)
+            top_ngrams: How many 1-, 2- and 3-grams to keep per language
+            buckets: Hash table rows (power of two); sized from the feature count by default
+            word_weight: Log-ratio credited to a frequent-word hit
+            smoothing: Additive smoothing, as in langdetect's update rule
+        """
+        available = sorted(os.listdir(profile_directory))
+        if languages is None:
+            languages = available
+        languages = [lang for lang in languages if lang in available]
+
+        if buckets is None:
+            # ~1.5 rows per feature keeps collisions rare; smaller language sets get smaller tables
+            features = len(languages) * (sum(top_ngrams) + 20)
+            buckets = 1 << max(10, math.ceil(math.log2(features * 1.5)))
+        if buckets & (buckets - 1):
+            raise ValueError("buckets must be a power of two")
+
+        ratios = np.zeros((buckets, len(languages)), dtype=np.float32)
+        for index, lang in enumerate(languages):
+            with open(os.path.join(profile_directory, lang), 'r', encoding='utf-8') as f:
+                profile = json.load(f)
+
+            by_length = [{}, {}, {}]
+            for gram, count in profile['freq'].items():
+                if 1 <= len(gram) <= 3:
+                    bucket = by_length[len(gram) - 1]
+                    bucket[gram.lower()] = bucket.get(gram.lower(), 0) + count
+
+            for n, grams in enumerate(by_length):
+                total = profile['n_words'][n] or 1
+                for gram, count in sorted(grams.items(), key=lambda x: -x[1])[:top_ngrams[n]]:
+                    value = math.log(count / total + smoothing) - math.log(smoothing)
+                    row = _hash(gram) & (buckets - 1)
+                    ratios[row, index] = max(ratios[row, index], value)
+
+            for word in FREQUENT_WORDS.get(lang, '').split():
+                row = _hash(cls.WORD_PREFIX + word) & (buckets - 1)
+                ratios[row, index] = max(ratios[row, index], word_weight)
+
+        scale = 255.0 / max(float(ratios.max()), 1e-9)
+        table = np.round(ratios * scale).astype(np.uint8)
+        return cls(languages, table, scale)
+
+    def buckets(self, text):
+        """Hash-table rows for all features of a text"""
+        mask = self.mask
+        rows = [_hash(gram) & mask for gram in _ngram_features(text)]
+        prefix = self.WORD_PREFIX
+        rows.extend(_hash(prefix + word) & mask for word in WORD_RE.findall(text.lower()))
+        return rows
+
+    def scores(self, text):
+        """Summed log-ratio score per language (float)"""
+        rows = self.buckets(text)
+        if not rows:
+            return None
+        return self.table[rows].sum(axis=0, dtype=np.int32) / self.scale
+
+    def detect_langs(self, text, threshold=0.1, priors=None):
+        """
+        Ranked langdetect-style Language list; empty when the text has no features
+
+        Args:
+            priors: Optional {code: weight} prior, added to the scores in log space
+        """
+        scores = self.scores(text)
+        if scores is None or not scores.any():
+            return []
+        if priors:
+            scores = scores + self.log_priors(priors)
+        probs = np.exp(scores - scores.max())
+        probs /= probs.sum()
+        order = np.argsort(-probs)
+        return [Language(self.languages[i], float(probs[i])) for i in order if probs[i] > threshold]
+
+    def log_priors(self, priors):
+        """Log prior vector aligned with self.languages (unlisted languages get -inf)"""
+        weights = np.array([priors.get(lang, 0.0) for lang in self.languages], dtype=np.float64)
+        total = weights.sum()
+        if total <= 0:
+            raise ValueError("At least one prior weight must be positive")
+        with np.errstate(divide='ignore'):
+            return np.log(weights / total)
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+
+@lru_cache(maxsize=32)
+def _cached_model(languages):
+    return ShortTextModel.build(list(languages) if languages else None)
+
+
+def get_short_text_model(languages=None):
+    """Short-text model for an allowlist (None = all languages), built once and cached"""
+    return _cached_model(tuple(sorted(languages)) if languages else None)
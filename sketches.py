@@ -0,0 +1,231 @@
+"""
+Corpus Heavy-Hitter Sketches
+Mergeable Count-Min + top-k summaries of words and characters per language
+"""
+
+import hashlib
+import re
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+WORD_RE = re.compile(r'\b\w+\b')
+
+
+@lru_cache(maxsize=1 << 16)
+def _hash64(item):
+    """Stable 64-bit hash (identical in every process, so sketches can be merged)"""
+    return int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class CountMinTopK:
+    """
+    Count-Min sketch plus a bounded candidate set for the top-k items
+
+    Memory is fixed at depth x width counters plus `capacity` candidates,
+    however many distinct items are seen. Estimates never undercount; they
+    overcount by at most ~e/width of the total with high probability.
+    Sketches with the same width/depth merge by adding their tables.
+    """
+
+    def __init__(self, k=20, width=2048, depth=4, capacity=None):
+        self.k = k
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity or 4 * k
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.candidates = {}
+        self.total = 0
+
+    def _indices(self, items):
+        """Row indices per depth (double hashing: h1 + d * h2)"""
+        hashes = np.fromiter((_hash64(item) for item in items), dtype=np.uint64, count=len(items))
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        with np.errstate(over='ignore'):
+            return ((h1 + rows * h2) % np.uint64(self.width)).astype(np.intp)
+
+    def query(self, items):
+        """Estimated counts for a list of items"""
+        if not items:
+            return np.zeros(0, dtype=np.int64)
+        indices = self._indices(items)
+        return self.table[np.arange(self.depth)[:, None], indices].min(axis=0)
+
+    def update(self, counts):
+        """Add a {item: count} mapping (e.g. one document's Counter)"""
+        if not counts:
+            return
+        items = list(counts)
+        values = np.fromiter(counts.values(), dtype=np.int64, count=len(items))
+        indices = self._indices(items)
+        for row in range(self.depth):
+            np.add.at(self.table[row], indices[row], values)
+        self.total += int(values.sum())
+        estimates = self.table[np.arange(self.depth)[:, None], indices].min(axis=0)
+        self.candidates.update(zip(items, estimates.tolist()))
+        self._prune()
+
+    def merge(self, other):
+        """Fold another sketch (same width/depth) into this one"""
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Only sketches with the same width and depth can be merged")
+        self.table += other.table
+        self.total += other.total
+        items = list(self.candidates.keys() | other.candidates.keys())
+        self.candidates = dict(zip(items, self.query(items).tolist()))
+        self._prune()
+
+    def _prune(self):
+        if len(self.candidates) > self.capacity:
+            keep = sorted(self.candidates.items(), key=lambda x: -x[1])[:self.capacity]
+            self.candidates = dict(keep)
+
+    def top(self, k=None):
+        """Heaviest items as (item, estimated count), largest first"""
+        return sorted(self.candidates.items(), key=lambda x: (-x[1], x[0]))[:k or self.k]
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+    def to_state(self):
+        """JSON-serializable state (for partial results written by shards)"""
+        return {'k': self.k, 'width': self.width, 'depth': self.depth, 'capacity': self.capacity,
+                'total': self.total, 'table': self.table.tolist(),
+                'candidates': list(self.candidates.items())}
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild a sketch saved with to_state()"""
+        sketch = cls(state['k'], state['width'], state['depth'], state['capacity'])
+        sketch.table = np.array(state['table'], dtype=np.int64)
+        sketch.total = state['total']
+        sketch.candidates = {item: count for item, count in state['candidates']}
+        return sketch
+
+
+class DistinctCounter:
+    """
+    K-minimum-values estimate of the number of distinct items
+
+    Keeps the k smallest 64-bit item hashes; exact below k distinct items,
+    about 1/sqrt(k) relative error above. Counters merge by taking the k
+    smallest of both.
+    """
+
+    def __init__(self, k=4096):
+        self.k = k
+        self.hashes = np.zeros(0, dtype=np.uint64)
+
+    def update(self, items):
+        """Add an iterable of distinct items (e.g. a set of words)"""
+        items = list(items)
+        hashes = np.fromiter((_hash64(item) for item in items), dtype=np.uint64, count=len(items))
+        self.hashes = np.unique(np.concatenate([self.hashes, hashes]))[:self.k]
+
+    def merge(self, other):
+        """Fold in another counter"""
+        self.hashes = np.unique(np.concatenate([self.hashes, other.hashes]))[:self.k]
+        return self
+
+    def estimate(self):
+        """Estimated number of distinct items"""
+        if len(self.hashes) < self.k:
+            return len(self.hashes)
+        return int((self.k - 1) / (float(self.hashes[-1]) / 2.0**64))
+
+
+class CorpusSketches:
+    """
+    Top words and characters per detected language across a corpus
+
+    Words and characters are tokenized like LanguageAnalyzer's
+    get_word_frequency / get_character_distribution. Each document's counts
+    go into its language's sketches; at most max_chars characters per
+    document are tokenized.
+    """
+
+    def __init__(self, k=20, width=2048, depth=4, max_chars=200000):
+        self.k = k
+        self.width = width
+        self.depth = depth
+        self.max_chars = max_chars
+        self.languages = {}
+
+    def _entry(self, language):
+        entry = self.languages.get(language)
+        if entry is None:
+            entry = self.languages[language] = {
+                'documents': 0,
+                'words': CountMinTopK(self.k, self.width, self.depth),
+                'chars': CountMinTopK(self.k, self.width, self.depth),
+            }
+        return entry
+
+    def add(self, language, text):
+        """Count one document under its detected language"""
+        text = text[:self.max_chars].lower()
+        entry = self._entry(language)
+        entry['documents'] += 1
+        entry['words'].update(Counter(WORD_RE.findall(text)))
+        entry['chars'].update(Counter(c for c in text if c.isalpha()))
+
+    def add_sketches(self, language, words, chars):
+        """Count one document whose word/character sketches were built elsewhere (e.g. per chunk)"""
+        entry = self._entry(language)
+        entry['documents'] += 1
+        entry['words'].merge(words)
+        entry['chars'].merge(chars)
+
+    def merge(self, other):
+        """Fold in sketches from another worker, shard or run"""
+        for language, theirs in other.languages.items():
+            entry = self._entry(language)
+            entry['documents'] += theirs['documents']
+            entry['words'].merge(theirs['words'])
+            entry['chars'].merge(theirs['chars'])
+        return self
+
+    @property
+    def nbytes(self):
+        return sum(e['words'].nbytes + e['chars'].nbytes for e in self.languages.values())
+
+    def to_state(self):
+        """JSON-serializable state, mergeable after from_state()"""
+        return {
+            'k': self.k, 'width': self.width, 'depth': self.depth, 'max_chars': self.max_chars,
+            'languages': {
+                language: {'documents': entry['documents'],
+                           'words': entry['words'].to_state(),
+                           'chars': entry['chars'].to_state()}
+                for language, entry in self.languages.items()
+            },
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild sketches saved with to_state()"""
+        sketches = cls(state['k'], state['width'], state['depth'], state['max_chars'])
+        for language, entry in state['languages'].items():
+            sketches.languages[language] = {
+                'documents': entry['documents'],
+                'words': CountMinTopK.from_state(entry['words']),
+                'chars': CountMinTopK.from_state(entry['chars']),
+            }
+        return sketches
+
+    def to_dict(self):
+        """JSON-ready summary: per language document count, totals and top items"""
+        return {
+            language: {
+                'documents': entry['documents'],
+                'total_words': entry['words'].total,
+                'total_chars': entry['chars'].total,
+                'top_words': entry['words'].top(),
+                'top_chars': entry['chars'].top(),
+            }
+            for language, entry in sorted(self.languages.items())
+        }
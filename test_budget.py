@@ -0,0 +1,74 @@
+"""
+Budget Tests
+Status codes of documents that hit the size or CPU-time limits
+"""
+
+from pathlib import Path
+
+import pytest
+
+from budget import STATUSES, DocumentBudget, detect_by_script
+from detection_engine import detect_details, detect_sequential
+
+ENGLISH = (Path(__file__).parent / 'sample_texts' / 'english.txt').read_text(encoding='utf-8')
+
+
+def spent(budget):
+    """A running meter whose CPU time is already used up"""
+    meter = budget.start()
+    meter.started -= budget.max_seconds + 1
+    return meter
+
+
+def test_within_budget_is_ok():
+    result, info = detect_details(ENGLISH, budget=DocumentBudget())
+    assert result[0].lang == 'en'
+    assert info['status'] == 'ok'
+
+
+def test_oversized_input_is_truncated():
+    result, info = detect_details(ENGLISH, budget=DocumentBudget(max_chars=200))
+    assert result[0].lang == 'en'
+    assert info['status'] == 'truncated'
+    assert info['dropped_chars'] >= len(ENGLISH) - 200
+
+
+def test_sampling_stops_when_cpu_time_is_spent():
+    meter = spent(DocumentBudget())
+    result, info = detect_sequential(ENGLISH * 50, budget=meter)
+    assert result[0].lang == 'en'
+    assert info['windows'] == 1
+    assert meter.status == 'sampled'
+
+
+def test_degenerate_input_is_guessed_from_its_script():
+    result, info = detect_details('ж' * 300, budget=DocumentBudget())
+    assert [language.lang for language in result] == ['ru']
+    assert info['status'] == 'script_only'
+
+
+def test_spent_budget_without_script_guess_times_out():
+    result, info = detect_details(ENGLISH, budget=spent(DocumentBudget()))
+    assert result == []
+    assert info['status'] == 'timeout'
+
+
+def test_most_severe_status_wins():
+    meter = DocumentBudget().start()
+    meter.degrade('script_only')
+    meter.degrade('truncated')
+    assert meter.status == 'script_only'
+    assert STATUSES.index(meter.status) > STATUSES.index('truncated')
+
+
+def test_detect_by_script_respects_allowlist():
+    assert detect_by_script('Привет, как дела?')[0].lang == 'ru'
+    assert detect_by_script('Привет, как дела?', languages=['en']) == []
+    assert detect_by_script('Hello there') == []
+
+
+def test_invalid_limits():
+    with pytest.raises(ValueError):
+        DocumentBudget(max_chars=0)
+    with pytest.raises(ValueError):
+        DocumentBudget(max_seconds=0)
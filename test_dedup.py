@@ -0,0 +1,39 @@
+"""
+Near-Duplicate Tests
+MinHash signatures and LSH clustering
+"""
+
+from dedup import EMPTY, NUM_PERM, NearDuplicateIndex, jaccard, minhash
+
+TEMPLATE = ("Dear customer, your order has been shipped and will arrive within three to five "
+            "business days. You can track the parcel from your account page at any time. ") * 4
+EDITED = TEMPLATE.replace("three to five", "two to four")
+UNRELATED = ("Le comité a approuvé le budget annuel après une longue discussion sur les priorités "
+             "de la ville, notamment les transports publics et les espaces verts. ") * 4
+
+
+def test_signature_shape_and_stability():
+    signature = minhash(TEMPLATE)
+    assert signature.shape == (NUM_PERM,)
+    assert (signature == minhash(TEMPLATE)).all()
+    # Case and whitespace runs are normalized before shingling
+    assert jaccard(signature, minhash("  " + TEMPLATE.upper().replace(' ', '\n '))) == 1.0
+
+
+def test_similarity_estimates():
+    assert jaccard(minhash(TEMPLATE), minhash(EDITED)) > 0.7
+    assert jaccard(minhash(TEMPLATE), minhash(UNRELATED)) < 0.2
+
+
+def test_empty_and_tiny_texts():
+    assert (minhash('') == EMPTY).all()
+    assert (minhash('hi') != EMPTY).sum() == 1
+
+
+def test_index_clusters_near_duplicates():
+    index = NearDuplicateIndex(threshold=0.7)
+    assert index.assign(minhash(TEMPLATE)) == (0, True)
+    assert index.assign(minhash(UNRELATED)) == (1, True)
+    assert index.assign(minhash(EDITED)) == (0, False)
+    assert index.assign(minhash(TEMPLATE)) == (0, False)
+    assert len(index) == 2
@@ -0,0 +1,54 @@
+"""
+Detection Engine Tests
+Engine registry lookups and which engines take the short-text path
+"""
+
+import shutil
+
+import pytest
+from langdetect.detector_factory import PROFILES_DIRECTORY
+
+from detection_engine import (DetectionEngine, detect_langs, engine_names, get_engine,
+                              parse_engine, register_engine)
+
+
+class FixedEngine(DetectionEngine):
+    """Always answers the same language"""
+
+    name = 'fixed-test-engine'
+
+    def __init__(self, code):
+        self.code = code
+
+    def detect_langs(self, text, languages=None, priors=None):
+        return get_engine('langdetect').detect_langs("this is plain english text", (self.code,))
+
+
+def test_stock_engines_are_registered():
+    assert engine_names()[:2] == ['langdetect', 'compact']
+    assert parse_engine('compact') == 'compact'
+
+
+def test_unknown_engine_raises_even_for_short_text():
+    with pytest.raises(ValueError, match='Unknown engine'):
+        detect_langs("Guten Morgen", engine='nonsense-engine')
+    with pytest.raises(ValueError, match='Unknown engine'):
+        parse_engine('nonsense-engine')
+
+
+def test_registered_engine_is_selectable_by_name():
+    register_engine(FixedEngine('en'))
+    assert 'fixed-test-engine' in engine_names()
+    # Short texts are not rerouted to the stock short-text model
+    assert detect_langs("Guten Morgen", engine='fixed-test-engine')[0].lang == 'en'
+    assert detect_langs("Guten Morgen")[0].lang == 'de'
+
+
+def test_profile_directory_only_returns_its_languages(tmp_path):
+    for code in ('en', 'fr'):
+        shutil.copy(f"{PROFILES_DIRECTORY}/{code}", tmp_path / code)
+    engine = get_engine(str(tmp_path))
+    assert engine.languages == ('en', 'fr')
+    assert {result.lang for result in detect_langs("Guten Morgen", engine=str(tmp_path))} <= {'en', 'fr'}
+    with pytest.raises(ValueError, match='No profile'):
+        detect_langs("Guten Morgen, wie geht es Ihnen?", languages=['de'], engine=str(tmp_path))
@@ -1,12 +1,17 @@
 """
 Quick test script for language detection
+Usage: python test_detector.py [engine]  (default: langdetect)
+Under pytest the engine comes from the DETECTION_ENGINE environment variable.
 """
 
-from langdetect import detect, detect_langs
-from colorama import init, Fore, Style
+from colorama import init, Fore
+import argparse
 import sys
 import os
 
+from detection_engine import detect_langs
+from language_metadata import language_name
+
 # Set UTF-8 encoding for Windows console
 if os.name == 'nt':
     import codecs
@@ -16,13 +21,6 @@ if os.name == 'nt':
 # Initialize colorama
 init(autoreset=True)
 
-# Language name mapping
-language_map = {
-    'en': 'English', 'es': 'Spanish', 'fr': 'French', 'de': 'German',
-    'it': 'Italian', 'pt': 'Portuguese', 'ru': 'Russian', 'ja': 'Japanese',
-    'zh-cn': 'Chinese', 'ko': 'Korean', 'ar': 'Arabic', 'hi': 'Hindi'
-}
-
 # Sample texts in different languages
 sample_texts = [
     ("Hello, how are you today? This is a sample English text.", "English"),
@@ -37,48 +35,72 @@ sample_texts = [
     ("नमस्ते, आप कैसे हैं? यह हिंदी में एक नमूना पाठ है।", "Hindi"),
 ]
 
-print(f"{Fore.MAGENTA}{'='*70}")
-print(f"{Fore.YELLOW}       Language Detection NLP Project - Test Results")
-print(f"{Fore.MAGENTA}{'='*70}\n")
-
-correct = 0
-total = len(sample_texts)
-
-for text, expected_lang in sample_texts:
-    try:
-        # Detect language
-        detected_code = detect(text)
-        detected_lang = language_map.get(detected_code, detected_code.upper())
-        
-        # Get probabilities
-        probs = detect_langs(text)
-        confidence = probs[0].prob * 100
-        
-        # Check if correct
-        is_correct = expected_lang.lower() in detected_lang.lower()
-        if is_correct:
-            correct += 1
-            status = f"{Fore.GREEN}✓ CORRECT"
-        else:
-            status = f"{Fore.RED}✗ WRONG"
-        
-        # Display result
-        print(f"{Fore.CYAN}Text: {Fore.WHITE}{text[:50]}...")
-        print(f"{Fore.YELLOW}Expected: {Fore.MAGENTA}{expected_lang}")
-        print(f"{Fore.YELLOW}Detected: {Fore.MAGENTA}{detected_lang} ({detected_code}) - {confidence:.1f}% confidence")
-        print(f"{status}")
-        print(f"{Fore.CYAN}{'-'*70}\n")
-        
-    except Exception as e:
-        print(f"{Fore.RED}Error processing text: {str(e)}\n")
-
-# Summary
-accuracy = (correct / total) * 100
-print(f"{Fore.MAGENTA}{'='*70}")
-print(f"{Fore.YELLOW}SUMMARY:")
-print(f"{Fore.GREEN}Correct: {correct}/{total}")
-print(f"{Fore.CYAN}Accuracy: {accuracy:.1f}%")
-print(f"{Fore.MAGENTA}{'='*70}\n")
-
-print(f"{Fore.GREEN}✓ Language detection is working successfully!")
-print(f"\n{Fore.YELLOW}To use interactively, run: {Fore.WHITE}python language_detector.py")
+
+def detect_name(text, engine):
+    """Detected language name, code and confidence (percent) of a text"""
+    probs = detect_langs(text, engine=engine)
+    return language_name(probs[0].lang), probs[0].lang, probs[0].prob * 100
+
+
+def test_sample_texts():
+    engine = os.environ.get('DETECTION_ENGINE', 'langdetect')
+    wrong = []
+    for text, expected_lang in sample_texts:
+        detected_lang = detect_name(text, engine)[0]
+        if expected_lang.lower() not in detected_lang.lower():
+            wrong.append((expected_lang, detected_lang))
+    assert not wrong
+
+
+def main():
+    """Print the detection result of every sample text"""
+    parser = argparse.ArgumentParser(description="Quick test of language detection on sample texts")
+    # Detection engine name or model file (see detection_engine.get_engine)
+    parser.add_argument('engine', nargs='?', default='langdetect',
+                        help="Detection engine name, .npz model file or profile directory")
+    engine = parser.parse_args().engine
+
+    print(f"{Fore.MAGENTA}{'='*70}")
+    print(f"{Fore.YELLOW}       Language Detection NLP Project - Test Results ({engine})")
+    print(f"{Fore.MAGENTA}{'='*70}\n")
+
+    correct = 0
+    total = len(sample_texts)
+
+    for text, expected_lang in sample_texts:
+        try:
+            # Detect language with probabilities
+            detected_lang, detected_code, confidence = detect_name(text, engine)
+
+            # Check if correct
+            is_correct = expected_lang.lower() in detected_lang.lower()
+            if is_correct:
+                correct += 1
+                status = f"{Fore.GREEN}✓ CORRECT"
+            else:
+                status = f"{Fore.RED}✗ WRONG"
+
+            # Display result
+            print(f"{Fore.CYAN}Text: {Fore.WHITE}{text[:50]}...")
+            print(f"{Fore.YELLOW}Expected: {Fore.MAGENTA}{expected_lang}")
+            print(f"{Fore.YELLOW}Detected: {Fore.MAGENTA}{detected_lang} ({detected_code}) - {confidence:.1f}% confidence")
+            print(f"{status}")
+            print(f"{Fore.CYAN}{'-'*70}\n")
+
+        except Exception as e:
+            print(f"{Fore.RED}Error processing text: {str(e)}\n")
+
+    # Summary
+    accuracy = (correct / total) * 100
+    print(f"{Fore.MAGENTA}{'='*70}")
+    print(f"{Fore.YELLOW}SUMMARY:")
+    print(f"{Fore.GREEN}Correct: {correct}/{total}")
+    print(f"{Fore.CYAN}Accuracy: {accuracy:.1f}%")
+    print(f"{Fore.MAGENTA}{'='*70}\n")
+
+    print(f"{Fore.GREEN}✓ Language detection is working successfully!")
+    print(f"\n{Fore.YELLOW}To use interactively, run: {Fore.WHITE}python language_detector.py")
+
+
+if __name__ == "__main__":
+    main()
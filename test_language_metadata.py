@@ -0,0 +1,42 @@
+"""
+Language Metadata Tests
+Code -> name, country and script lookups from the generated table
+"""
+
+import pytest
+
+from detection_engine import available_languages
+from language_metadata import LANGUAGE_NAMES, LANGUAGES, SCRIPTS, country_info, language_info, language_name
+
+
+def test_language_name():
+    assert language_name('en') == 'English'
+    assert language_name('zh-cn') == 'Chinese (Simplified)'
+    assert language_name(None) == 'Unknown'
+    assert language_name('') == 'Unknown'
+    assert language_name('xx') == 'XX'
+
+
+def test_every_supported_language_has_a_name():
+    assert set(available_languages()) <= set(LANGUAGE_NAMES)
+
+
+def test_country_info():
+    assert country_info('de') == {'name': 'Germany', 'code': 'DE', 'flag': '🇩🇪'}
+    assert country_info('xx') is None
+
+
+def test_language_info():
+    info = language_info('zh-cn')
+    assert info.scripts == ('Hans',)
+    assert info.flag == info.countries[0].flag == '🇨🇳'
+    assert [country.code for country in info.countries] == ['CN', 'SG']
+    assert language_info('xx') is None
+    assert SCRIPTS['Cyrl'] == 'Cyrillic'
+
+
+def test_tables_are_read_only():
+    with pytest.raises(TypeError):
+        LANGUAGES['xx'] = None
+    with pytest.raises(TypeError):
+        LANGUAGE_NAMES['en'] = 'Anglais'
@@ -0,0 +1,80 @@
+"""
+Log Follower Tests
+Offsets across rotation, truncation and restarts
+"""
+
+import os
+
+import pytest
+
+from log_follower import LogFollower, main
+
+LINE = "This is an english log line for testing\n"
+
+
+def follower(tmp_path, **options):
+    follower = LogFollower([tmp_path / 'logs'], state_file=tmp_path / 'state.json', **options)
+    follower._detect = lambda text: 'en'
+    return follower
+
+
+@pytest.fixture
+def log(tmp_path):
+    (tmp_path / 'logs').mkdir()
+    path = tmp_path / 'logs' / 'app.log'
+    path.write_text(LINE * 3)
+    return path
+
+
+def append(path, text):
+    with open(path, 'a') as f:
+        f.write(text)
+
+
+def test_only_complete_lines_are_read(tmp_path, log):
+    f = follower(tmp_path)
+    assert f.poll() == 3
+    append(log, "A partial line without its newline")
+    assert f.poll() == 0
+    append(log, " yet\n")
+    assert f.poll() == 1
+    assert f.counts.snapshot() == {'en': 4}
+
+
+def test_restart_resumes_from_saved_offset(tmp_path, log):
+    f = follower(tmp_path)
+    assert f.poll() == 3
+    f.close()
+    append(log, LINE * 2)
+    assert follower(tmp_path).poll() == 2
+
+
+def test_start_at_end_skips_existing_content(tmp_path, log):
+    f = follower(tmp_path, start_at_end=True)
+    assert f.poll() == 0
+    append(log, LINE)
+    assert f.poll() == 1
+
+
+def test_rotation_drains_old_file_then_reads_new_one(tmp_path, log):
+    f = follower(tmp_path, pattern='app.log')
+    assert f.poll() == 3
+    append(log, LINE)
+    os.rename(log, log.with_name('app.log.1'))
+    log.write_text(LINE * 2)
+    assert f.poll() == 3
+    assert f.lines_seen == 6
+
+
+def test_truncation_restarts_at_the_beginning(tmp_path, log):
+    f = follower(tmp_path)
+    assert f.poll() == 3
+    log.write_text(LINE)
+    assert f.poll() == 1
+
+
+def test_invalid_options_are_usage_errors(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main([str(tmp_path), '--priors', 'en=abc'])
+    assert exit_info.value.code == 2
+    assert 'usage' in capsys.readouterr().err
@@ -0,0 +1,55 @@
+"""
+pandas Accessor Tests
+series.langdetect results, deduplication and executors
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Importing the module registers series.langdetect
+from pandas_accessor import detect_texts, unique_texts
+
+TEXTS = ["This is a sample English text about the weather.",
+         "Ceci est un exemple de texte français sur la météo.",
+         "Dies ist ein deutscher Beispieltext über das Wetter."]
+
+
+def column(dtype=object):
+    return pd.Series([TEXTS[0], None, TEXTS[1], TEXTS[0], 'ok', TEXTS[2]], index=list('abcdef'), dtype=dtype)
+
+
+@pytest.mark.parametrize('dtype', [object, 'string[pyarrow]'])
+def test_unique_texts(dtype):
+    positions, texts = unique_texts(column(dtype))
+    assert positions[1] == -1
+    assert positions[0] == positions[3]
+    assert sorted(texts) == sorted(set(TEXTS) | {'ok'})
+
+
+@pytest.mark.parametrize('dtype', [object, 'string[pyarrow]'])
+def test_detect_per_row(dtype):
+    result = column(dtype).langdetect.detect()
+    assert list(result.index) == list('abcdef')
+    assert isinstance(result['language'].dtype, pd.CategoricalDtype)
+    assert result['confidence'].dtype == np.float32
+    # Missing and too-short texts stay undetected
+    codes = [code if isinstance(code, str) else None for code in result['language']]
+    assert codes == ['en', None, 'fr', 'en', None, 'de']
+    assert np.isnan(result['confidence'].iloc[4])
+
+
+def test_allowlist_and_code():
+    codes = column().langdetect.code(languages=['en', 'fr'])
+    assert set(codes.dropna()) <= {'en', 'fr'}
+
+
+def test_executor_matches_serial():
+    texts = TEXTS * 3
+    with ThreadPoolExecutor(2) as executor:
+        parallel = detect_texts(texts, chunk_size=2, executor=executor)
+    assert [code for code, _ in parallel] == [code for code, _ in detect_texts(texts)] == ['en', 'fr', 'de'] * 3
+    with pytest.raises(ValueError, match='executor'):
+        detect_texts(texts, chunk_size=2, executor='threads')
@@ -0,0 +1,68 @@
+"""
+Record Processor Tests
+Streaming JSON record layouts and per-record outputs
+"""
+
+import json
+
+import pytest
+
+from record_processor import RecordProcessor, iter_json_records
+
+RECORDS = [{'id': i, 'text': f"This is English review number {i}", 'meta': {'tags': ['a', 'b']}}
+           for i in range(20)]
+
+LAYOUTS = {
+    'array': json.dumps(RECORDS, indent=2),
+    'jsonl': '\n'.join(json.dumps(record) for record in RECORDS) + '\n',
+    'concatenated': '\n'.join(json.dumps(record, indent=2) for record in RECORDS),
+}
+
+
+@pytest.mark.parametrize('layout', sorted(LAYOUTS))
+@pytest.mark.parametrize('read_size', [7, 1 << 16])
+def test_json_layouts(tmp_path, layout, read_size):
+    path = tmp_path / 'records.json'
+    path.write_text(LAYOUTS[layout], encoding='utf-8')
+    assert list(iter_json_records(path, read_size=read_size)) == RECORDS
+
+
+def test_single_pretty_printed_object_and_scalars(tmp_path):
+    path = tmp_path / 'one.json'
+    path.write_text(json.dumps(RECORDS[0], indent=4), encoding='utf-8')
+    assert list(iter_json_records(path)) == [RECORDS[0]]
+    path.write_text('1234567\n89 "text"\n', encoding='utf-8')
+    assert list(iter_json_records(path, read_size=3)) == [1234567, 89, 'text']
+    path.write_text(' \n', encoding='utf-8')
+    assert list(iter_json_records(path)) == []
+
+
+def test_failed_file_leaves_no_output(tmp_path):
+    source = tmp_path / 'broken.json'
+    source.write_text(json.dumps(RECORDS[0], indent=2) + '\n{"text": "cut off', encoding='utf-8')
+    output = tmp_path / 'broken_languages.jsonl'
+    with pytest.raises(json.JSONDecodeError):
+        RecordProcessor(['text'], chunk_size=1).process_file(source, output)
+    assert not output.exists()
+
+
+@pytest.mark.parametrize('encoding', ['utf-8-sig', 'latin-1'])
+def test_csv_encodings(tmp_path, encoding):
+    source = tmp_path / 'reviews.csv'
+    source.write_text("text,note\n\"C'est un très bon produit, je le recommande\",é\n"
+                      "This is a very good product and I recommend it,x\n", encoding=encoding)
+    output = tmp_path / 'reviews_languages.csv'
+    summary = RecordProcessor(['text']).process_file(source, output)
+    assert summary['records'] == 2
+    assert summary['language_mix'] == {'text': {'fr': 1, 'en': 1}}
+    with open(output, encoding='utf-8') as f:
+        header = f.readline()
+    assert header.startswith('text,note,text_lang')
+
+
+def test_detect_chunk_skips_short_and_missing_texts():
+    texts = [None, 'ok', "This is a very good product", "This is a very good product"]
+    results = RecordProcessor().detect_chunk(texts)
+    assert results[:2] == [(None, 0.0), (None, 0.0)]
+    assert results[2] == results[3]
+    assert results[2][0] == 'en'
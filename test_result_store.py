@@ -0,0 +1,68 @@
+"""
+Result Store Tests
+Columnar rows, aggregates and the frozen-once-exported rule
+"""
+
+import pytest
+
+from result_store import ResultStore
+
+
+def make_store(count=4):
+    store = ResultStore()
+    for i in range(count):
+        store.append({'path': f"docs/{i}.txt", 'code': 'en' if i % 2 else 'fr', 'confidence': 0.5 + i / 10,
+                      'size_bytes': 100 * (i + 1), 'words': i})
+    return store
+
+
+def test_rows_round_trip():
+    store = make_store()
+    store.append({'path': 'docs/none.txt', 'code': None, 'confidence': None, 'status': 'timeout'})
+    row = store[-1]
+    assert (row['file'], row['code'], row['confidence'], row['status']) == ('none.txt', None, None, 'timeout')
+    assert store[1]['code'] == 'en' and store[1]['confidence'] == pytest.approx(0.6)
+    assert store.language_counts() == {'fr': 2, 'en': 2}
+    assert store.total('size_bytes') == 1000
+
+
+def test_record_counts_default_to_one_but_keep_zero():
+    store = ResultStore()
+    store.append({'path': 'a.txt'})
+    store.append({'path': 'empty.csv', 'records': 0})
+    store.append({'path': 'b.csv', 'records': 12})
+    assert [row['records'] for row in store] == [1, 0, 12]
+
+
+def test_bad_row_leaves_columns_aligned():
+    store = make_store()
+    with pytest.raises(ValueError):
+        store.append({'path': 'docs/bad.txt', 'code': 'de', 'status': 'no-such-status'})
+    with pytest.raises(ValueError):
+        store.append({'path': 'docs/bad.txt', 'code': 'de', 'words': 'many'})
+    assert len(store) == 4
+    assert store.summary()['documents'] == 4
+    assert len(store.to_dataframe()) == 4
+
+
+def test_summary_does_not_freeze():
+    store = make_store()
+    summary = store.summary()
+    assert summary['languages'] == {'fr': 2, 'en': 2}
+    store.append({'path': 'docs/more.txt', 'code': 'en'})
+    assert len(store) == 5
+
+
+@pytest.mark.parametrize('export', [lambda s: s.column('words'), lambda s: s.language_ids(),
+                                    lambda s: s.to_dataframe()])
+def test_exports_freeze_the_store(export):
+    store = make_store()
+    exported = export(store)
+    with pytest.raises(BufferError):
+        store.append({'path': 'docs/late.txt', 'code': 'en'})
+    assert len(store) == len(exported) == 4
+    assert store.summary()['documents'] == 4
+    # A re-ordered copy is a new store and accepts rows again
+    copy = store.sorted_by(lambda row: row['path'])
+    copy.append({'path': 'docs/late.txt', 'code': 'en'})
+    assert len(copy) == 5
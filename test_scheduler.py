@@ -0,0 +1,54 @@
+"""
+Scheduler Tests
+Work units from file sizes: largest first, huge files chunked, small files bundled
+"""
+
+from scheduler import FILE_COST_BYTES, file_cost, plan_units, utilization
+
+
+def planned_files(units):
+    """Every file of a plan, once per unit it appears in"""
+    files = []
+    for unit in units:
+        files.extend(unit['files'] if unit['kind'] == 'files' else [unit['file']])
+    return files
+
+
+def test_units_are_ordered_largest_first():
+    sizes = {f"f{i}": size for i, size in enumerate([10, 5_000_000, 300, 2_000_000, 40, 900_000])}
+    units = plan_units(list(sizes), sizes, workers=2)
+    costs = [unit['cost'] for unit in units]
+    assert costs == sorted(costs, reverse=True)
+    assert units[0]['files'] == ['f1']
+    assert sorted(planned_files(units)) == sorted(sizes)
+
+
+def test_small_files_are_bundled():
+    sizes = {f"f{i}": 100 for i in range(10)}
+    units = plan_units(list(sizes), sizes, workers=2, bundle_bytes=4 * FILE_COST_BYTES)
+    assert [len(unit['files']) for unit in units] == [4, 4, 2]
+    assert sum(unit['cost'] for unit in units) == 10 * file_cost(100)
+
+
+def test_bundles_respect_file_limit():
+    sizes = {f"f{i}": 0 for i in range(10)}
+    units = plan_units(list(sizes), sizes, workers=1, bundle_bytes=10**9, max_bundle_files=3)
+    assert [len(unit['files']) for unit in units] == [3, 3, 3, 1]
+
+
+def test_huge_files_become_chunk_units():
+    sizes = {'huge': 300, 'small': 10}
+    ranges = {'huge': [(0, 100), (100, 200), (200, 300)]}
+    units = plan_units(list(sizes), sizes, workers=4, chunk_ranges=ranges.get)
+    chunks = [unit for unit in units if unit['kind'] == 'chunk']
+    assert [(unit['start'], unit['end']) for unit in chunks] == ranges['huge']
+    assert all(unit['chunks'] == 3 and unit['file'] == 'huge' for unit in chunks)
+    assert [unit['files'] for unit in units if unit['kind'] == 'files'] == [['small']]
+
+
+def test_utilization():
+    stats = utilization({1: {'busy': 3.0}, 2: {'busy': 1.0}}, wall_seconds=4.0, workers=2)
+    assert stats['ideal_seconds'] == 2.0
+    assert stats['efficiency'] == 0.5
+    assert stats['balance'] == 2.0 / 3.0
+    assert utilization({}, 0, 2)['efficiency'] is None
@@ -0,0 +1,74 @@
+"""
+Sharded Batch Tests
+--shard runs merged with BatchProcessor.from_partials() must match a single-node run
+"""
+
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+from langdetect import DetectorFactory
+
+from batch_processor import BatchProcessor, shard_of
+
+SAMPLES = Path(__file__).parent / 'sample_texts'
+SHARDS = 3
+
+
+@pytest.fixture(autouse=True)
+def seeded_langdetect(monkeypatch):
+    """langdetect samples n-grams at random; runs only compare equal with a fixed seed"""
+    monkeypatch.setattr(DetectorFactory, 'seed', 0)
+
+
+def run(directory, **options):
+    processor = BatchProcessor(directory, heavy_hitters=True, quiet=True, **options)
+    processor.process_directory()
+    return processor
+
+
+def sketch_tables(sketches):
+    """Per language: document count and the word/character Count-Min tables"""
+    return {language: (entry['documents'], entry['words'].table, entry['chars'].table)
+            for language, entry in sketches.languages.items()}
+
+
+def test_shard_assignment_is_stable():
+    assert shard_of('a/b.txt', SHARDS) == shard_of('a/b.txt', SHARDS)
+    assert {shard_of(f"doc{i}.txt", SHARDS) for i in range(100)} == set(range(SHARDS))
+
+
+def test_merged_shards_match_single_node(tmp_path, monkeypatch):
+    corpus = tmp_path / 'corpus'
+    shutil.copytree(SAMPLES, corpus)
+    (corpus / 'nested').mkdir()
+    for name in ('english.txt', 'french.txt', 'german.txt'):
+        shutil.copy(corpus / name, corpus / 'nested' / f"copy_{name}")
+    # Reports are written to the working directory
+    monkeypatch.chdir(tmp_path)
+
+    single = run(corpus)
+    parts = tmp_path / 'parts'
+    for index in range(SHARDS):
+        run(corpus, shard=(index, SHARDS), output_dir=parts)
+    merged = BatchProcessor.from_partials([parts])
+
+    assert len(single.results) == 9
+    assert list(merged.results) == list(single.results)
+    assert merged.results.summary() == single.results.summary()
+
+    single_tables, merged_tables = sketch_tables(single.sketches), sketch_tables(merged.sketches)
+    assert merged_tables.keys() == single_tables.keys()
+    for language, (documents, words, chars) in single_tables.items():
+        assert merged_tables[language][0] == documents
+        assert np.array_equal(merged_tables[language][1], words)
+        assert np.array_equal(merged_tables[language][2], chars)
+
+
+def test_merge_requires_every_shard(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    parts = tmp_path / 'parts'
+    run(SAMPLES, shard=(0, SHARDS), output_dir=parts)
+    with pytest.raises(ValueError, match=r'missing \[1, 2\]'):
+        BatchProcessor.from_partials([parts])
@@ -0,0 +1,75 @@
+"""
+Sketch Tests
+Count-Min top-k merging and the CorpusSketches state round trip used by shard partials
+"""
+
+import json
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from sketches import CorpusSketches, CountMinTopK
+
+ENGLISH = "the cat sat on the mat and the dog sat on the log"
+FRENCH = "le chat est sur le tapis et le chien est sur la buche"
+
+
+def test_merge_equals_single_sketch():
+    left, right, single = CountMinTopK(k=5), CountMinTopK(k=5), CountMinTopK(k=5)
+    first, second = Counter(ENGLISH.split()), Counter((ENGLISH + " the end").split())
+    left.update(first)
+    right.update(second)
+    single.update(first)
+    single.update(second)
+
+    left.merge(right)
+    assert np.array_equal(left.table, single.table)
+    assert left.total == single.total == sum(first.values()) + sum(second.values())
+    assert left.top() == single.top()
+    assert left.top(1) == [('the', 9)]
+
+
+def test_estimates_never_undercount():
+    sketch = CountMinTopK(k=10, width=16, depth=2)
+    counts = Counter({f"word{i}": i + 1 for i in range(200)})
+    sketch.update(counts)
+    assert (sketch.query(list(counts)) >= np.array(list(counts.values()))).all()
+
+
+def test_merge_rejects_different_shapes():
+    with pytest.raises(ValueError):
+        CountMinTopK(width=1024).merge(CountMinTopK(width=2048))
+
+
+def test_count_min_state_round_trip():
+    sketch = CountMinTopK(k=3)
+    sketch.update(Counter(ENGLISH.split()))
+    restored = CountMinTopK.from_state(json.loads(json.dumps(sketch.to_state())))
+    assert np.array_equal(restored.table, sketch.table)
+    assert restored.total == sketch.total
+    assert restored.top() == sketch.top()
+
+
+def test_corpus_sketches_state_round_trip():
+    sketches = CorpusSketches(k=5)
+    sketches.add('en', ENGLISH)
+    sketches.add('en', ENGLISH.upper())
+    sketches.add('fr', FRENCH)
+
+    restored = CorpusSketches.from_state(json.loads(json.dumps(sketches.to_state())))
+    assert restored.to_dict() == sketches.to_dict()
+    assert restored.to_dict()['en']['documents'] == 2
+    assert restored.to_dict()['en']['top_words'][0] == ('the', 8)
+
+
+def test_restored_partials_merge_like_one_run():
+    shards = [CorpusSketches(k=5) for _ in range(2)]
+    single = CorpusSketches(k=5)
+    for i, (language, text) in enumerate([('en', ENGLISH), ('fr', FRENCH), ('en', ENGLISH + " again")]):
+        shards[i % 2].add(language, text)
+        single.add(language, text)
+
+    merged = CorpusSketches.from_state(shards[0].to_state())
+    merged.merge(CorpusSketches.from_state(shards[1].to_state()))
+    assert merged.to_dict() == single.to_dict()
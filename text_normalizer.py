@@ -0,0 +1,124 @@
+"""
+Text Normalizer
+Strips non-linguistic noise (URLs, code, markup, IDs) before language detection
+"""
+
+import re
+
+# Upper bound on the characters passed on to the detector (langdetect reads at most 10,000)
+MAX_CHARS = 10000
+
+# Raw input scanned per output character allowed; bounds the regex work on huge inputs
+SCAN_FACTOR = 4
+
+# (name, pattern) in match priority order; every rule replaces its match with the
+# replacement string, except md_link which keeps the link text
+RULES = [
+    ('code_block', r'```.*?(?:```|\Z)|~~~.*?(?:~~~|\Z)'),
+    ('html_comment', r'<!--.*?(?:-->|\Z)'),
+    ('html_tag', r'</?[A-Za-z][\w:-]*(?:\s[^<>]{0,500})?/?>'),
+    ('md_link', r'(?P<md_image>!?)\[(?P<md_text>[^\]\n]{0,500})\]\([^)\s]*\)'),
+    ('url', r'\b(?:https?|ftp)://[^\s<>"\')\]]+|\bwww\.[^\s<>"\')\]]+'),
+    ('email', r'\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b'),
+    ('uuid', r'\b[0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12}\b'),
+    ('hex_id', r'\b0x[0-9a-fA-F]+\b|\b(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{8,}\b'),
+    ('inline_code', r'`[^`\n]{1,500}`'),
+    ('json_key', r'"[\w.$@-]{1,100}"\s*:'),
+    ('entity', r'&(?:#\d+|#x[0-9a-fA-F]+|[A-Za-z]+);'),
+    ('number', r'\b\d[\d.,:/_-]*\b'),
+    ('markdown', r'^[ \t]*(?:#{1,6}|>+|[-*+]|\d+[.)])[ \t]+|[*_~|]{1,3}'),
+]
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+class TextNormalizer:
+    """
+    Configurable single-pass noise filter
+
+    All enabled rules are compiled into one alternation, so the text is
+    scanned once. Matches are replaced by a space (or `replacement`) so word
+    boundaries survive, then whitespace is collapsed and the result is
+    truncated to max_chars.
+
+    Args:
+        rules: Rule names to apply (default: all of RULES)
+        max_chars: Upper bound on the returned text length
+        replacement: Text substituted for removed spans
+    """
+
+    def __init__(self, rules=None, max_chars=MAX_CHARS, replacement=' '):
+        names = [name for name, _ in RULES]
+        self.rules = list(names if rules is None else rules)
+        unknown = set(self.rules) - set(names)
+        if unknown:
+            raise ValueError(f"Unknown normalization rule(s): {', '.join(sorted(unknown))}")
+        self.max_chars = max_chars
+        self.replacement = replacement
+        enabled = [(name, pattern) for name, pattern in RULES if name in self.rules]
+        self.pattern = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in enabled),
+                                  re.DOTALL | re.MULTILINE) if enabled else None
+
+    def normalize(self, text):
+        """
+        Clean a text for detection
+
+        Returns:
+            tuple: (clean text, stats) where stats has 'input_chars', 'output_chars',
+            'dropped_chars', 'truncated' and per-rule 'removed' character counts
+        """
+        input_chars = len(text)
+        limit = self.max_chars * SCAN_FACTOR if self.max_chars else None
+        scanned = text[:limit] if limit else text
+        removed = {}
+
+        if self.pattern is not None:
+            def replace(match):
+                name = match.lastgroup
+                if name == 'md_link':
+                    # Keep the visible text of links; drop images and link targets
+                    kept = '' if match.group('md_image') else match.group('md_text')
+                    removed[name] = removed.get(name, 0) + len(match.group(0)) - len(kept)
+                    return f' {kept} '
+                removed[name] = removed.get(name, 0) + len(match.group(0))
+                return self.replacement
+
+            scanned = self.pattern.sub(replace, scanned)
+
+        clean = WHITESPACE_RE.sub(' ', scanned).strip()
+        truncated = bool(self.max_chars) and (len(clean) > self.max_chars or
+                                              (limit is not None and input_chars > limit))
+        if self.max_chars:
+            clean = clean[:self.max_chars]
+
+        return clean, {
+            'input_chars': input_chars,
+            'output_chars': len(clean),
+            'dropped_chars': input_chars - len(clean),
+            'truncated': truncated,
+            'removed': removed,
+        }
+
+    def __call__(self, text):
+        """Clean text only"""
+        return self.normalize(text)[0]
+
+
+DEFAULT_NORMALIZER = TextNormalizer()
+
+
+def get_normalizer(normalize=True):
+    """Resolve a `normalize` argument: True (default rules), False/None (off) or a TextNormalizer"""
+    if normalize is True:
+        return DEFAULT_NORMALIZER
+    if not normalize:
+        return None
+    return normalize
+
+
+def normalize_text(text, normalize=True):
+    """Apply the selected normalizer; returns (text, stats or None)"""
+    normalizer = get_normalizer(normalize)
+    if normalizer is None:
+        return text, None
+    return normalizer.normalize(text)
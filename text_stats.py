@@ -0,0 +1,73 @@
+"""
+Text Statistics
+Character counts and per-script histograms shared by the analyzers and the budget fallback
+"""
+
+from collections import Counter
+
+import numpy as np
+
+
+def char_counts(text):
+    """
+    Counter of a text's characters, in code point order
+
+    Counted with numpy over the code points, so statistics over a large text
+    classify its distinct characters instead of looping over every character.
+    """
+    codes = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    if len(codes) < 4096:
+        # bincount would allocate a bin per code point up to the largest one
+        values, counts = np.unique(codes, return_counts=True)
+    else:
+        counts = np.bincount(codes)
+        values = np.flatnonzero(counts)
+        counts = counts[values]
+    return Counter(dict(zip(map(chr, values.tolist()), counts.tolist())))
+
+
+def script_histogram(text):
+    """
+    Count characters per writing script/alphabet (scripts with no characters are left out)
+
+    Args:
+        text: A string, or its char_counts() when already computed
+    """
+    scripts = {
+        'Latin': 0,
+        'Cyrillic': 0,
+        'Arabic': 0,
+        'Chinese': 0,
+        'Japanese': 0,
+        'Korean': 0,
+        'Devanagari': 0,
+        'Greek': 0,
+        'Hebrew': 0,
+        'Thai': 0
+    }
+    
+    counts = text if hasattr(text, 'items') else char_counts(text)
+    for char, count in counts.items():
+        code = ord(char)
+        if 0x0041 <= code <= 0x007A or 0x00C0 <= code <= 0x024F:
+            scripts['Latin'] += count
+        elif 0x0400 <= code <= 0x04FF:
+            scripts['Cyrillic'] += count
+        elif 0x0600 <= code <= 0x06FF:
+            scripts['Arabic'] += count
+        elif 0x4E00 <= code <= 0x9FFF:
+            scripts['Chinese'] += count
+        elif 0x3040 <= code <= 0x309F or 0x30A0 <= code <= 0x30FF:
+            scripts['Japanese'] += count
+        elif 0xAC00 <= code <= 0xD7AF:
+            scripts['Korean'] += count
+        elif 0x0900 <= code <= 0x097F:
+            scripts['Devanagari'] += count
+        elif 0x0370 <= code <= 0x03FF:
+            scripts['Greek'] += count
+        elif 0x0590 <= code <= 0x05FF:
+            scripts['Hebrew'] += count
+        elif 0x0E00 <= code <= 0x0E7F:
+            scripts['Thai'] += count
+    
+    return {name: count for name, count in scripts.items() if count > 0}
@@ -0,0 +1,426 @@
+"""
+Profile Trainer
+Train langdetect-format n-gram profiles from a labeled local corpus
+"""
+
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+import zlib
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from colorama import init, Fore
+
+# Set UTF-8 encoding for Windows
+if os.name == 'nt':
+    import codecs
+    if hasattr(sys.stdout, 'buffer'):
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+init(autoreset=True)
+
+from langdetect.detector_factory import DetectorFactory
+from langdetect.utils.lang_profile import LangProfile
+from langdetect.utils.ngram import NGram
+
+from compact_model import CompactModel, word_ngrams
+from record_processor import extract_field
+from text_normalizer import RULES, TextNormalizer
+
+# Bytes of corpus per worker task (cut at line ends)
+CHUNK_BYTES = 8 * 1024 * 1024
+# Distinct n-grams kept per language while merging; beyond twice this the rarest are dropped
+MAX_TRACKED = 1000000
+# Fraction of documents held out for the accuracy check, and the most kept
+HOLDOUT = 0.02
+HOLDOUT_MAX = 2000
+HOLDOUT_CHARS = 2000
+TEXT_EXTENSIONS = ('.txt', '.md', '.log')
+PRINT_INTERVAL = 2.0
+REPORT_NAME = 'training_report.json'
+
+# Detection's noise filtering without its length cap. Numbers and markdown punctuation
+# are left alone: NGram.normalize() blanks digits and punctuation anyway
+TRAINING_NORMALIZER = TextNormalizer([name for name, _ in RULES if name not in ('number', 'markdown')],
+                                     max_chars=None)
+# Every TRAINING_NORMALIZER rule needs one of these to match (IDs: a digit next to a hex
+# letter), so documents without any skip the regex pass
+NOISE_HINT_RE = re.compile(r'[:@<`~\]"&]|www\.|0x|[0-9][a-fA-F]|[a-fA-F][0-9]')
+
+# NGram.normalize() per code point, filled in as new characters appear
+_char_table = {}
+
+
+def normalize_chars(text):
+    """Apply langdetect's character normalization to a whole text with one str.translate()"""
+    missing = {ord(ch) for ch in set(text)}.difference(_char_table)
+    for code in missing:
+        _char_table[code] = NGram.normalize(chr(code))
+    return text.translate(_char_table)
+
+
+def line_ranges(file_path, chunk_bytes=CHUNK_BYTES):
+    """Byte ranges (start, end) of about chunk_bytes each, ending at line ends"""
+    size = os.path.getsize(file_path)
+    ranges, start = [], 0
+    with open(file_path, 'rb') as f:
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            f.readline()
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def corpus_tasks(corpus, chunk_bytes=CHUNK_BYTES):
+    """
+    Worker tasks (file, start, end, label) for a corpus
+
+    A directory holds one subdirectory of text files per language
+    (corpus/en/*.txt, corpus/fr/*.txt); every non-empty line is a document
+    labeled with its directory name. Any other path is a JSON Lines file
+    whose records carry their own label (label None).
+    """
+    corpus = Path(corpus)
+    tasks = []
+    if corpus.is_dir():
+        for language_dir in sorted(p for p in corpus.iterdir() if p.is_dir()):
+            for file_path in sorted(language_dir.rglob('*')):
+                if file_path.is_file() and file_path.suffix.lower() in TEXT_EXTENSIONS:
+                    tasks.extend((str(file_path), start, end, language_dir.name)
+                                 for start, end in line_ranges(file_path, chunk_bytes))
+    else:
+        tasks.extend((str(corpus), start, end, None) for start, end in line_ranges(corpus, chunk_bytes))
+    return tasks
+
+
+def is_holdout(line, holdout):
+    """Deterministic holdout split by a hash of the raw document"""
+    return holdout > 0 and zlib.crc32(line) % 10000 < holdout * 10000
+
+
+def count_chunk(file_path, start, end, label=None, text_field='text', label_field='language',
+                normalize=True, holdout=HOLDOUT, holdout_max=HOLDOUT_MAX):
+    """
+    Count character 1-3 grams per language in one byte range of the corpus
+
+    Only documents that may contain noise go through the text normalizer.
+    Documents are then grouped by language and each group is split into
+    words once; n-grams are expanded per distinct word and weighted by its
+    count, so the per-n-gram Python work scales with the vocabulary rather
+    than with the corpus size.
+
+    Returns:
+        dict: 'bytes', per-language 'languages' counts, 'holdout' samples and
+        'skipped' documents (unparseable, unlabeled or empty)
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    texts = defaultdict(list)
+    holdout_samples = []
+    skipped = 0
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        text = line.decode('utf-8', errors='replace')
+        language = label
+        if label is None:
+            try:
+                record = json.loads(text)
+                text = extract_field(record, text_field)
+                language = extract_field(record, label_field)
+            except ValueError:
+                text = None
+        if not text or not language:
+            skipped += 1
+            continue
+        if is_holdout(line, holdout):
+            if len(holdout_samples) < holdout_max:
+                holdout_samples.append((text[:HOLDOUT_CHARS], str(language)))
+            continue
+        if normalize and NOISE_HINT_RE.search(text):
+            text = TRAINING_NORMALIZER(text)
+        texts[str(language)].append(text)
+
+    languages = {}
+    for language, items in texts.items():
+        text = '\n'.join(items)
+        chars = len(text)
+        words = Counter(normalize_chars(NGram.normalize_vi(text)).split())
+        freq = Counter()
+        for word, count in words.items():
+            for gram in word_ngrams(word):
+                freq[gram] += count
+        n_words = [0, 0, 0]
+        for gram, count in freq.items():
+            n_words[len(gram) - 1] += count
+        languages[language] = {'freq': freq, 'n_words': n_words, 'docs': len(items), 'chars': chars,
+                               'words': sum(words.values())}
+    return {'bytes': end - start, 'languages': languages, 'holdout': holdout_samples, 'skipped': skipped}
+
+
+class ProfileTrainer:
+    """
+    Merges chunk counts into per-language profiles with bounded memory
+
+    Args:
+        max_tracked: Distinct n-grams kept per language between merges; when a
+            language exceeds twice this, only its max_tracked most frequent
+            n-grams are kept (rare n-grams are pruned later anyway)
+        min_count: Drop n-grams seen at most this often (langdetect's own
+            threshold, n_words[0] / 100000, applies when it is higher)
+        top_ngrams: Keep at most this many n-grams per order (1, 2, 3) and language
+        holdout_max: Most held-out documents kept for evaluation
+    """
+
+    def __init__(self, max_tracked=MAX_TRACKED, min_count=LangProfile.MINIMUM_FREQ, top_ngrams=None,
+                 holdout_max=HOLDOUT_MAX):
+        self.max_tracked = max_tracked
+        self.min_count = min_count
+        self.top_ngrams = top_ngrams
+        self.holdout_max = holdout_max
+        self.freq = defaultdict(Counter)
+        self.n_words = defaultdict(lambda: [0, 0, 0])
+        self.stats = defaultdict(Counter)
+        self.holdout = []
+        self.bytes = 0
+        self.chunks = 0
+        self.skipped = 0
+        self.trimmed = set()
+
+    def add(self, partial):
+        """Merge one count_chunk() result"""
+        self.bytes += partial['bytes']
+        self.chunks += 1
+        self.skipped += partial['skipped']
+        self.holdout.extend(partial['holdout'][:self.holdout_max - len(self.holdout)])
+        for language, counts in partial['languages'].items():
+            freq = self.freq[language]
+            freq.update(counts['freq'])
+            for n in range(3):
+                self.n_words[language][n] += counts['n_words'][n]
+            for key in ('docs', 'chars', 'words'):
+                self.stats[language][key] += counts[key]
+            if len(freq) > 2 * self.max_tracked:
+                self.freq[language] = Counter(dict(freq.most_common(self.max_tracked)))
+                self.trimmed.add(language)
+
+    def profiles(self):
+        """
+        Pruned LangProfile objects by language
+
+        Returns:
+            tuple: (profiles dict, per-language report rows)
+        """
+        profiles, rows = {}, {}
+        for language in sorted(self.freq):
+            profile = LangProfile(language, self.freq[language], list(self.n_words[language]))
+            seen = len(profile.freq)
+            profile.MINIMUM_FREQ = self.min_count
+            profile.omit_less_freq()
+            if self.top_ngrams:
+                for n in (1, 2, 3):
+                    grams = sorted((g for g in profile.freq if len(g) == n), key=profile.freq.get, reverse=True)
+                    for gram in grams[self.top_ngrams:]:
+                        profile.n_words[n - 1] -= profile.freq.pop(gram)
+            profiles[language] = profile
+            rows[language] = dict(self.stats[language], ngrams_seen=seen, ngrams_kept=len(profile.freq),
+                                  trimmed_in_flight=language in self.trimmed)
+        return profiles, rows
+
+
+def train_profiles(corpus, text_field='text', label_field='language', workers=None, chunk_bytes=CHUNK_BYTES,
+                   normalize=True, holdout=HOLDOUT, trainer=None, quiet=False):
+    """
+    Count a labeled corpus in worker processes and build pruned profiles
+
+    At most 2 x workers chunks are in flight, so memory is bounded by the
+    chunk size and the tracked n-grams, not by the corpus size.
+
+    Returns:
+        tuple: (profiles dict, report dict, held-out (text, language) samples)
+    """
+    trainer = trainer or ProfileTrainer()
+    workers = workers or os.cpu_count() or 1
+    tasks = corpus_tasks(corpus, chunk_bytes)
+    total_bytes = sum(end - start for _, start, end, _ in tasks)
+    options = (text_field, label_field, normalize, holdout, trainer.holdout_max)
+    started = time.perf_counter()
+    next_print = started + PRINT_INTERVAL
+
+    def merge(partial):
+        nonlocal next_print
+        trainer.add(partial)
+        now = time.perf_counter()
+        if not quiet and now >= next_print:
+            next_print = now + PRINT_INTERVAL
+            print(f"{Fore.CYAN}{trainer.chunks:,}/{len(tasks):,} chunks  "
+                  f"{Fore.GREEN}{trainer.bytes / 1e6 / (now - started):,.1f} MB/s  "
+                  f"{Fore.WHITE}{len(trainer.freq)} languages")
+
+    if workers == 1:
+        for task in tasks:
+            merge(count_chunk(*task, *options))
+    else:
+        # spawn keeps workers from inheriting the parent's growing counters
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(workers, mp_context=context) as executor:
+            pending = set()
+            for task in tasks:
+                pending.add(executor.submit(count_chunk, *task, *options))
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        merge(future.result())
+            for future in pending:
+                merge(future.result())
+
+    profiles, languages = trainer.profiles()
+    elapsed = time.perf_counter() - started
+    report = {
+        'corpus': str(corpus),
+        'bytes': total_bytes,
+        'chunks': len(tasks),
+        'workers': workers,
+        'seconds': round(elapsed, 2),
+        'mb_per_sec': round(total_bytes / 1e6 / elapsed, 2) if elapsed else None,
+        'documents': sum(row['docs'] for row in languages.values()),
+        'skipped': trainer.skipped,
+        'holdout': len(trainer.holdout),
+        'min_count': trainer.min_count,
+        'top_ngrams': trainer.top_ngrams,
+        'languages': languages,
+    }
+    return profiles, report, trainer.holdout
+
+
+def save_profiles(profiles, directory):
+    """Write profiles in langdetect's JSON profile format, one file per language"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for language, profile in profiles.items():
+        with open(directory / language, 'w', encoding='utf-8') as f:
+            json.dump({'freq': dict(profile.freq), 'n_words': profile.n_words, 'name': language}, f,
+                      ensure_ascii=False)
+    return sum((directory / language).stat().st_size for language in profiles)
+
+
+def build_model(profiles, dtype='int8'):
+    """Compact model (usable as a .npz engine) from trained profiles"""
+    factory = DetectorFactory()
+    for index, language in enumerate(sorted(profiles)):
+        factory.add_profile(profiles[language], index, len(profiles))
+    return CompactModel.from_factory(factory, dtype)
+
+
+def evaluate(holdout, engine, languages):
+    """Accuracy of the shipped langdetect profiles and the trained engine on the held-out documents"""
+    from compare_engines import compare_engines
+    from detection_engine import available_languages
+
+    # Compare on the trained languages only, when the shipped profiles cover them
+    allowlist = languages if set(languages) <= set(available_languages()) else None
+    comparison = compare_engines(holdout, ['langdetect', engine], allowlist)
+    return {row['engine']: {'accuracy': row['accuracy'], 'docs_per_sec': row['docs_per_sec']}
+            for row in comparison['rows']}
+
+
+def print_training_report(report):
+    """Print a training report"""
+    print(f"\n{Fore.CYAN}{'='*80}")
+    print(f"{Fore.YELLOW}PROFILE TRAINING REPORT")
+    print(f"{Fore.CYAN}{'='*80}")
+    print(f"{Fore.WHITE}Corpus: {report['corpus']} ({report['bytes'] / 1e6:,.1f} MB, {report['chunks']:,} chunks, "
+          f"{report['workers']} workers)")
+    print(f"{Fore.WHITE}Time: {report['seconds']:,.1f} s ({report['mb_per_sec'] or 0:,.1f} MB/s)   "
+          f"Documents: {report['documents']:,}   Skipped: {report['skipped']:,}   Held out: {report['holdout']:,}")
+    print(f"\n{Fore.WHITE}{'Language':10} {'Docs':>10} {'Chars':>14} {'N-grams seen':>13} {'Kept':>9}")
+    for language, row in report['languages'].items():
+        trimmed = f" {Fore.YELLOW}(trimmed)" if row['trimmed_in_flight'] else ''
+        print(f"{Fore.GREEN}{language:10} {row['docs']:>10,} {row['chars']:>14,} {row['ngrams_seen']:>13,} "
+              f"{row['ngrams_kept']:>9,}{trimmed}")
+    if report.get('profiles'):
+        print(f"\n{Fore.GREEN}✓ Profiles: {Fore.WHITE}{report['profiles']} "
+              f"({report['profile_bytes'] / 1e6:.2f} MB)")
+    if report.get('model'):
+        print(f"{Fore.GREEN}✓ Model: {Fore.WHITE}{report['model']} ({report['model_bytes'] / 1e6:.2f} MB in memory)")
+    if report.get('evaluation'):
+        print(f"\n{Fore.YELLOW}Held-out accuracy:")
+        for engine, row in report['evaluation'].items():
+            print(f"{Fore.WHITE}  {engine:40} {Fore.GREEN}{row['accuracy']:.1%}  "
+                  f"{Fore.WHITE}{row['docs_per_sec'] or 0:,.0f} docs/s")
+    print(f"{Fore.CYAN}{'='*80}")
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Train language profiles from a labeled corpus",
+        epilog="Example: python train_profiles.py tickets.jsonl --label-field lang --output profiles/ "
+               "--model tickets.npz"
+    )
+    parser.add_argument('corpus', help="JSON Lines file, or a directory with one subdirectory of text files "
+                                       "per language (corpus/en/*.txt)")
+    parser.add_argument('--output', required=True, help="Directory for the langdetect-format profiles")
+    parser.add_argument('--model', help="Also write a compact .npz model for --engine")
+    parser.add_argument('--dtype', choices=['int8', 'float16'], default='int8', help="Compact model precision")
+    parser.add_argument('--text-field', default='text', help="Text field (dotted path) in JSONL records")
+    parser.add_argument('--label-field', default='language', help="Language code field in JSONL records")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Counting processes")
+    parser.add_argument('--chunk-mb', type=float, default=CHUNK_BYTES / 1024 / 1024,
+                        help="Corpus megabytes per worker task")
+    parser.add_argument('--min-count', type=int, default=LangProfile.MINIMUM_FREQ,
+                        help="Drop n-grams seen at most this many times")
+    parser.add_argument('--top-ngrams', type=int, help="Keep at most this many n-grams per order and language")
+    parser.add_argument('--max-tracked', type=int, default=MAX_TRACKED,
+                        help="Distinct n-grams tracked per language while counting (bounds memory)")
+    parser.add_argument('--holdout', type=float, default=HOLDOUT,
+                        help="Fraction of documents held out to compare accuracy with the shipped profiles")
+    parser.add_argument('--no-normalize', dest='normalize', action='store_false',
+                        help="Train on raw text instead of stripping URLs, code, markup and IDs first")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.corpus):
+        parser.error(f"Corpus '{args.corpus}' does not exist")
+
+    trainer = ProfileTrainer(args.max_tracked, args.min_count, args.top_ngrams)
+    profiles, report, holdout = train_profiles(args.corpus, args.text_field, args.label_field, args.workers,
+                                               int(args.chunk_mb * 1024 * 1024), args.normalize, args.holdout,
+                                               trainer, quiet=args.json)
+    if not profiles:
+        parser.error("No labeled documents found")
+
+    report['profiles'] = args.output
+    report['profile_bytes'] = save_profiles(profiles, args.output)
+    engine = args.output
+    if args.model:
+        model = build_model(profiles, args.dtype)
+        model.save(args.model)
+        report['model'] = args.model if args.model.endswith('.npz') else args.model + '.npz'
+        report['model_bytes'] = model.nbytes
+        engine = report['model']
+    if holdout:
+        report['evaluation'] = evaluate(holdout, engine, sorted(profiles))
+    with open(Path(args.output) / REPORT_NAME, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_training_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,201 @@
-# visualizer.py
-from language_analyzer import LanguageAnalyzer
-import plotly.express as px
+"""
+Language Visualizer
+Plotly dashboards for single analyses and aggregated batch summaries, exported as standalone HTML
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+
+from colorama import init, Fore
+
+# Set UTF-8 encoding for Windows
+if os.name == 'nt':
+    import codecs
+    if hasattr(sys.stdout, 'buffer'):
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+init(autoreset=True)
+
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from language_metadata import language_name
+
+# Languages shown individually in batch charts; the rest are folded into "Other"
+TOP_LANGUAGES = 15
+
+
+def format_bytes(size):
+    """Short human-readable size (512 B, 4 KB, 16 MB)"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:g} {unit}"
+        size /= 1024
+
 
 class LanguageVisualizer:
-    """Visualizer for language analysis"""
+    """
+    Charts for language analysis results
+
+    Batch charts are drawn from summaries (result_store.summarize) rather than
+    per-document points, so a figure's data stays a few KB however many
+    documents were processed.
+    """
 
-    def create_comprehensive_dashboard(self, analyzer: LanguageAnalyzer):
+    def __init__(self, output_dir='visualizations'):
+        self.output_dir = Path(output_dir)
+
+    def create_comprehensive_dashboard(self, analyzer):
         """
-        Create a chart showing language distribution or confidence scores.
-        Returns a Plotly figure.
+        Dashboard for one analyzed text: language probabilities, scripts, top words and characters
+
+        Returns:
+            plotly.graph_objects.Figure
         """
-        # Use a placeholder method; adapt to your analyzer
-        try:
-            lang_data = analyzer.get_language_distribution()  # must return dict {language: score}
-        except AttributeError:
-            # Fallback if method doesn't exist: just use detected language
-            lang_data = {analyzer.get_language_name(): 100}
+        distribution = analyzer.get_language_distribution() or {analyzer.get_language_name(): 100}
+        scripts = analyzer.get_script_histogram()
+        words = analyzer.get_word_frequency()
+        chars = analyzer.get_character_distribution()
 
-        fig = px.pie(
-            names=list(lang_data.keys()),
-            values=list(lang_data.values()),
-            title="Language Distribution"
-        )
+        fig = make_subplots(rows=2, cols=2, specs=[[{'type': 'domain'}, {'type': 'xy'}],
+                                                   [{'type': 'xy'}, {'type': 'xy'}]],
+                            subplot_titles=('Language Probabilities', 'Writing Scripts',
+                                            'Top Words', 'Top Characters'))
+        fig.add_trace(go.Pie(labels=list(distribution), values=list(distribution.values()), hole=0.4), 1, 1)
+        fig.add_trace(go.Bar(x=list(scripts), y=list(scripts.values()), name='Scripts'), 1, 2)
+        fig.add_trace(go.Bar(x=[count for _, count in words][::-1], y=[word for word, _ in words][::-1],
+                             orientation='h', name='Words'), 2, 1)
+        fig.add_trace(go.Bar(x=[char for char, _ in chars], y=[count for _, count in chars], name='Characters'), 2, 2)
+        fig.update_layout(title=f"Language Analysis: {analyzer.get_language_name()}", showlegend=False,
+                          height=700)
         return fig
 
+    def plot_language_distribution(self, languages, title='Language Distribution'):
+        """
+        Bar chart of how often each language occurs
+
+        Args:
+            languages: Language names (one per document) or a {name: count} mapping
+        """
+        counts = Counter(languages).most_common() if not hasattr(languages, 'items') else \
+            sorted(languages.items(), key=lambda item: item[1], reverse=True)
+        fig = go.Figure(go.Bar(x=[name for name, _ in counts], y=[count for _, count in counts]))
+        fig.update_layout(title=title, xaxis_title='Language', yaxis_title='Documents')
+        return fig
+
+    def plot_confidence_scores(self, languages, confidences, title='Detection Confidence'):
+        """Bar chart of one confidence (in percent) per detected text"""
+        labels = [f"{i}. {name}" for i, name in enumerate(languages, 1)]
+        fig = go.Figure(go.Bar(x=labels, y=list(confidences), text=[f"{c:.1f}%" for c in confidences],
+                               textposition='outside'))
+        fig.update_layout(title=title, yaxis_title='Confidence (%)', yaxis_range=[0, 105])
+        return fig
+
+    def create_batch_dashboard(self, summary, title='Batch Language Detection', top=TOP_LANGUAGES):
+        """
+        Dashboard for a batch run from its summary
+
+        Args:
+            summary (dict): ResultStore.summary() / result_store.summarize() output
+            top: Languages shown individually; the rest are grouped as "Other"
+
+        Returns:
+            plotly.graph_objects.Figure
+        """
+        languages = list(summary['languages'].items())
+        shown, rest = languages[:top], languages[top:]
+        names = [language_name(code) for code, _ in shown]
+        counts = [count for _, count in shown]
+        if rest:
+            names.append(f"Other ({len(rest)})")
+            counts.append(sum(count for _, count in rest))
+        means = summary['mean_confidence']
+
+        confidence = summary['confidence_histogram']
+        edges = confidence['edges']
+        confidence_labels = [f"{edges[i]:.2f}-{edges[i + 1]:.2f}" for i in range(len(edges) - 1)]
+        sizes = summary['size_histogram']
+        size_labels = [f"{format_bytes(lo)}-{format_bytes(hi)}" for lo, hi in zip(sizes['edges'], sizes['edges'][1:])]
+
+        fig = make_subplots(rows=2, cols=2, subplot_titles=('Documents per Language', 'Confidence Distribution',
+                                                            'File Sizes', 'Mean Confidence per Language'))
+        fig.add_trace(go.Bar(x=names, y=counts, name='Documents'), 1, 1)
+        fig.add_trace(go.Bar(x=confidence_labels, y=confidence['counts'], name='Confidence'), 1, 2)
+        fig.add_trace(go.Bar(x=size_labels, y=sizes['counts'], name='Sizes'), 2, 1)
+        fig.add_trace(go.Bar(x=[language_name(code) for code, _ in shown],
+                             y=[means.get(code) for code, _ in shown], name='Mean confidence'), 2, 2)
+        statuses = ', '.join(f"{status} {count:,}" for status, count in summary['statuses'].items())
+        fig.update_layout(
+            title=f"{title}<br><sup>{summary['documents']:,} documents, "
+                  f"{format_bytes(summary['total_bytes'])}, {len(languages)} languages ({statuses})</sup>",
+            showlegend=False, height=800)
+        fig.update_yaxes(range=[0, 1], row=2, col=2)
+        return fig
+
+    def save_html(self, fig, filename, include_plotlyjs=True):
+        """
+        Write a figure as a standalone HTML page
+
+        Args:
+            filename: File name inside output_dir (an absolute path is used as is)
+            include_plotlyjs: True embeds plotly.js so the page works offline;
+                'cdn' loads it from the web and keeps the file small
+
+        Returns:
+            Path: The written file
+        """
+        path = self.output_dir / filename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fig.write_html(str(path), include_plotlyjs=include_plotlyjs, full_html=True)
+        return path
+
+
+def visualize_language_distribution(analyzer):
+    """Single-text dashboard figure (used by the Streamlit app)"""
+    return LanguageVisualizer().create_comprehensive_dashboard(analyzer)
+
+
+def load_summary(path):
+    """Batch summary from a summary JSON file or a batch report CSV"""
+    if str(path).lower().endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    import pandas as pd
+    from result_store import summarize_dataframe
+
+    return summarize_dataframe(pd.read_csv(path, usecols=lambda column: column in
+                                           ('code', 'confidence', 'size_bytes', 'status')))
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Render a batch dashboard from a report CSV or summary JSON as standalone HTML",
+        epilog="Example: python visualizer.py language_detection_report_20250101_120000.csv -o dashboard.html"
+    )
+    parser.add_argument('source', help="Batch report CSV or summary JSON (batch_processor.py --summary-json)")
+    parser.add_argument('-o', '--output', default='dashboard.html', help="HTML file to write")
+    parser.add_argument('--top', type=int, default=TOP_LANGUAGES, help="Languages shown individually")
+    parser.add_argument('--cdn', action='store_true', help="Load plotly.js from a CDN instead of embedding it")
+    args = parser.parse_args()
+
+    try:
+        summary = load_summary(args.source)
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(str(e))
+
+    fig = LanguageVisualizer().create_batch_dashboard(summary, top=args.top)
+    path = LanguageVisualizer(Path(args.output).parent).save_html(fig, Path(args.output).name,
+                                                                 'cdn' if args.cdn else True)
+    print(f"{Fore.GREEN}✓ Dashboard for {Fore.WHITE}{summary['documents']:,} {Fore.GREEN}documents saved to: "
+          f"{Fore.WHITE}{path} {Fore.CYAN}(chart data {len(json.dumps(fig.to_dict()['data'])) / 1024:.1f} KB)")
+
 
-# Optional: function version for app.py import
-def visualize_language_distribution(analyzer: LanguageAnalyzer):
-    visualizer = LanguageVisualizer()
-    return visualizer.create_comprehensive_dashboard(analyzer)
+if __name__ == "__main__":
+    main()